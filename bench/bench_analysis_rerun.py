@@ -0,0 +1,98 @@
+"""
+Benchmark: Analysis Mode timeframe-switch rerun wall time.
+
+Drives the app headlessly with Streamlit's AppTest against the synthetic,
+deterministic data sources in bench/stubs.py (no network; history lands in a
+throwaway cache dir) and times clicking through the timeframe buttons once everything
+is warm.
+
+    full script     — what a click costs when it reruns the whole of main()
+                      (load_data, calculate_metrics, KPI cards, sidebar, panel)
+    panel (approx.) — an approximation of a fragment rerun: render_analysis_mode
+                      alone, with the portfolio frame prepared once
+
+AppTest always executes the whole script and cannot rerun just a fragment,
+so the panel figure is NOT a measured fragment rerun. It comes from a driver
+script that calls render_analysis_mode directly, which re-executes the same
+panel code but skips Streamlit's own fragment bookkeeping (and still pays a
+full-script AppTest round-trip for the two-line driver).
+
+    python bench/bench_analysis_rerun.py [--clicks 9]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import stubs  # noqa: E402
+
+TIMEFRAMES = ["1W", "1M", "3M", "6M", "YTD", "1Y", "2Y", "5Y", "MAX"]
+
+PANEL_DRIVER = f"""
+import sys
+sys.path.insert(0, {str(ROOT)!r})
+import streamlit as st
+import swing
+
+if "_bench_args" not in st.session_state:
+    st.session_state._bench_args = swing.calculate_metrics(swing.load_data())
+swing.render_analysis_mode(*st.session_state._bench_args)
+"""
+
+
+def _click_through(at, clicks: int) -> list[float]:
+    times = []
+    for i in range(clicks):
+        label = TIMEFRAMES[i % len(TIMEFRAMES)]
+        button = next(b for b in at.button if b.label == label)
+        t0 = time.perf_counter()
+        button.click()
+        at.run()
+        times.append(time.perf_counter() - t0)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return times
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--clicks", type=int, default=9)
+    args = ap.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        stubs.install(cache_dir)
+
+        full = AppTest.from_file(str(ROOT / "swing.py"), default_timeout=300)
+        full.run()
+        full.sidebar.radio[0].set_value("Analysis Mode")
+        full.run()
+        _click_through(full, len(TIMEFRAMES))              # warm every window
+        t_full = _click_through(full, args.clicks)
+
+        panel = AppTest.from_string(PANEL_DRIVER, default_timeout=300)
+        panel.run()
+        _click_through(panel, len(TIMEFRAMES))
+        t_panel = _click_through(panel, args.clicks)
+
+    med_full, med_panel = np.median(t_full) * 1e3, np.median(t_panel) * 1e3
+    print(f"clicks        : {args.clicks} timeframe switches (warm cache)")
+    print(f"full script   : {med_full:8.1f} ms  median")
+    print(f"panel (approx): {med_panel:8.1f} ms  median  (driver, not a fragment rerun)")
+    print(f"saved / click : {med_full - med_panel:8.1f} ms  ({med_full / med_panel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
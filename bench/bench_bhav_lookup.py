@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: vectorized _bhav_lookup vs the legacy iterrows builder.
+
+Builds a synthetic UDiFF bhavcopy of realistic size (NSE CM files carry a few
+thousand rows across EQ/BE/BZ/… series; BSE files are larger) with the price
+columns as comma-formatted strings — the worst case the parser must handle —
+and times index build + resolving a 300-symbol book.
+
+    python bench/bench_bhav_lookup.py [--rows 3000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.quotes import _bhav_lookup, _bhav_pick, _num  # noqa: E402
+
+
+def synthetic_bhavcopy(rows: int, seed: int = 7) -> pd.DataFrame:
+    """UDiFF-shaped frame: TckrSymb/SctySrs/ClsPric/PrvsClsgPric (+ noise cols)."""
+    rng = np.random.default_rng(seed)
+    n_syms = int(rows * 0.9)
+    syms = np.array([f"SYM{i:05d}" for i in range(n_syms)])
+    # ~10% duplicate symbols across series (e.g. EQ + BE listings)
+    tickers = np.concatenate([syms, rng.choice(syms, rows - n_syms)])
+    series = np.where(rng.random(rows) < 0.85, "EQ", rng.choice(["BE", "BZ", "SM"], rows))
+    close = rng.uniform(5, 25_000, rows)
+    prev = close * rng.uniform(0.95, 1.05, rows)
+    fmt = np.vectorize(lambda v: f"{v:,.2f}")
+    return pd.DataFrame({
+        "TradDt": "2026-10-16",
+        "TckrSymb": tickers,
+        "SctySrs": series,
+        "OpnPric": fmt(close),
+        "ClsPric": fmt(close),
+        "PrvsClsgPric": fmt(prev),
+        "TtlTradgVol": rng.integers(1, 10_000_000, rows),
+    })
+
+
+def legacy_lookup(df: pd.DataFrame, eq_only: bool) -> dict[str, tuple[float, float]]:
+    """The pre-vectorization implementation, kept verbatim for comparison."""
+    lookup: dict[str, tuple[float, float]] = {}
+    rows = df
+    if eq_only and "SctySrs" in df.columns:
+        rows = df[df["SctySrs"].astype(str).str.strip() == "EQ"]
+    for _, r in rows.iterrows():
+        sym = str(r["TckrSymb"]).strip()
+        if sym and sym not in lookup:
+            lookup[sym] = (_num(r.get("ClsPric")), _num(r.get("PrvsClsgPric")))
+    return lookup
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=3000)
+    ap.add_argument("--book", type=int, default=300)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    df = synthetic_bhavcopy(args.rows)
+    book = list(df["TckrSymb"].drop_duplicates().sample(args.book, random_state=1))
+
+    def run_legacy():
+        lk = legacy_lookup(df, eq_only=True)
+        return {b: lk[b] for b in book if b in lk}
+
+    def run_vector():
+        return _bhav_pick(_bhav_lookup(df, eq_only=True), book)
+
+    legacy, vector = run_legacy(), run_vector()
+    assert legacy.keys() == vector.keys(), "symbol sets differ"
+    for sym, (c, p) in legacy.items():
+        np.testing.assert_allclose(vector[sym], (c, p), equal_nan=True)
+
+    t_legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    t_vector = min(timeit.repeat(run_vector, number=1, repeat=args.repeat))
+    print(f"bhavcopy rows : {args.rows:,} · book {args.book} symbols")
+    print(f"legacy        : {t_legacy * 1e3:8.2f} ms")
+    print(f"vectorized    : {t_vector * 1e3:8.2f} ms")
+    print(f"speedup       : {t_legacy / t_vector:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
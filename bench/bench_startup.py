@@ -0,0 +1,169 @@
+"""
+Benchmark: cold-start import cost and time to the first KPI card.
+
+Every measurement runs in a fresh interpreter, like a restarted replica.
+
+    imports      — ``python -X importtime -c "import <module>"`` per module
+                   (cumulative, so shared dependencies count in each row),
+                   and whether ``import swing`` actually executes it or
+                   leaves it deferred (core.lazy)
+    first KPI    — process start → first render_metric_card call, with the
+                   app driven by Streamlit's AppTest. yfinance is the real
+                   package (its import cost counts) with ``download`` swapped
+                   for the synthetic bars of bench/stubs.py (secondary
+                   sources are stubbed too), so no network is touched.
+                   ``--eager`` pre-imports the deferred modules first to
+                   show what loading them up front costs.
+
+    python bench/bench_startup.py [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+T0 = time.perf_counter()
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "streamlit", "pandas", "numpy", "openpyxl", "pyarrow",
+    "plotly.express", "plotly.subplots", "yfinance",
+    "core.quotes", "core.report", "swing",
+]
+DEFERRED = ["plotly.express", "plotly.subplots", "yfinance"]
+
+
+def _import_ms(module: str) -> float:
+    """Cumulative import time of ``module`` in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    ).stderr
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$", re.M)
+    hit = pattern.search(out)
+    return int(hit.group(1)) / 1e3 if hit else float("nan")
+
+
+def _loaded_by_swing() -> dict[str, bool]:
+    """Which DEFERRED modules ``import swing`` actually executes."""
+    probe = (
+        "import json, sys, swing\n"
+        f"print(json.dumps({{n: n in sys.modules for n in {DEFERRED!r}}}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+class _OfflineYfinance(importlib.abc.MetaPathFinder):
+    """Import the real yfinance, then replace its download with stub bars."""
+
+    def __init__(self, download) -> None:
+        self.download = download
+
+    def find_spec(self, name, path=None, target=None):
+        if name != "yfinance":
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+        if spec is None:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_stub(module) -> None:
+            exec_module(module)
+            module.download = self.download
+
+        spec.loader.exec_module = exec_and_stub
+        return spec
+
+
+def _child_first_kpi(eager: bool) -> None:
+    """Runs in a fresh interpreter: time to first KPI card and full run."""
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "bench"))
+    import stubs
+
+    stubs.install(yfinance=False)
+    sys.meta_path.insert(0, _OfflineYfinance(stubs.download))
+    if eager:
+        for name in DEFERRED:
+            __import__(name)
+
+    import ui.components
+
+    first: list[float] = []
+    render = ui.components.render_metric_card
+
+    def timed_card(*args, **kwargs):
+        if not first:
+            first.append(time.perf_counter() - T0)
+        return render(*args, **kwargs)
+
+    ui.components.render_metric_card = timed_card
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    at = AppTest.from_file(str(ROOT / "swing.py"), default_timeout=300)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    print(json.dumps({"first_kpi": first[0], "total": time.perf_counter() - T0}))
+
+
+def _first_kpi(eager: bool, runs: int) -> tuple[float, float]:
+    firsts, totals = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = {**os.environ, "SWING_CACHE_DIR": cache_dir}
+            cmd = [sys.executable, __file__, "--child"] + (["--eager"] if eager else [])
+            out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1])
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        firsts.append(result["first_kpi"])
+        totals.append(result["total"])
+    return statistics.median(firsts) * 1e3, statistics.median(totals) * 1e3
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        _child_first_kpi(args.eager)
+        return
+
+    loaded = _loaded_by_swing()
+    print(f"{'module':<18}{'import':>11}   at `import swing`")
+    for module in MODULES:
+        state = ""
+        if module in loaded:
+            state = "loaded" if loaded[module] else "deferred"
+        print(f"{module:<18}{_import_ms(module):8.0f} ms   {state}")
+
+    lazy_first, lazy_total = _first_kpi(eager=False, runs=args.runs)
+    eager_first, eager_total = _first_kpi(eager=True, runs=args.runs)
+    print()
+    print(f"cold start ({args.runs} fresh processes, median; stub quotes, no network)")
+    print(f"first KPI card : {lazy_first:8.0f} ms  (eager imports: {eager_first:.0f} ms)")
+    print(f"full dashboard : {lazy_total:8.0f} ms  (eager imports: {eager_total:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: core.valuation.portfolio_value vs the legacy per-column builder.
+
+Synthetic close prices for N holdings over Y years (default 1,000 × 10 ≈ a
+large book at the MAX timeframe) with a sprinkling of missing bars and late
+listings. The legacy builder is the Analysis Mode loop prior to the matrix
+engine (one DataFrame column per holding, then a row sum).
+
+    python bench/bench_valuation.py [--holdings 1000] [--years 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.valuation import nan_report, portfolio_value  # noqa: E402
+
+
+def synthetic_prices(holdings: int, days: int, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end="2026-10-16", periods=days)
+    steps = rng.normal(0.0003, 0.018, (days, holdings))
+    px = 100 * np.exp(np.cumsum(steps, axis=0))
+    px[rng.random(px.shape) < 0.002] = np.nan                # missing bars
+    listed = rng.integers(0, days // 2, holdings // 10)      # late listings
+    for col, start in zip(rng.choice(holdings, len(listed), replace=False), listed):
+        px[:start, col] = np.nan
+    return pd.DataFrame(px, index=idx, columns=[f"SYM{i:04d}.NS" for i in range(holdings)])
+
+
+def legacy_portfolio_value(prices: pd.DataFrame, quantities: dict[str, float]) -> pd.Series:
+    """Pre-engine implementation, kept verbatim for comparison."""
+    port_value = pd.DataFrame(index=prices.index)
+    for sym in prices.columns:
+        if sym in quantities:
+            port_value[sym] = prices[sym] * quantities[sym]
+    port_value['Portfolio'] = port_value.sum(axis=1)
+    return port_value['Portfolio'].dropna()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--holdings", type=int, default=1000)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    # The legacy loop fragments its frame by design; that's what is measured.
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+
+    prices = synthetic_prices(args.holdings, args.years * 252)
+    rng = np.random.default_rng(1)
+    quantities = dict(zip(prices.columns, rng.integers(1, 500, args.holdings).astype(float)))
+
+    legacy = legacy_portfolio_value(prices, quantities)
+    engine = portfolio_value(prices, quantities)
+    np.testing.assert_allclose(legacy.to_numpy(), engine.to_numpy(), rtol=1e-12)
+
+    # Time-varying book: every holding opened on a random date.
+    opened = prices.index[rng.integers(0, len(prices), args.holdings)]
+    qty_matrix = pd.DataFrame(0.0, index=prices.index, columns=prices.columns)
+    for col, day in zip(prices.columns, opened):
+        qty_matrix.loc[day:, col] = quantities[col]
+
+    t_legacy = min(timeit.repeat(lambda: legacy_portfolio_value(prices, quantities),
+                                 number=1, repeat=args.repeat))
+    t_engine = min(timeit.repeat(lambda: portfolio_value(prices, quantities),
+                                 number=1, repeat=args.repeat))
+    t_matrix = min(timeit.repeat(lambda: portfolio_value(prices, qty_matrix),
+                                 number=1, repeat=args.repeat))
+    t_report = min(timeit.repeat(lambda: nan_report(prices, qty_matrix),
+                                 number=1, repeat=args.repeat))
+    gaps = nan_report(prices, quantities)
+    print(f"book          : {args.holdings:,} holdings × {len(prices):,} days ({args.years}y)")
+    print(f"legacy        : {t_legacy * 1e3:8.2f} ms")
+    print(f"engine (const): {t_engine * 1e3:8.2f} ms")
+    print(f"engine (qty×t): {t_matrix * 1e3:8.2f} ms")
+    print(f"nan_report    : {t_report * 1e3:8.2f} ms  ({len(gaps):,} dates with gaps)")
+    print(f"speedup       : {t_legacy / t_engine:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
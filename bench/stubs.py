@@ -0,0 +1,174 @@
+"""
+In-process stand-ins for every network data source, for the benchmarks.
+
+``install()`` registers fake ``yfinance``, ``NseKit``, ``bse`` and
+``jugaad_data`` modules in ``sys.modules`` (call it before importing swing or
+core). Everything is synthetic and deterministic: smooth daily bars per
+ticker, live quotes for some of the symbols yfinance "misses", and bhavcopy
+CSVs listing the rest, so the primary → live → bhavcopy chain runs end to end
+with no network and no sleeps.
+
+Symbols for which ``unpriced(ticker)`` is true get no yfinance bars (about
+one in ``MISS_EVERY``); of those, every other one has a live quote and the
+rest are only in the bhavcopy.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import types
+import zlib
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MISS_EVERY = 20
+BHAV_FILLER_ROWS = 3000
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def _seed(name: str) -> int:
+    return zlib.crc32(name.encode()) % 997
+
+
+def unpriced(ticker: str) -> bool:
+    """True for the tickers the fake yfinance returns no bars for."""
+    return not ticker.startswith("^") and zlib.crc32(ticker.encode()) % MISS_EVERY == 0
+
+
+def _bare(ticker: str) -> str:
+    return ticker.rsplit(".", 1)[0] if ticker.endswith((".NS", ".BO")) else ticker
+
+
+def _price(name: str, day: float) -> float:
+    s = _seed(name)
+    return 100 + s / 10 + 10 * np.sin(day / 50 + s) + day * 0.01
+
+
+def download(tickers, start=None, end=None, period=None, **_):
+    """Smooth synthetic OHLCV bars shaped like a multi-ticker yf.download."""
+    tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+    if period:
+        idx = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=5)
+    else:
+        idx = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+    cols = pd.MultiIndex.from_product([FIELDS, tickers], names=["Price", "Ticker"])
+    days = (idx - pd.Timestamp("2000-01-01")).days.to_numpy()[:, None]
+    seeds = np.array([_seed(t) for _, t in cols])[None, :]
+    data = 100 + seeds / 10 + 10 * np.sin(days / 50 + seeds) + days * 0.01
+    missing = np.array([unpriced(t) for _, t in cols])
+    data[:, missing] = np.nan
+    return pd.DataFrame(data, index=idx, columns=cols)
+
+
+def _today() -> float:
+    return float((pd.Timestamp.now().normalize() - pd.Timestamp("2000-01-01")).days)
+
+
+def _live(bare: str) -> tuple[float, float] | None:
+    """Every other missed symbol has a live quote; the rest are bhavcopy-only."""
+    if zlib.crc32(bare.encode()) % 2:
+        return None
+    return _price(bare, _today()), _price(bare, _today() - 1)
+
+
+class Nse:
+    """NseKit.Nse: live equity quotes."""
+
+    def cm_live_equity_full_info(self, symbol: str) -> dict | None:
+        q = _live(symbol)
+        if q is None:
+            return None
+        return {"LastTradedPrice": f"{q[0]:,.2f}", "PreviousClose": f"{q[1]:,.2f}"}
+
+
+def _bhav_frame(d: date, symbols: list[str]) -> pd.DataFrame:
+    """UDiFF-shaped bhavcopy: the requested symbols plus filler scrips."""
+    filler = [f"FILL{i:05d}" for i in range(BHAV_FILLER_ROWS)]
+    names = filler + symbols
+    day = float((pd.Timestamp(d) - pd.Timestamp("2000-01-01")).days)
+    close = [_price(n, day) for n in names]
+    prev = [_price(n, day - 1) for n in names]
+    return pd.DataFrame({
+        "TradDt": d.isoformat(),
+        "TckrSymb": names,
+        "SctySrs": "EQ",
+        "ClsPric": [f"{v:,.2f}" for v in close],
+        "PrvsClsgPric": [f"{v:,.2f}" for v in prev],
+    })
+
+
+# Symbols the bhavcopies list beyond the filler: set by install() callers via
+# register_book(), so every synthetic holding resolves somewhere.
+_BOOK: list[str] = []
+
+
+def register_book(symbols: list[str]) -> None:
+    """Make the fake bhavcopies list these (bare) symbols."""
+    _BOOK[:] = sorted({_bare(s) for s in symbols})
+
+
+def bhavcopy_save(d: date, folder: str) -> str:
+    """jugaad_data.nse.bhavcopy_save: write the day's CSV, return its path."""
+    path = Path(folder) / f"nse_{d:%Y%m%d}.csv"
+    _bhav_frame(d, _BOOK).to_csv(path, index=False)
+    return str(path)
+
+
+class BSE:
+    """bse.BSE: scrip lookup, live quote and bhavcopy report."""
+
+    def __init__(self, download_folder: str = ".") -> None:
+        self.folder = download_folder
+
+    def getScripCode(self, name: str) -> str | None:
+        return str(500000 + zlib.crc32(name.encode()) % 100000)
+
+    def quote(self, code: str) -> dict | None:
+        q = _live(code)
+        return None if q is None else {"LTP": q[0], "PrevClose": q[1]}
+
+    def bhavcopyReport(self, d: date) -> str:
+        path = Path(self.folder) / f"bse_{d:%Y%m%d}.csv"
+        _bhav_frame(d, _BOOK).to_csv(path, index=False)
+        return str(path)
+
+    def exit(self) -> None:
+        pass
+
+
+def install(cache_dir: str | None = None, yfinance: bool = True) -> None:
+    """Register the fake sources (and point the on-disk caches at cache_dir).
+
+    ``yfinance=False`` leaves yfinance alone, for callers that import the real
+    package and patch ``download`` themselves.
+    """
+    if cache_dir is not None:
+        os.environ["SWING_CACHE_DIR"] = cache_dir
+
+    if yfinance:
+        yf = types.ModuleType("yfinance")
+        yf.download = download
+        sys.modules["yfinance"] = yf
+
+    nsekit = types.ModuleType("NseKit")
+    nsekit.Nse = Nse
+
+    bse = types.ModuleType("bse")
+    bse.BSE = BSE
+
+    jugaad = types.ModuleType("jugaad_data")
+    jugaad_nse = types.ModuleType("jugaad_data.nse")
+    jugaad_nse.bhavcopy_save = bhavcopy_save
+    jugaad.nse = jugaad_nse
+
+    sys.modules.update({
+        "NseKit": nsekit,
+        "bse": bse,
+        "jugaad_data": jugaad,
+        "jugaad_data.nse": jugaad_nse,
+    })
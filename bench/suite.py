@@ -0,0 +1,373 @@
+"""
+Benchmark suite: SWING hot paths on generated books, with saved baselines.
+
+Every data source is replaced by the in-process stubs in bench/stubs.py, so
+the suite needs no network. Cases are parameterised by book size (holdings)
+and history length (years):
+
+    calculate_metrics      cold dashboard pricing: yfinance → NSE/BSE live →
+                           bhavcopy → valuation (caches cleared per call)
+    compute_metrics        single-window metrics on daily returns
+    compute_metrics_batch  per-holding metrics on a dates × holdings matrix
+    bhav_lookup            index a bhavcopy and resolve the book against it
+    format_currency        Indian-numbering format of every holding value
+    holdings_table         Portfolio Details table, every cell formatted
+    holdings_grid_page     one 50-row grid page: rank, sort, format, HTML
+    figure_build           Analysis Mode performance chart, built from scratch
+    figure_cache_hit       the same chart served by ui.figure_cache (fingerprint
+                           + lookup), as on a cosmetic rerun
+    downsample             LTTB thinning of one daily series to 400 points
+    monthly_returns_grid   Year × Month heatmap grid
+    rolling_stats          rolling beta / correlation / alpha / TE (63d)
+    portfolio_value        dates × holdings valuation
+
+Each case reports the best and median seconds per call over --repeat runs.
+Results can be saved under bench/results/<name>.json and compared against a
+saved baseline; a case slower than the baseline by more than --tolerance
+(on the best time) is a regression and makes the run exit 1.
+
+    python bench/suite.py --save baseline
+    python bench/suite.py --compare baseline [--save latest]
+    python bench/suite.py --filter 'compute_metrics|rolling' --holdings 10,100 --years 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+sys.path.insert(0, str(ROOT))
+
+import stubs  # noqa: E402
+
+HOLDINGS = [10, 100, 1000, 5000]
+YEARS = [1, 5, 10]
+TRADING_DAYS = 252
+
+
+# ── generated inputs ─────────────────────────────────────────────────────────
+def synthetic_book(holdings: int) -> pd.DataFrame:
+    """Portfolio sheet: NSE symbols with every tenth one on BSE."""
+    rng = np.random.default_rng(holdings)
+    symbols = [
+        f"SYN{i:05d}.BO" if i % 10 == 9 else f"SYN{i:05d}" for i in range(holdings)
+    ]
+    return pd.DataFrame({
+        "ASSET NAME": [f"Synthetic {i}" for i in range(holdings)],
+        "SYMBOL": symbols,
+        "QUANTITY": rng.integers(1, 500, holdings),
+        "AVERAGE PRICE": rng.uniform(50, 150, holdings).round(2),
+    })
+
+
+def synthetic_prices(holdings: int, years: int, seed: int = 3) -> pd.DataFrame:
+    """Dates × holdings random-walk closes with a few pre-listing gaps."""
+    rng = np.random.default_rng(seed)
+    days = years * TRADING_DAYS
+    idx = pd.bdate_range(end="2026-10-16", periods=days)
+    steps = rng.normal(0.0004, 0.015, (days, holdings))
+    prices = 100 * np.exp(np.cumsum(steps, axis=0))
+    listed = rng.integers(0, days // 4, holdings)
+    prices[np.arange(days)[:, None] < listed[None, :]] = np.nan
+    return pd.DataFrame(prices, index=idx, columns=[f"SYN{i:05d}" for i in range(holdings)])
+
+
+def synthetic_returns(years: int, seed: int = 11) -> tuple[pd.Series, pd.Series]:
+    rng = np.random.default_rng(seed)
+    days = years * TRADING_DAYS
+    idx = pd.bdate_range(end="2026-10-16", periods=days)
+    bench = rng.normal(0.0004, 0.011, days)
+    port = 0.9 * bench + rng.normal(0.0002, 0.006, days)
+    return pd.Series(port, index=idx), pd.Series(bench, index=idx)
+
+
+# ── cases: (params) → zero-argument callable to time ─────────────────────────
+def _swing():
+    """The Streamlit module, imported in bare mode with its log silenced."""
+    logging.disable(logging.WARNING)  # bare-mode "no runtime" notices
+    import swing
+    from core.console import log
+
+    log.enabled = False
+    # Keep the background quote warmer idle: every call must be a cold fetch.
+    swing._quote_warmer().is_open = lambda now: False
+    return swing
+
+
+def case_calculate_metrics(holdings: int) -> Callable[[], Any]:
+    swing = _swing()
+    book = synthetic_book(holdings)
+    stubs.register_book(book["SYMBOL"].tolist())
+
+    def run() -> Any:
+        swing.clear_cache_layers(["quotes", "prev_close", "secondary"])
+        return swing.calculate_metrics(book)
+
+    run()  # warm the on-disk bhavcopy cache, as in a running app
+    return run
+
+
+def case_compute_metrics(years: int) -> Callable[[], Any]:
+    from core.analytics import compute_metrics
+
+    port, bench = synthetic_returns(years)
+    return lambda: compute_metrics(port, bench)
+
+
+def case_compute_metrics_batch(holdings: int, years: int) -> Callable[[], Any]:
+    from core.analytics import compute_metrics_batch
+
+    returns = synthetic_prices(holdings, years).pct_change(fill_method=None).iloc[1:]
+    _, bench = synthetic_returns(years)
+    return lambda: compute_metrics_batch(returns, bench)
+
+
+def case_bhav_lookup(holdings: int) -> Callable[[], Any]:
+    from core.quotes import _bhav_lookup, _bhav_pick
+
+    book = [s.rsplit(".", 1)[0] for s in synthetic_book(holdings)["SYMBOL"]]
+    frame = stubs._bhav_frame(datetime(2026, 10, 16).date(), book)
+    return lambda: _bhav_pick(_bhav_lookup(frame, eq_only=True), book)
+
+
+def case_format_currency(holdings: int) -> Callable[[], Any]:
+    swing = _swing()
+    values = np.random.default_rng(5).lognormal(12, 2.5, holdings) * np.where(
+        np.arange(holdings) % 7 == 0, -1, 1
+    )
+    return lambda: [swing.format_currency(v) for v in values]
+
+
+def _valued_book(holdings: int) -> pd.DataFrame:
+    book = synthetic_book(holdings)
+    rng = np.random.default_rng(7)
+    price = book['AVERAGE PRICE'] * rng.uniform(0.5, 2.0, holdings)
+    invested = book['QUANTITY'] * book['AVERAGE PRICE']
+    value = book['QUANTITY'] * price
+    return book.assign(**{
+        'CURRENT PRICE': price, 'INVESTED': invested, 'CURR. VALUE': value,
+        'GAIN': value - invested, 'GAIN %': (value / invested - 1) * 100,
+        'WT': value / value.sum() * 100,
+    })
+
+
+def case_holdings_table(holdings: int) -> Callable[[], Any]:
+    swing = _swing()
+    df = _valued_book(holdings)
+    return lambda: swing.holdings_table(df)
+
+
+def case_holdings_grid_page(holdings: int) -> Callable[[], Any]:
+    swing = _swing()
+    df = _valued_book(holdings)
+
+    def run() -> str:
+        rows, _ = swing.page_holdings(swing.rank_holdings(df), "", 'GAIN %', True, 1, 50)
+        return swing.format_holdings(rows).to_html(escape=False, index=False, border=0)
+
+    return run
+
+
+def _performance_inputs(years: int) -> tuple[pd.Series, pd.Series, float]:
+    prices = synthetic_prices(2, years).bfill()
+    port, bench = prices["SYN00000"], prices["SYN00001"]
+    return port, bench, (port.iloc[-1] / port.iloc[0] - 1) * 100
+
+
+def case_figure_build(years: int) -> Callable[[], Any]:
+    swing = _swing()
+    args = _performance_inputs(years)
+    return lambda: swing._performance_figure(*args)
+
+
+def case_figure_cache_hit(years: int) -> Callable[[], Any]:
+    from ui.figure_cache import FigureCache
+
+    swing = _swing()
+    args = _performance_inputs(years)
+    cache = FigureCache()
+    cache.get("performance", swing._performance_figure, *args)
+    return lambda: cache.get("performance", swing._performance_figure, *args)
+
+
+def case_downsample(years: int) -> Callable[[], Any]:
+    from ui.downsample import downsample
+
+    values = synthetic_prices(1, years)["SYN00000"].bfill()
+    return lambda: downsample(values, 400)
+
+
+def case_monthly_returns_grid(years: int) -> Callable[[], Any]:
+    from core.analytics import monthly_returns_grid
+
+    values = synthetic_prices(1, years)["SYN00000"].bfill()
+    return lambda: monthly_returns_grid(values)
+
+
+def case_rolling_stats(years: int) -> Callable[[], Any]:
+    from core.analytics import rolling_stats
+
+    port, bench = synthetic_returns(years)
+    return lambda: rolling_stats(port, bench, 63)
+
+
+def case_portfolio_value(holdings: int, years: int) -> Callable[[], Any]:
+    from core.valuation import portfolio_value
+
+    prices = synthetic_prices(holdings, years)
+    quantities = dict(zip(prices.columns, np.arange(1, holdings + 1, dtype=float)))
+    return lambda: portfolio_value(prices, quantities)
+
+
+CASES: dict[str, tuple[Callable[..., Callable[[], Any]], tuple[str, ...]]] = {
+    "calculate_metrics": (case_calculate_metrics, ("holdings",)),
+    "compute_metrics": (case_compute_metrics, ("years",)),
+    "compute_metrics_batch": (case_compute_metrics_batch, ("holdings", "years")),
+    "bhav_lookup": (case_bhav_lookup, ("holdings",)),
+    "format_currency": (case_format_currency, ("holdings",)),
+    "holdings_table": (case_holdings_table, ("holdings",)),
+    "holdings_grid_page": (case_holdings_grid_page, ("holdings",)),
+    "figure_build": (case_figure_build, ("years",)),
+    "figure_cache_hit": (case_figure_cache_hit, ("years",)),
+    "downsample": (case_downsample, ("years",)),
+    "monthly_returns_grid": (case_monthly_returns_grid, ("years",)),
+    "rolling_stats": (case_rolling_stats, ("years",)),
+    "portfolio_value": (case_portfolio_value, ("holdings", "years")),
+}
+
+
+# ── runner ───────────────────────────────────────────────────────────────────
+def _grid(axes: tuple[str, ...], sizes: dict[str, list[int]]) -> list[dict[str, int]]:
+    grid: list[dict[str, int]] = [{}]
+    for axis in axes:
+        grid = [{**g, axis: v} for g in grid for v in sizes[axis]]
+    return grid
+
+
+def _key(name: str, params: dict[str, int]) -> str:
+    return f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Best / median seconds per call; loops per run sized to ~0.2 s."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(runs), "median": statistics.median(runs), "number": number}
+
+
+def run_suite(pattern: str, sizes: dict[str, list[int]], repeat: int) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name, (factory, axes) in CASES.items():
+        if not re.search(pattern, name):
+            continue
+        for params in _grid(axes, sizes):
+            key = _key(name, params)
+            stats = time_call(factory(**params), repeat)
+            results[key] = stats
+            print(f"{key:<52}{_fmt(stats['best']):>10}{_fmt(stats['median']):>10}", flush=True)
+    return results
+
+
+def _fmt(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _meta() -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()} · {platform.node()}",
+    }
+
+
+def compare(baseline: dict[str, dict], current: dict[str, dict], tolerance: float) -> int:
+    """Print current vs baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'case':<52}{'baseline':>10}{'current':>10}{'ratio':>8}")
+    for key, stats in current.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<52}{'—':>10}{_fmt(stats['best']):>10}{'new':>8}")
+            continue
+        ratio = stats["best"] / base["best"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + tolerance):
+            flag = "  faster"
+        print(f"{key:<52}{_fmt(base['best']):>10}{_fmt(stats['best']):>10}"
+              f"{ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--filter", default="", help="Regex on case names.")
+    ap.add_argument("--holdings", default=",".join(map(str, HOLDINGS)))
+    ap.add_argument("--years", default=",".join(map(str, YEARS)))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--save", metavar="NAME", help="Store results as bench/results/NAME.json.")
+    ap.add_argument("--compare", metavar="NAME", help="Compare against bench/results/NAME.json.")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="Allowed slowdown on the best time before flagging (0.25 = 25%%).")
+    args = ap.parse_args()
+
+    sizes = {
+        "holdings": [int(v) for v in args.holdings.split(",")],
+        "years": [int(v) for v in args.years.split(",")],
+    }
+    baseline = None
+    if args.compare:
+        baseline = json.loads((RESULTS_DIR / f"{args.compare}.json").read_text())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        stubs.install(cache_dir)
+        print(f"{'case':<52}{'best':>10}{'median':>10}")
+        results = run_suite(args.filter, sizes, args.repeat)
+
+    if args.save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{args.save}.json"
+        path.write_text(json.dumps({"meta": _meta(), "results": results}, indent=2) + "\n")
+        print(f"\nsaved → {path.relative_to(ROOT)}")
+    if baseline is not None:
+        meta = baseline.get("meta", {})
+        print(f"\nbaseline '{args.compare}': {meta.get('commit', '?')} · {meta.get('created', '?')}"
+              f" · {meta.get('machine', '?')}")
+        if compare(baseline["results"], results, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
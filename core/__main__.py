@@ -0,0 +1,88 @@
+"""
+Swing — Command-line entry point (no Streamlit, no Plotly).
+
+    python -m core report portfolio.xlsx [more.xlsx …] --timeframes 1M,1Y --out metrics.json
+    python -m core telemetry [--days 7] [--by-day]
+
+There is no ``swing`` console script: the project runs from a checkout with
+no installable package, so this module is the command.
+
+The pipeline log goes to stderr, so ``--out -`` (the default) leaves stdout
+as clean JSON. ``report`` exits 1 if any file could not be read. ``telemetry``
+prints p50/p95 stage latencies from the JSON-lines event log (core.telemetry).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from core.console import log
+from core.metrics import TIMEFRAMES
+from core.report import build_reports, parse_timeframes
+from core.telemetry import read_events, summarize, telemetry
+
+
+def _report(args: argparse.Namespace) -> int:
+    try:
+        timeframes = parse_timeframes(args.timeframes)
+    except ValueError as e:
+        print(f"swing report: {e}", file=sys.stderr)
+        return 2
+    reports = build_reports(args.files, timeframes)
+    payload = json.dumps(
+        {'timeframes': timeframes, 'portfolios': reports},
+        indent=2, ensure_ascii=False, allow_nan=False,
+    )
+    if args.out == '-':
+        sys.stdout.write(payload + "\n")
+    else:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+        log.success(f"Wrote {len(reports)} report(s) → {args.out}")
+    return 1 if any('error' in r for r in reports) else 0
+
+
+def _telemetry(args: argparse.Namespace) -> int:
+    directory = Path(args.dir) if args.dir else telemetry.directory
+    if directory is None:
+        print("swing telemetry: event log disabled (SWING_TELEMETRY=off)", file=sys.stderr)
+        return 2
+    table = summarize(read_events(directory, args.days), by_day=args.by_day)
+    if table.empty:
+        print(f"swing telemetry: no events in {directory} for the last {args.days} day(s)",
+              file=sys.stderr)
+        return 1
+    sys.stdout.write(table.to_string(float_format=lambda v: f"{v:.3f}") + "\n")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m core", description="Swing batch tools.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    rp = sub.add_parser("report", help="Score portfolio files to JSON.")
+    rp.add_argument("files", nargs="+", help="Portfolio sheets (Summary Report.xlsx layout).")
+    rp.add_argument(
+        "--timeframes", default=",".join(TIMEFRAMES),
+        help=f"Comma-separated subset of {','.join(TIMEFRAMES)} (default: all).",
+    )
+    rp.add_argument("--out", default="-", help="Output JSON path, or - for stdout.")
+    rp.add_argument("--quiet", action="store_true", help="Suppress the pipeline log.")
+    rp.set_defaults(run=_report)
+
+    tp = sub.add_parser("telemetry", help="Summarise stage latencies from the event log.")
+    tp.add_argument("--days", type=int, default=7, help="Days of event files to read (default 7).")
+    tp.add_argument("--by-day", action="store_true", help="One row per day, stage and source.")
+    tp.add_argument("--dir", help="Event directory (default: SWING_TELEMETRY or <cache>/telemetry).")
+    tp.set_defaults(run=_telemetry)
+
+    args = ap.parse_args(argv)
+    log.stream = sys.stderr
+    log.enabled = not getattr(args, 'quiet', False)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,608 @@
+"""
+Swing — Vectorized analytics kernels for the Analysis Mode panels.
+
+Pure NumPy/pandas (no Streamlit, no Plotly) so the same kernels serve the
+dashboard, batch jobs and benchmarks.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing ``window``-length sums via one cumulative sum (NaN before full)."""
+    c = np.concatenate(([0.0], np.cumsum(x)))
+    out = np.full(len(x), np.nan)
+    out[window - 1:] = c[window:] - c[:-window]
+    return out
+
+
+def rolling_stats(
+    port: pd.Series,
+    bench: pd.Series,
+    window: int,
+    rf_rate: float = 0.065,
+) -> pd.DataFrame:
+    """Rolling beta, correlation, alpha and tracking error in one pass.
+
+    Both series are daily returns; they are inner-joined on date first. Each
+    row uses the ``window`` observations *before* that date (the window ends
+    on the previous session), matching the original per-window loop's
+    ``iloc[i - window:i]`` plotted at date ``i``. Windowed first and second moments come from cumulative sums of
+    the demeaned series, so the cost is O(N) regardless of ``window``.
+
+    Columns:
+        beta            cov(p, b) / var(b)  (1 where var(b) == 0)
+        correlation     Pearson correlation
+        alpha           annualized Jensen's alpha, %
+        tracking_error  annualized std of (p - b), %
+    """
+    aligned = pd.concat([port, bench], axis=1).dropna()
+    cols = ['beta', 'correlation', 'alpha', 'tracking_error']
+    if len(aligned) < window or window < 2:
+        return pd.DataFrame(columns=cols, dtype=float)
+
+    p = aligned.iloc[:, 0].to_numpy(dtype=float)
+    b = aligned.iloc[:, 1].to_numpy(dtype=float)
+    # Demean globally before squaring — keeps the cumulative sums well
+    # conditioned; (co)variances are shift-invariant.
+    mp, mb = p.mean(), b.mean()
+    pc, bc = p - mp, b - mb
+
+    s_p = _window_sums(pc, window)
+    s_b = _window_sums(bc, window)
+    s_pp = _window_sums(pc * pc, window)
+    s_bb = _window_sums(bc * bc, window)
+    s_pb = _window_sums(pc * bc, window)
+
+    n = float(window)
+    var_p = (s_pp - s_p * s_p / n) / (n - 1)
+    var_b = (s_bb - s_b * s_b / n) / (n - 1)
+    cov = (s_pb - s_p * s_b / n) / (n - 1)
+    var_p = np.maximum(var_p, 0.0)
+    var_b = np.maximum(var_b, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.where(var_b > 0, cov / var_b, 1.0)
+        corr = np.where((var_p > 0) & (var_b > 0), cov / np.sqrt(var_p * var_b), 0.0)
+    beta[: window - 1] = np.nan
+    corr[: window - 1] = np.nan
+
+    rf_daily = rf_rate / TRADING_DAYS
+    mean_p = s_p / n + mp
+    mean_b = s_b / n + mb
+    alpha = (mean_p - rf_daily - beta * (mean_b - rf_daily)) * TRADING_DAYS * 100
+    te = np.sqrt(np.maximum(var_p + var_b - 2 * cov, 0.0)) * np.sqrt(TRADING_DAYS) * 100
+
+    out = pd.DataFrame(
+        {'beta': beta, 'correlation': corr, 'alpha': alpha, 'tracking_error': te},
+        index=aligned.index,
+    )
+    # Row k holds the window ending at k; shift so date i shows [i-W, i).
+    return out.shift(1).iloc[window:]
+
+
+METRIC_DEFAULTS: dict[str, float] = {
+    'total_return': 0, 'cagr': 0, 'volatility': 0, 'daily_vol': 0,
+    'max_drawdown': 0,
+    'sharpe': 0, 'sortino': 0, 'calmar': 0,
+    'var_95': 0, 'var_99': 0, 'cvar_95': 0,
+    'win_rate': 0, 'win_days': 0, 'lose_days': 0,
+    'best_day': 0, 'worst_day': 0,
+    'skewness': 0, 'kurtosis': 0, 'profit_factor': 0,
+    'beta': 1, 'alpha': 0, 'correlation': 0, 'r_squared': 0,
+    'tracking_error': 0, 'info_ratio': 0, 'treynor': 0,
+    'up_capture': 100, 'down_capture': 100, 'benchmark_return': 0,
+}
+
+
+def compute_metrics(
+    returns: pd.Series,
+    benchmark_returns: pd.Series | None = None,
+    rf_rate: float = 0.065,
+) -> dict[str, Any]:
+    """Compute institutional-grade performance metrics.
+
+    Handles edge cases:
+    - Short periods (< 5 days)
+    - Negative total returns
+    - Zero volatility
+    - Missing benchmark data
+    """
+    m = {}
+    
+    if returns.empty or len(returns) < 2:
+        # Return empty dict with safe defaults
+        return {
+            'total_return': 0, 'cagr': 0, 'volatility': 0, 'daily_vol': 0,
+            'max_drawdown': 0, 'drawdown_series': pd.Series(),
+            'sharpe': 0, 'sortino': 0, 'calmar': 0,
+            'var_95': 0, 'var_99': 0, 'cvar_95': 0,
+            'win_rate': 0, 'win_days': 0, 'lose_days': 0,
+            'best_day': 0, 'worst_day': 0,
+            'skewness': 0, 'kurtosis': 0, 'profit_factor': 0,
+            'beta': 1, 'alpha': 0, 'correlation': 0, 'r_squared': 0,
+            'tracking_error': 0, 'info_ratio': 0, 'treynor': 0,
+            'up_capture': 100, 'down_capture': 100, 'benchmark_return': 0
+        }
+    
+    # Period metrics
+    total_ret = (1 + returns).prod() - 1
+    n_days = len(returns)
+    
+    # Annualization factor - cap at 1 for very short periods
+    ann_factor = min(252 / n_days, 1) if n_days < 252 else 252 / n_days
+    
+    m['total_return'] = total_ret * 100
+    
+    # CAGR calculation - handle negative returns properly
+    if total_ret > -1:  # Can only compute if not total loss
+        # For short periods, just annualize the total return
+        if n_days < 20:
+            m['cagr'] = total_ret * (252 / n_days) * 100  # Simple annualization
+        else:
+            m['cagr'] = ((1 + total_ret) ** ann_factor - 1) * 100
+    else:
+        m['cagr'] = -100  # Total loss
+    
+    # Volatility
+    daily_vol = returns.std()
+    m['volatility'] = daily_vol * np.sqrt(252) * 100 if daily_vol > 0 else 0
+    m['daily_vol'] = daily_vol * 100
+    
+    # Drawdown
+    cum = (1 + returns).cumprod()
+    peak = cum.expanding().max()
+    dd = (cum - peak) / peak
+    m['max_drawdown'] = dd.min() * 100
+    m['drawdown_series'] = dd * 100
+    
+    # Risk-adjusted ratios
+    rf_daily = rf_rate / 252
+    excess = returns - rf_daily
+    excess_mean = excess.mean()
+    
+    # Sharpe - handle zero/near-zero volatility
+    if daily_vol > 1e-8:
+        m['sharpe'] = (excess_mean / daily_vol) * np.sqrt(252)
+    else:
+        m['sharpe'] = 0 if abs(excess_mean) < 1e-8 else (np.sign(excess_mean) * 10)  # Cap at ±10
+    
+    # Sortino - use downside deviation
+    downside = returns[returns < 0]
+    if len(downside) > 0:
+        downside_vol = downside.std()
+        if downside_vol > 1e-8:
+            m['sortino'] = (excess_mean / downside_vol) * np.sqrt(252)
+        else:
+            m['sortino'] = m['sharpe']  # Fall back to Sharpe
+    else:
+        # No negative days - exceptional performance
+        m['sortino'] = m['sharpe'] * 1.5 if m['sharpe'] > 0 else 0
+    
+    # Calmar - handle zero drawdown
+    if abs(m['max_drawdown']) > 0.01:  # At least 0.01% drawdown
+        m['calmar'] = m['cagr'] / abs(m['max_drawdown'])
+    else:
+        m['calmar'] = m['cagr'] if m['cagr'] > 0 else 0
+    
+    # VaR and CVaR (always negative or zero for losses)
+    m['var_95'] = np.percentile(returns, 5) * 100
+    m['var_99'] = np.percentile(returns, 1) * 100
+    var_threshold = np.percentile(returns, 5)
+    tail = returns[returns <= var_threshold]
+    m['cvar_95'] = tail.mean() * 100 if len(tail) > 0 else m['var_95']
+    
+    # Win rate
+    m['win_rate'] = (returns > 0).mean() * 100
+    m['win_days'] = int((returns > 0).sum())
+    m['lose_days'] = int((returns < 0).sum())
+    
+    # Best/Worst
+    m['best_day'] = returns.max() * 100
+    m['worst_day'] = returns.min() * 100
+    
+    # Skew and Kurtosis - need enough data
+    if n_days >= 5:
+        m['skewness'] = returns.skew()
+        m['kurtosis'] = returns.kurtosis()
+    else:
+        m['skewness'] = 0
+        m['kurtosis'] = 0
+    
+    # Profit Factor
+    gains = returns[returns > 0].sum()
+    losses = abs(returns[returns < 0].sum())
+    if losses > 1e-8:
+        m['profit_factor'] = gains / losses
+    elif gains > 0:
+        m['profit_factor'] = 10  # Cap at 10 for display
+    else:
+        m['profit_factor'] = 0
+    
+    # Initialize benchmark defaults
+    m['beta'] = 1
+    m['alpha'] = 0
+    m['correlation'] = 0
+    m['r_squared'] = 0
+    m['tracking_error'] = 0
+    m['info_ratio'] = 0
+    m['treynor'] = 0
+    m['up_capture'] = 100
+    m['down_capture'] = 100
+    m['benchmark_return'] = 0
+    
+    # Benchmark-relative metrics
+    if benchmark_returns is not None and len(benchmark_returns) > 5:
+        aligned = pd.concat([returns, benchmark_returns], axis=1).dropna()
+        if len(aligned) > 5:
+            p_ret = aligned.iloc[:, 0]
+            b_ret = aligned.iloc[:, 1]
+            
+            # Beta
+            var_b = b_ret.var()
+            if var_b > 1e-10:
+                cov = np.cov(p_ret, b_ret)[0, 1]
+                m['beta'] = cov / var_b
+            else:
+                m['beta'] = 1
+            
+            # Benchmark return
+            b_total = (1 + b_ret).prod() - 1
+            m['benchmark_return'] = b_total * 100
+            
+            # Alpha (annualized) - CAPM formula
+            aligned_days = len(aligned)
+            aligned_ann = min(252 / aligned_days, 1) if aligned_days < 252 else 252 / aligned_days
+            
+            if b_total > -1:
+                b_cagr = ((1 + b_total) ** aligned_ann - 1) if aligned_days >= 20 else b_total * (252 / aligned_days)
+            else:
+                b_cagr = -1
+            
+            p_cagr = m['cagr'] / 100
+            expected_return = rf_rate + m['beta'] * (b_cagr - rf_rate)
+            m['alpha'] = (p_cagr - expected_return) * 100
+            
+            # Correlation and R-squared
+            corr = p_ret.corr(b_ret)
+            m['correlation'] = corr if not np.isnan(corr) else 0
+            m['r_squared'] = m['correlation'] ** 2
+            
+            # Tracking Error
+            tracking_diff = p_ret - b_ret
+            tracking = tracking_diff.std() * np.sqrt(252)
+            m['tracking_error'] = tracking * 100
+            
+            # Information Ratio
+            if tracking > 1e-8:
+                excess_ret = p_cagr - b_cagr
+                m['info_ratio'] = excess_ret / tracking
+            else:
+                m['info_ratio'] = 0
+            
+            # Treynor Ratio
+            if abs(m['beta']) > 0.01:
+                m['treynor'] = (p_cagr - rf_rate) / m['beta']
+            else:
+                m['treynor'] = 0
+            
+            # Up/Down Capture
+            up_mask = b_ret > 0
+            down_mask = b_ret < 0
+            
+            if up_mask.sum() > 0:
+                up_p = (1 + p_ret[up_mask]).prod()
+                up_b = (1 + b_ret[up_mask]).prod()
+                if up_b > 0:
+                    m['up_capture'] = (up_p / up_b) * 100
+            
+            if down_mask.sum() > 0:
+                down_p = (1 + p_ret[down_mask]).prod()
+                down_b = (1 + b_ret[down_mask]).prod()
+                if down_b > 0 and down_b != 1:
+                    m['down_capture'] = (down_p / down_b) * 100
+    
+    return m
+
+
+def _masked_std(x: np.ndarray, mask: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Column-wise sample std (ddof=1) over ``mask``; NaN where n < 2."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(mask, x, 0.0).sum(0) / n
+        sq = np.where(mask, (x - mean) ** 2, 0.0).sum(0)
+        return np.where(n > 1, np.sqrt(sq / (n - 1)), np.nan)
+
+
+def _ann_factor(n: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore'):
+        return np.where(n < TRADING_DAYS, np.minimum(TRADING_DAYS / n, 1), TRADING_DAYS / n)
+
+
+def compute_metrics_batch(
+    returns: pd.DataFrame,
+    benchmark_returns: pd.Series | None = None,
+    rf_rate: float = 0.065,
+) -> pd.DataFrame:
+    """Column-wise ``compute_metrics`` over a dates × series returns matrix.
+
+    Each column (a holding, a timeframe window, a scenario …) is scored as if
+    its non-NaN values were passed to ``compute_metrics`` on their own, with
+    the same edge-case handling, but every statistic is one NumPy reduction
+    along the date axis. Returns one row per column with the scalar metric
+    keys of ``compute_metrics`` (the drawdown series is not included).
+    """
+    if returns.empty:
+        return pd.DataFrame(columns=list(METRIC_DEFAULTS), dtype=float)
+
+    R = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(R)
+    n = valid.sum(0).astype(float)
+    R0 = np.where(valid, R, 0.0)
+    sqrt_td = np.sqrt(TRADING_DAYS)
+    m: dict[str, np.ndarray] = {}
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Period metrics
+        total_ret = np.prod(1 + R0, axis=0) - 1
+        ann = _ann_factor(n)
+        m['total_return'] = total_ret * 100
+        short = np.where(n > 0, total_ret * (TRADING_DAYS / n) * 100, 0)
+        long_ = ((1 + total_ret) ** ann - 1) * 100
+        m['cagr'] = np.where(total_ret > -1, np.where(n < 20, short, long_), -100.0)
+
+        # Volatility
+        daily_vol = _masked_std(R, valid, n)
+        m['volatility'] = np.where(daily_vol > 0, daily_vol * sqrt_td * 100, 0)
+        m['daily_vol'] = daily_vol * 100
+
+        # Drawdown — NaN days act as flat days (same as dropping them); the
+        # running peak only starts at each series' first real observation.
+        cum = np.cumprod(1 + R0, axis=0)
+        peak = np.maximum.accumulate(np.where(valid, cum, 0.0), axis=0)
+        dd = np.where(valid, (cum - peak) / peak, 0.0)
+        m['max_drawdown'] = dd.min(0) * 100
+
+        # Risk-adjusted ratios
+        excess_mean = R0.sum(0) / n - rf_rate / TRADING_DAYS
+        m['sharpe'] = np.where(
+            daily_vol > 1e-8,
+            excess_mean / daily_vol * sqrt_td,
+            np.where(np.abs(excess_mean) < 1e-8, 0, np.sign(excess_mean) * 10),
+        )
+        neg = valid & (R < 0)
+        n_neg = neg.sum(0).astype(float)
+        downside_vol = _masked_std(R, neg, n_neg)
+        m['sortino'] = np.where(
+            n_neg > 0,
+            np.where(downside_vol > 1e-8, excess_mean / downside_vol * sqrt_td, m['sharpe']),
+            np.where(m['sharpe'] > 0, m['sharpe'] * 1.5, 0),
+        )
+        m['calmar'] = np.where(
+            np.abs(m['max_drawdown']) > 0.01,
+            m['cagr'] / np.abs(m['max_drawdown']),
+            np.where(m['cagr'] > 0, m['cagr'], 0),
+        )
+
+        # VaR and CVaR
+        p5 = np.nanpercentile(R, 5, axis=0)
+        m['var_95'] = p5 * 100
+        m['var_99'] = np.nanpercentile(R, 1, axis=0) * 100
+        tail = valid & (R <= p5)
+        n_tail = tail.sum(0)
+        m['cvar_95'] = np.where(
+            n_tail > 0, np.where(tail, R, 0.0).sum(0) / n_tail * 100, m['var_95']
+        )
+
+        # Win rate, best/worst
+        pos = valid & (R > 0)
+        m['win_rate'] = pos.sum(0) / n * 100
+        m['win_days'] = pos.sum(0)
+        m['lose_days'] = n_neg
+        m['best_day'] = np.nanmax(R, axis=0) * 100
+        m['worst_day'] = np.nanmin(R, axis=0) * 100
+
+        # Skew and kurtosis (pandas' bias-adjusted estimators)
+        mean = R0.sum(0) / n
+        d = np.where(valid, R - mean, 0.0)
+        m2 = (d ** 2).sum(0) / n
+        m3 = (d ** 3).sum(0) / n
+        m4 = (d ** 4).sum(0) / n
+        skew = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+        kurt = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (m4 / m2 ** 2 - 3) + 6)
+        flat = m2 <= 1e-14 * np.maximum(mean ** 2, 1e-300)
+        m['skewness'] = np.where((n >= 5) & ~flat, skew, 0)
+        m['kurtosis'] = np.where((n >= 5) & ~flat, kurt, 0)
+
+        # Profit factor
+        gains = np.where(pos, R, 0.0).sum(0)
+        losses = np.abs(np.where(neg, R, 0.0).sum(0))
+        m['profit_factor'] = np.where(
+            losses > 1e-8, gains / losses, np.where(gains > 0, 10, 0)
+        )
+
+        # Benchmark-relative metrics
+        k = R.shape[1]
+        for key in ('beta', 'alpha', 'correlation', 'r_squared', 'tracking_error',
+                    'info_ratio', 'treynor', 'up_capture', 'down_capture',
+                    'benchmark_return'):
+            m[key] = np.full(k, float(METRIC_DEFAULTS[key]))
+
+        if benchmark_returns is not None and len(benchmark_returns) > 5:
+            b = benchmark_returns.reindex(returns.index).to_numpy(dtype=float)[:, None]
+            both = valid & ~np.isnan(b)
+            na = both.sum(0).astype(float)
+            ok = na > 5
+            P = np.where(both, R, 0.0)
+            B = np.where(both, b, 0.0)
+            mp, mb = P.sum(0) / na, B.sum(0) / na
+            dp, db = np.where(both, R - mp, 0.0), np.where(both, b - mb, 0.0)
+            var_b = (db ** 2).sum(0) / (na - 1)
+            var_p = (dp ** 2).sum(0) / (na - 1)
+            cov = (dp * db).sum(0) / (na - 1)
+            beta = np.where(var_b > 1e-10, cov / var_b, 1.0)
+
+            b_total = np.prod(1 + B, axis=0) - 1
+            b_cagr = np.where(
+                b_total > -1,
+                np.where(na >= 20, (1 + b_total) ** _ann_factor(na) - 1,
+                         b_total * (TRADING_DAYS / na)),
+                -1.0,
+            )
+            p_cagr = m['cagr'] / 100
+            alpha = (p_cagr - (rf_rate + beta * (b_cagr - rf_rate))) * 100
+            corr = cov / np.sqrt(var_p * var_b)
+            corr = np.where(np.isfinite(corr), corr, 0)
+            tracking = _masked_std(R - b, both, na) * sqrt_td
+
+            up, down = both & (b > 0), both & (b < 0)
+            up_p = np.prod(np.where(up, 1 + R, 1.0), axis=0)
+            up_b = np.prod(np.where(up, 1 + b, 1.0), axis=0)
+            down_p = np.prod(np.where(down, 1 + R, 1.0), axis=0)
+            down_b = np.prod(np.where(down, 1 + b, 1.0), axis=0)
+            up_cap = np.where((up.sum(0) > 0) & (up_b > 0), up_p / up_b * 100, 100.0)
+            down_cap = np.where(
+                (down.sum(0) > 0) & (down_b > 0) & (down_b != 1), down_p / down_b * 100, 100.0
+            )
+
+            rel = {
+                'beta': beta,
+                'benchmark_return': b_total * 100,
+                'alpha': alpha,
+                'correlation': corr,
+                'r_squared': corr ** 2,
+                'tracking_error': tracking * 100,
+                'info_ratio': np.where(tracking > 1e-8, (p_cagr - b_cagr) / tracking, 0),
+                'treynor': np.where(np.abs(beta) > 0.01, (p_cagr - rf_rate) / beta, 0),
+                'up_capture': up_cap,
+                'down_capture': down_cap,
+            }
+            for key, val in rel.items():
+                m[key] = np.where(ok, val, m[key])
+
+    # Series too short to score get compute_metrics' safe defaults.
+    too_short = n < 2
+    out = pd.DataFrame(
+        {key: np.where(too_short, default, m[key]) for key, default in METRIC_DEFAULTS.items()},
+        index=returns.columns,
+    )
+    out[['win_days', 'lose_days']] = out[['win_days', 'lose_days']].astype(int)
+    return out
+
+
+def drawdown_series(returns: pd.Series) -> pd.Series:
+    """Underwater curve (%) of a daily returns series, as in compute_metrics."""
+    cum = (1 + returns).cumprod()
+    peak = cum.expanding().max()
+    return (cum - peak) / peak * 100
+
+
+def window_returns(values: pd.Series, starts: dict[str, date]) -> pd.DataFrame:
+    """Daily returns of one value series laid out as a dates × windows matrix.
+
+    Column ``label`` holds exactly the returns a fetch starting at
+    ``starts[label]`` would produce: the first value dated on/after the start
+    is the base, so only returns dated strictly after it are kept (NaN
+    elsewhere). Feed the result to ``compute_metrics_batch``.
+    """
+    returns = values.pct_change(fill_method=None).dropna()
+    cols = {}
+    for label, start in starts.items():
+        in_window = values.index[values.index >= pd.Timestamp(start)]
+        if len(in_window) > 0:
+            cols[label] = returns.where(returns.index > in_window[0])
+        else:
+            cols[label] = pd.Series(np.nan, index=returns.index)
+    return pd.DataFrame(cols, index=returns.index)
+
+
+MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def monthly_returns_grid(values: pd.Series) -> pd.DataFrame:
+    """Year × month returns grid (%) plus a YTD column, from a value series.
+
+    One month-end resample gives the month-over-month returns, pivoted to
+    years × Jan…Dec; YTD is last/first value within each calendar year from
+    one groupby. Works for any price or value series — portfolio, benchmark
+    or a single holding. Years without a monthly return are omitted; an
+    empty frame means there is less than two months of returns.
+    """
+    cols = MONTH_LABELS + ['YTD']
+    values = values.dropna()
+    if values.empty:
+        return pd.DataFrame(columns=cols, dtype=float)
+    monthly = values.resample('ME').last().pct_change(fill_method=None).dropna() * 100
+    if len(monthly) <= 1:
+        return pd.DataFrame(columns=cols, dtype=float)
+
+    grid = pd.Series(
+        monthly.to_numpy(), index=[monthly.index.year, monthly.index.month]
+    ).unstack()
+    grid = grid.reindex(columns=range(1, 13))
+    grid.columns = MONTH_LABELS
+
+    by_year = values.groupby(values.index.year)
+    first, last = by_year.first(), by_year.last()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ytd = ((last / first) - 1).where(first > 0) * 100
+    grid['YTD'] = ytd.reindex(grid.index)
+    grid.index.name = 'Year'
+    return grid
+
+
+def holding_attribution(
+    prices: pd.DataFrame,
+    values: pd.DataFrame,
+    weights: pd.Series,
+) -> pd.DataFrame:
+    """Per-holding return attribution for a window, in one vectorized pass.
+
+    Args:
+        prices:  dates × holdings close prices (NaN before a holding prices).
+        values:  dates × holdings position values (price × quantity held).
+        weights: current portfolio weight (%) per holding.
+
+    Columns (holdings with at least two prices):
+        Return           first → last valid price, %
+        Weight           current weight, %
+        Contribution     Return × current Weight
+        TW Contribution  Σ_t w[t-1] · r[t] · G[t-1], % — daily start-of-day
+                         weights × daily returns, linked by the portfolio's
+                         growth to date G, so the column sums exactly to the
+                         time-weighted portfolio return over the window.
+    """
+    cols = ['Return', 'Weight', 'Contribution', 'TW Contribution']
+    if prices.empty:
+        return pd.DataFrame(columns=cols, dtype=float)
+
+    n_valid = prices.notna().sum()
+    first = prices.bfill().iloc[0]
+    last = prices.ffill().iloc[-1]
+    ret = ((last / first) - 1) * 100
+    wt = weights.reindex(prices.columns).fillna(0)
+
+    held = values.reindex(index=prices.index, columns=prices.columns).fillna(0)
+    daily_ret = prices.pct_change(fill_method=None).fillna(0)
+    prev = held.shift(1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_wt = prev.div(prev.sum(axis=1), axis=0).fillna(0)
+    daily_contrib = daily_wt * daily_ret
+    growth_prev = (1 + daily_contrib.sum(axis=1)).cumprod().shift(1).fillna(1)
+    tw = daily_contrib.mul(growth_prev, axis=0).sum() * 100
+
+    out = pd.DataFrame({
+        'Return': ret,
+        'Weight': wt,
+        'Contribution': ret * wt / 100,
+        'TW Contribution': tw,
+    })
+    return out[n_valid > 1]
@@ -0,0 +1,160 @@
+"""
+Swing — Persistent bhavcopy cache keyed by exchange and trade date.
+
+Each successfully fetched EOD bhavcopy is stored *parsed* (TckrSymb →
+close / prev_close) as a small Parquet file, and a per-exchange manifest
+records which dates are known to have no file (holidays, weekends). Finding
+the most recent bhavcopy then means: skip known-missing dates, probe every
+not-yet-known candidate concurrently, and fall back to the newest cached day.
+Once warm, an EOD backstop is a single local read.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from core.storage import DEFAULT_CACHE_DIR, atomic_write_bytes
+
+OK = "ok"
+MISSING = "missing"
+
+
+class NotPublished(LookupError):
+    """Raised by a fetch when the exchange definitely has no file for a date
+    (HTTP 404, an empty archive) — as opposed to a timeout or server error."""
+
+
+class BhavCache:
+    """Parsed bhavcopies on disk plus a date manifest, per exchange."""
+
+    def __init__(self, root: str | Path | None = None, workers: int = 4) -> None:
+        self.root = Path(root) if root is not None else DEFAULT_CACHE_DIR
+        self.dir = self.root / "bhavcopy"
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._manifests: dict[str, dict[str, str]] = {}
+
+    # ── manifest ────────────────────────────────────────────────────────────
+    def _manifest_path(self, exchange: str) -> Path:
+        return self.dir / exchange / "manifest.json"
+
+    def _manifest(self, exchange: str) -> dict[str, str]:
+        if exchange not in self._manifests:
+            try:
+                self._manifests[exchange] = json.loads(self._manifest_path(exchange).read_text())
+            except (OSError, ValueError):
+                self._manifests[exchange] = {}
+        return self._manifests[exchange]
+
+    def _mark(self, exchange: str, day: date, status: str) -> None:
+        with self._lock:
+            manifest = self._manifest(exchange)
+            manifest[day.isoformat()] = status
+            payload = json.dumps(manifest, sort_keys=True).encode()
+            atomic_write_bytes(self._manifest_path(exchange), payload)
+
+    def status(self, exchange: str, day: date) -> str | None:
+        """``"ok"``, ``"missing"`` or None (never probed) for a trade date."""
+        with self._lock:
+            return self._manifest(exchange).get(day.isoformat())
+
+    # ── files ───────────────────────────────────────────────────────────────
+    def _path(self, exchange: str, day: date) -> Path:
+        return self.dir / exchange / f"{day.isoformat()}.parquet"
+
+    def get(self, exchange: str, day: date) -> pd.DataFrame | None:
+        """Parsed bhavcopy for a date, or None if not cached."""
+        path = self._path(exchange, day)
+        if not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return None
+
+    def put(self, exchange: str, day: date, lookup: pd.DataFrame) -> None:
+        atomic_write_bytes(self._path(exchange, day), lookup.to_parquet())
+        self._mark(exchange, day, OK)
+
+    # ── search ──────────────────────────────────────────────────────────────
+    def latest(
+        self,
+        exchange: str,
+        today: date,
+        fetch: Callable[[date], pd.DataFrame],
+        max_back: int = 7,
+        deadline: float | None = None,
+        candidates: list[date] | None = None,
+    ) -> tuple[date, pd.DataFrame, bool] | None:
+        """Most recent available bhavcopy as ``(trade_date, lookup, from_cache)``.
+
+        ``fetch(day)`` downloads and parses one day, raising ``NotPublished``
+        (or returning an empty frame) when the exchange has no file for it and
+        any other exception on a transient failure. Dates newer than the
+        newest cached day that are not known-missing are probed concurrently;
+        the newest success wins.
+
+        Without ``candidates`` the last ``max_back`` calendar days are probed
+        blind, and definite not-founds for days before ``today`` are recorded
+        as missing (a past file that isn't published by now never will be);
+        timeouts, DNS failures and 5xx errors are never recorded, so the day
+        is probed again next time. Candidates from a trading calendar are
+        known sessions, so none of their failures are recorded.
+        """
+        blind = candidates is None
+        if candidates is None:
+            candidates = [today - timedelta(days=k) for k in range(max_back)]
+        candidates = sorted(candidates, reverse=True)
+
+        newest_cached = next(
+            (d for d in candidates if self.status(exchange, d) == OK), None
+        )
+        to_probe = [
+            d for d in candidates
+            if (newest_cached is None or d > newest_cached)
+            and self.status(exchange, d) is None
+        ]
+
+        found: dict[date, pd.DataFrame] = {}
+        if to_probe:
+            pool = ThreadPoolExecutor(max_workers=min(self.workers, len(to_probe)),
+                                      thread_name_prefix=f"swing-bhav-{exchange}")
+            futures = {pool.submit(fetch, d): d for d in to_probe}
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                for fut in as_completed(futures, timeout=timeout):
+                    day = futures[fut]
+                    try:
+                        lookup = fut.result()
+                    except NotPublished:
+                        lookup = None
+                    except Exception:
+                        continue
+                    if lookup is None or lookup.empty:
+                        if blind and day < today:
+                            self._mark(exchange, day, MISSING)
+                        continue
+                    self.put(exchange, day, lookup)
+                    found[day] = lookup
+            except FuturesTimeout:
+                pass
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        if found:
+            day = max(found)
+            return day, found[day], False
+        if newest_cached is not None:
+            lookup = self.get(exchange, newest_cached)
+            if lookup is not None:
+                return newest_cached, lookup, True
+        return None
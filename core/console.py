@@ -0,0 +1,113 @@
+"""
+Swing — Curated, colored terminal log for the data pipeline.
+
+Writes straight to a text stream (stdout by default — the terminal running
+``streamlit run``). All fetch chatter (native warnings/spinners) is routed here
+so the dashboard surface stays clean; the batch CLI points the same log at
+stderr so stdout can carry the report.
+"""
+
+from __future__ import annotations
+
+import sys
+import uuid
+from datetime import datetime
+from typing import Any, TextIO
+
+try:
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+except Exception:
+    pass
+
+SESSION_RUN_ID = f"{datetime.now():%Y%m%d_%H%M%S}_{str(uuid.uuid4())[:8]}"
+
+
+class Console:
+    """Minimal styled console logger (Nishkarsh-style) for SWING's pipeline."""
+
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    DIM = "\033[2m"
+    RED = "\033[91m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    CYAN = "\033[96m"
+    GRAY = "\033[90m"
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        # None → whatever sys.stdout is at write time.
+        self.stream = stream
+        self.enabled = True
+
+    @property
+    def _use_color(self) -> bool:
+        stream = self.stream or sys.stdout
+        return bool(getattr(stream, "isatty", lambda: False)())
+
+    def _c(self, code: str, text: str) -> str:
+        return f"{code}{text}{self.RESET}" if self._use_color else text
+
+    def _write(self, message: str = "") -> None:
+        if not self.enabled:
+            return
+        try:
+            stream = self.stream or sys.stdout
+            stream.write(message + "\n")
+            stream.flush()
+        except Exception:
+            pass
+
+    def _ts(self) -> str:
+        return datetime.now().strftime("%H:%M:%S")
+
+    def line(self, char: str = "─", length: int = 70) -> None:
+        self._write(self._c(self.GRAY, char * length))
+
+    def section(self, title: str) -> None:
+        """Open a titled data-pipeline section with the run id + timestamp."""
+        self._write()
+        self.line("═", 70)
+        self._write("  " + self._c(self.BOLD + self.CYAN, title))
+        self._write(
+            "  " + self._c(self.GRAY, f"Run {SESSION_RUN_ID} · {self._ts()}")
+        )
+        self.line("═", 70)
+
+    def step(self, title: str) -> None:
+        self._write("  " + self._c(self.BOLD + self.BLUE, f"▸ {title}"))
+
+    def detail(self, message: str) -> None:
+        self._write("    " + self._c(self.CYAN, "→") + f" {message}")
+
+    def item(self, label: str, value: Any, indent: int = 6) -> None:
+        self._write(f"{' ' * indent}{self._c(self.GRAY, label + ':')} {value}")
+
+    def success(self, message: str) -> None:
+        self._write("    " + self._c(self.GREEN, "✓") + f" {message}")
+
+    def warning(self, message: str) -> None:
+        self._write("    " + self._c(self.YELLOW, "⚠") + f" {message}")
+
+    def error(self, message: str) -> None:
+        self._write("    " + self._c(self.RED, "✗") + f" {message}")
+
+    def summary(self, title: str, data: dict[str, Any]) -> None:
+        self._write()
+        self._write("  " + self._c(self.GRAY, f"┌─ {title}"))
+        for key, value in data.items():
+            self._write("  " + self._c(self.GRAY, f"│   {key}:") + f" {value}")
+        self._write("  " + self._c(self.GRAY, "└─"))
+
+
+log = Console()
+
+
+def fmt_symlist(symbols: list[str], cap: int = 12) -> str:
+    """Compact, capped symbol list for terminal output."""
+    if not symbols:
+        return "none"
+    shown = ", ".join(symbols[:cap])
+    extra = len(symbols) - cap
+    return f"{shown} (+{extra} more)" if extra > 0 else shown
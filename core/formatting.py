@@ -0,0 +1,136 @@
+"""
+Swing — Indian-numbering (lakh / crore) display formatting.
+
+``format_currency`` formats one value for a KPI card; ``format_inr`` formats a
+whole column in one NumPy pass (digit strings are grouped as a character
+matrix instead of sliced value by value), optionally in compact form
+(₹1.2 Cr, ₹45.6 L, ₹7.8 K). Both round to paise before grouping, so
+₹999.999 reads ₹1,000.00.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+
+MISSING = "—"
+
+# Amounts are rounded to paise in int64, which holds up to ~9.2e16 rupees.
+_LIMIT = 9e16
+
+# Compact units and the rounded mantissa at which a value moves up a unit
+# (999.96 → 1.0 K, 99.96 K → 1.0 L, 99.96 L → 1.0 Cr).
+_UNITS = np.array([1.0, 1e3, 1e5, 1e7])
+_UNIT_CEILING = np.array([1e3, 100.0, 100.0, np.inf])
+_UNIT_SUFFIX = np.array(["", " K", " L", " Cr"])
+
+
+def _group(digits: str) -> str:
+    """'1234567' → '12,34,567': last three digits, then pairs."""
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    pairs = []
+    while len(head) > 2:
+        pairs.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join(([head] if head else []) + pairs + [tail])
+
+
+def format_currency(value: float) -> str:
+    """
+    Formats a number in Indian numbering system (lakhs, crores).
+    Example: 6797258.49 -> ₹67,97,258.49
+    """
+    value = float(value)
+    if not math.isfinite(value):
+        return MISSING
+    paise = round(abs(value) * 100)
+    sign = "-" if value < 0 and paise else ""
+    return f"{sign}₹{_group(str(paise // 100))}.{paise % 100:02d}"
+
+
+def _group_array(integers: np.ndarray) -> np.ndarray:
+    """Non-negative int64 array → Indian-grouped digit strings, vectorized.
+
+    Digits zero-padded to the widest value are viewed as an (n × digits)
+    character matrix, comma columns are inserted at the thousand/lakh/crore
+    positions, and the rows are viewed back as strings with the leading zeros
+    and commas stripped.
+    """
+    digits = len(str(int(integers.max())))
+    padded = np.char.zfill(integers.astype(f"U{digits}"), digits)
+    chars = padded.view("U1").reshape(len(integers), digits)
+    commas = list(range(digits - 3, 0, -2))[::-1]
+    grouped = np.insert(chars, commas, ",", axis=1)
+    width = digits + len(commas)
+    rows = np.ascontiguousarray(grouped).view(f"U{width}").ravel()
+    rows = np.char.lstrip(rows, "0,")
+    return np.where(rows == "", "0", rows)
+
+
+def format_inr(values: Any, compact: bool = False, decimals: int | None = None) -> np.ndarray:
+    """₹ strings for an array of amounts, Indian-grouped, in one vectorized pass.
+
+    ``decimals`` defaults to 2 (1 in compact mode, where amounts under ₹1,000
+    are shown whole). NaN/inf become ``MISSING``. Returns a string array of
+    the input's shape.
+    """
+    arr = np.asarray(values, dtype=float)
+    if not arr.size:
+        return np.array([], dtype=str).reshape(arr.shape)
+    flat = arr.ravel()
+    finite = np.isfinite(flat) & (np.abs(flat) < _LIMIT)
+    mag = np.where(finite, np.abs(flat), 0.0)
+    if decimals is None:
+        decimals = 1 if compact else 2
+    scale = 10 ** decimals
+
+    if compact:
+        unit = np.searchsorted(_UNITS, mag, side="right") - 1
+        unit = np.maximum(unit, 0)
+        shown = np.where(unit == 0, np.round(mag), np.round(mag / _UNITS[unit], decimals))
+        bump = shown >= _UNIT_CEILING[unit]
+        unit = np.minimum(unit + bump, len(_UNITS) - 1)
+        scaled = mag / _UNITS[unit]
+        suffix = _UNIT_SUFFIX[unit]
+    else:
+        unit = np.zeros(len(flat), dtype=int)
+        scaled = mag
+        suffix = np.full(len(flat), "")
+
+    ticks = np.round(scaled * scale).astype(np.int64)
+    whole = _group_array(ticks // scale)
+    if decimals:
+        frac = np.char.zfill((ticks % scale).astype(f"U{decimals}"), decimals)
+        frac = np.char.add(".", frac)
+    else:
+        frac = np.full(len(flat), "")
+
+    sign = np.where((flat < 0) & (ticks > 0), "-₹", "₹")
+    out = np.char.add(np.char.add(np.char.add(sign, whole), frac), suffix)
+    if compact:
+        # Whole rupees under ₹1,000: drop the fraction rather than show '.0'.
+        whole_units = np.round(mag).astype(np.int64).astype(str)
+        small = np.char.add(np.where((flat < 0) & (whole_units != "0"), "-₹", "₹"), whole_units)
+        out = np.where(unit == 0, small, out)
+    return np.where(finite, out, MISSING).reshape(arr.shape)
+
+
+def format_pct(values: Any, decimals: int = 2, signed: bool = False) -> np.ndarray:
+    """'12.34%' strings for an array (``signed`` adds '+'); NaN → ``MISSING``."""
+    arr = np.asarray(values, dtype=float)
+    if not arr.size:
+        return np.array([], dtype=str).reshape(arr.shape)
+    finite = np.isfinite(arr)
+    scale = 10 ** decimals
+    ticks = np.round(np.where(finite, np.abs(arr), 0.0) * scale).astype(np.int64)
+    out = (ticks // scale).astype(str)
+    if decimals:
+        frac = np.char.zfill((ticks % scale).astype(f"U{decimals}"), decimals)
+        out = np.char.add(np.char.add(out, "."), frac)
+    sign = np.where((arr < 0) & (ticks > 0), "-", "+" if signed else "")
+    out = np.char.add(np.char.add(sign, out), "%")
+    return np.where(finite, out, MISSING)
@@ -0,0 +1,170 @@
+"""
+Swing — Daily close history for a book and its NIFTY 50 benchmark.
+
+Bars come from the on-disk history store (core.history_store); only the date
+ranges it lacks are downloaded from yfinance. Uncached and Streamlit-free: the
+dashboard keys its history layer on top of ``load_analysis_data``.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from core.console import log
+from core.history_store import HistoryStore, split_download
+from core.lazy import lazy_import
+from core.quotes import to_yf_ticker
+from core.telemetry import telemetry
+from core.trading_calendar import default_calendar
+
+yf = lazy_import("yfinance")
+
+BENCHMARK_TICKER = '^NSEI'  # NIFTY 50 only
+BENCHMARK_NAME = 'NIFTY 50'
+
+# Process-wide OHLC history store (one Parquet file per yfinance ticker).
+# load_analysis_data downloads only the date ranges the store is missing and
+# slices every timeframe from local data, so a 1Y → MAX switch after warm-up
+# is a disk read and a refresh is a top-up of the last few bars.
+HISTORY = HistoryStore()
+
+
+def _download(group: list[str], lo: date, hi: date) -> dict[str, pd.DataFrame] | None:
+    """Bulk-download ``[lo, hi)`` for a group, split per ticker (None if empty)."""
+    log.detail(f"Downloading {lo:%d-%b-%Y} → {hi:%d-%b-%Y} · {len(group)} ticker(s)")
+    data = yf.download(
+        tickers=group,
+        start=lo.isoformat(),
+        end=hi.isoformat(),
+        interval='1d',
+        progress=False,
+        threads=True,
+        auto_adjust=False
+    )
+    if data.empty:
+        # Leave coverage untouched so the range is retried next time.
+        log.warning(f"yfinance returned no rows for {len(group)} ticker(s)")
+        return None
+    return split_download(data, group)
+
+
+def _store(group: list[str], bars: dict[str, pd.DataFrame], lo: date, hi: date) -> None:
+    missing = [t for t in group if not HISTORY.update(t, bars.get(t), lo, hi)]
+    if missing:
+        log.warning(f"No bars for {len(missing)} ticker(s) · will retry: "
+                    f"{', '.join(missing[:5])}{' …' if len(missing) > 5 else ''}")
+
+
+def top_up_history(tickers: list[str], start: date, end: date) -> None:
+    """Fetch only the ``[start, end)`` ranges the history store lacks.
+
+    A ticker whose re-read bars no longer match the stored ones (a split or
+    bonus adjusted upstream) is dropped and fetched again over its whole
+    window, so old and new bars never mix price bases.
+    """
+    plan = HISTORY.plan(tickers, start, end)
+    if not plan:
+        log.success(f"History store warm · {len(tickers)} ticker(s), no download needed")
+        return
+    refetch: dict[tuple[date, date], list[str]] = {}
+    try:
+        for (lo, hi), group in sorted(plan.items()):
+            bars = _download(group, lo, hi)
+            if bars is None:
+                continue
+            restated = [t for t in group if HISTORY.restated(t, bars.get(t))]
+            for ticker in restated:
+                cov_from, cov_to = HISTORY.coverage(ticker) or (lo, hi)
+                HISTORY.drop(ticker)
+                refetch.setdefault((min(cov_from, lo), max(cov_to, hi)), []).append(ticker)
+            _store([t for t in group if t not in restated], bars, lo, hi)
+        for (lo, hi), group in sorted(refetch.items()):
+            log.warning(f"Stored prices restated (split/bonus) · re-fetching {', '.join(group)}")
+            bars = _download(group, lo, hi)
+            if bars is not None:
+                _store(group, bars, lo, hi)
+    finally:
+        # One manifest write per top-up, even if a download raised.
+        HISTORY.flush()
+
+
+def load_analysis_data(
+    symbols: list[str], days_back: int, end: date
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Read ``[end - days_back, end)`` through the history store.
+
+    Bars are served from the on-disk history store; only missing ranges are
+    downloaded. Both frames are aligned to the offline calendar's session
+    dates. Diagnostics go to the terminal log.
+    """
+    start = end - timedelta(days=days_back)
+
+    log.section("SWING · ANALYSIS HISTORY")
+    log.step(f"PRIMARY · history store + yfinance · {len(symbols)} holding(s) + benchmark "
+             f"({start:%d-%b-%Y} → {end - timedelta(days=1):%d-%b-%Y})")
+    t0 = time.perf_counter()
+
+    try:
+        # .NS fallback; '.'-qualified symbols used as-is
+        ticker_map = {to_yf_ticker(s): s for s in symbols}
+        tickers = list(ticker_map.keys())
+
+        top_up_history([BENCHMARK_TICKER] + tickers, start, end)
+
+        benchmark_close = HISTORY.read([BENCHMARK_TICKER], start, end)
+        benchmark_close = (
+            benchmark_close[BENCHMARK_TICKER].dropna()
+            if BENCHMARK_TICKER in benchmark_close.columns else pd.Series(dtype=float)
+        )
+        portfolio_close = HISTORY.read(tickers, start, end).dropna(how='all')
+        if portfolio_close.empty:
+            log.warning(f"Portfolio data empty (benchmark {len(benchmark_close)} rows)")
+            telemetry.record("history", "store+yfinance", time.perf_counter() - t0,
+                             symbols=len(symbols), hits=0, days=days_back)
+            log.line("═", 70)
+            return pd.DataFrame(), pd.DataFrame()
+
+        portfolio_close = portfolio_close.reindex(columns=tickers)
+        portfolio_close.columns = [ticker_map[c] for c in portfolio_close.columns]
+
+        # Valid trading dates come from the offline calendar, from the first
+        # stored bar on; years outside its holiday table fall back to the
+        # dates present in the stored bars.
+        observed = portfolio_close.index.union(benchmark_close.index)
+        valid_dates = default_calendar().sessions(observed[0].date(), end, observed=observed)
+
+        if benchmark_close.empty:
+            log.warning("Benchmark (NIFTY 50) returned empty data · analysing without it")
+            benchmark_df = pd.DataFrame()
+        else:
+            benchmark_df = (
+                benchmark_close.reindex(valid_dates).ffill().dropna().to_frame(name=BENCHMARK_NAME)
+            )
+
+        # Align portfolio data to session dates only, then forward fill any
+        # missing values (in case some stocks didn't trade)
+        portfolio_aligned = portfolio_close.reindex(valid_dates).ffill()
+
+        dt = time.perf_counter() - t0
+        telemetry.record(
+            "history", "store+yfinance", dt, symbols=len(symbols),
+            hits=int(portfolio_aligned.notna().any().sum()), days=days_back,
+            rows=len(portfolio_aligned),
+        )
+        log.success(
+            f"History loaded · {len(portfolio_aligned.columns)} holdings × "
+            f"{len(portfolio_aligned)} rows · benchmark {len(benchmark_df)} rows in {dt:.1f}s"
+        )
+        log.line("═", 70)
+        return portfolio_aligned, benchmark_df
+
+    except Exception as e:
+        log.error(f"Analysis history fetch failed: {type(e).__name__}: {e}")
+        telemetry.record("history", "store+yfinance", time.perf_counter() - t0,
+                         symbols=len(symbols), status="error", error=type(e).__name__,
+                         days=days_back)
+        log.line("═", 70)
+        return pd.DataFrame(), pd.DataFrame()
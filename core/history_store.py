@@ -0,0 +1,242 @@
+"""
+Swing — Persistent on-disk OHLC history store for the analysis layer.
+
+One Parquet file per yfinance ticker plus a small JSON manifest recording the
+date window each ticker has been fetched for. The store never talks to the
+network itself: callers ask for a fetch plan (which tickers need which date
+ranges), download only those ranges, hand the bars back via ``update`` and
+then slice any timeframe locally with ``read``. Coverage changes are held in
+memory until ``flush`` writes the manifest, once per top-up.
+
+After warm-up a refresh is a top-up of the last few bars per ticker, and a
+timeframe switch (1Y → 5Y → MAX) is a local read once the widest window has
+been fetched once.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import date
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+
+from core.storage import DEFAULT_CACHE_DIR, atomic_write_bytes
+
+OHLC_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+# yfinance back-adjusts Close for splits and bonus issues, so a stored bar
+# that comes back more than this far off means the ticker's history was
+# restated. The smallest common corporate action (a 1:10 bonus) moves the
+# price ~9%; day-to-day source revisions stay well under 1%.
+RESTATE_TOLERANCE = 0.02
+
+
+class HistoryStore:
+    """Per-ticker Parquet store of daily OHLCV bars with coverage tracking.
+
+    Coverage is the half-open window ``[from, to)`` that has been requested
+    from the source for a ticker (mirroring yfinance's exclusive ``end``), so a
+    stock listed after ``from`` is not re-fetched on every call just because
+    its first bar is later than the requested start.
+    """
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        self.root = Path(root) if root is not None else DEFAULT_CACHE_DIR
+        self.dir = self.root / "history"
+        self._manifest_path = self.dir / "manifest.json"
+        self._lock = threading.Lock()
+        self._manifest: dict[str, list[str]] | None = None
+        self._dirty = False
+        # In-process frame cache keyed by file mtime, so repeated timeframe
+        # slices skip even the Parquet decode.
+        self._frames: dict[str, tuple[int, pd.DataFrame]] = {}
+
+    # ── manifest ────────────────────────────────────────────────────────────
+    def _load_manifest(self) -> dict[str, list[str]]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self._manifest_path.read_text())
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(self._load_manifest(), sort_keys=True).encode()
+        atomic_write_bytes(self._manifest_path, payload)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Write the manifest if coverage changed since the last flush."""
+        with self._lock:
+            if self._dirty:
+                self._save_manifest()
+
+    def coverage(self, ticker: str) -> tuple[date, date] | None:
+        """Fetched window ``[from, to)`` for a ticker, or None if never fetched."""
+        with self._lock:
+            span = self._load_manifest().get(ticker)
+        if not span:
+            return None
+        return date.fromisoformat(span[0]), date.fromisoformat(span[1])
+
+    # ── bars ────────────────────────────────────────────────────────────────
+    def _path(self, ticker: str) -> Path:
+        return self.dir / f"{quote(ticker, safe='')}.parquet"
+
+    def _read_bars(self, ticker: str) -> pd.DataFrame | None:
+        path = self._path(ticker)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        hit = self._frames.get(ticker)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        try:
+            bars = pd.read_parquet(path)
+        except Exception:
+            return None
+        self._frames[ticker] = (mtime, bars)
+        return bars
+
+    def plan(
+        self, tickers: list[str], start: date, end: date
+    ) -> dict[tuple[date, date], list[str]]:
+        """Group tickers by the ``[start, end)`` ranges they still need.
+
+        - never fetched          → the full requested window
+        - window starts earlier  → a backfill up to the covered ``from``
+        - window ends later      → a top-up from the second-last stored bar:
+          the last is re-read so a partial intraday bar is replaced by the
+          settled one, the one before is settled and lets ``restated`` spot
+          a split or bonus since the last fetch. The top-up starts there even
+          when ``start`` is later, so coverage stays one contiguous window.
+
+        Tickers sharing a range land in one group so each group is a single
+        bulk download.
+        """
+        groups: dict[tuple[date, date], list[str]] = {}
+        for ticker in tickers:
+            cov = self.coverage(ticker)
+            ranges: list[tuple[date, date]] = []
+            if cov is None:
+                ranges.append((start, end))
+            else:
+                cov_from, cov_to = cov
+                if start < cov_from:
+                    ranges.append((start, cov_from))
+                if end > cov_to:
+                    anchor = self._top_up_anchor(ticker)
+                    top_from = min(anchor, cov_to) if anchor else cov_to
+                    ranges.append((top_from, end))
+            for rng in ranges:
+                groups.setdefault(rng, []).append(ticker)
+        return groups
+
+    def last_bar(self, ticker: str) -> date | None:
+        """Date of the most recent stored bar for a ticker."""
+        bars = self._read_bars(ticker)
+        if bars is None or bars.empty:
+            return None
+        return bars.index.max().date()
+
+    def _top_up_anchor(self, ticker: str) -> date | None:
+        """Second-last stored bar (the last if only one is stored)."""
+        bars = self._read_bars(ticker)
+        if bars is None or bars.empty:
+            return None
+        return bars.index[-min(2, len(bars))].date()
+
+    def restated(self, ticker: str, bars: pd.DataFrame | None) -> bool:
+        """Whether ``bars`` re-price settled stored bars beyond the tolerance.
+
+        Compares Close on the dates both share, leaving out the last stored
+        bar (it may be a partial intraday one). True means a split or bonus
+        was applied upstream and the stored history is on the old basis.
+        """
+        existing = self._read_bars(ticker)
+        if bars is None or bars.empty or existing is None or len(existing) < 2:
+            return False
+        if "Close" not in bars.columns or "Close" not in existing.columns:
+            return False
+        fresh = bars["Close"].copy()
+        fresh.index = pd.DatetimeIndex(fresh.index).tz_localize(None).normalize()
+        settled = existing["Close"].iloc[:-1]
+        old, new = settled.align(fresh[~fresh.index.duplicated(keep="last")], join="inner")
+        drift = ((new - old).abs() / old.abs()).dropna()
+        return bool((drift > RESTATE_TOLERANCE).any())
+
+    def drop(self, ticker: str) -> None:
+        """Forget a ticker's bars and coverage so its next plan is a full fetch."""
+        self._path(ticker).unlink(missing_ok=True)
+        self._frames.pop(ticker, None)
+        with self._lock:
+            if self._load_manifest().pop(ticker, None) is not None:
+                self._dirty = True
+
+    def update(self, ticker: str, bars: pd.DataFrame | None, start: date, end: date) -> bool:
+        """Merge freshly downloaded bars and extend the ticker's coverage.
+
+        Newer rows win on overlapping dates. Coverage only grows when bars
+        arrived, or when ``bars`` is empty for a window that ends on or before
+        the first stored bar (a backfill from before the listing date) — any
+        other empty answer is treated as a failed fetch and retried next time.
+        Returns whether coverage was extended; call ``flush`` to persist it.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        existing = self._read_bars(ticker)
+        if bars is not None and not bars.empty:
+            bars = bars[[c for c in OHLC_COLUMNS if c in bars.columns]].dropna(how="all")
+        if bars is not None and not bars.empty:
+            bars.index = pd.DatetimeIndex(bars.index).tz_localize(None).normalize()
+            bars.index.name = "Date"
+            merged = bars if existing is None else pd.concat([existing, bars])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            atomic_write_bytes(self._path(ticker), merged.to_parquet())
+        elif existing is None or existing.empty or existing.index.min().date() < end:
+            return False
+
+        with self._lock:
+            manifest = self._load_manifest()
+            span = manifest.get(ticker)
+            if span:
+                start = min(start, date.fromisoformat(span[0]))
+                end = max(end, date.fromisoformat(span[1]))
+            manifest[ticker] = [start.isoformat(), end.isoformat()]
+            self._dirty = True
+        return True
+
+    def read(
+        self, tickers: list[str], start: date, end: date, field: str = "Close"
+    ) -> pd.DataFrame:
+        """Slice one OHLC field for ``[start, end)`` as a dates × tickers frame."""
+        lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+        columns = {}
+        for ticker in tickers:
+            bars = self._read_bars(ticker)
+            if bars is None or field not in bars.columns:
+                continue
+            columns[ticker] = bars.loc[(bars.index >= lo) & (bars.index < hi), field]
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame(columns).sort_index()
+
+
+def split_download(data: pd.DataFrame, tickers: list[str]) -> dict[str, pd.DataFrame]:
+    """Split a bulk ``yf.download`` frame into per-ticker OHLCV frames."""
+    out: dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return out
+    if isinstance(data.columns, pd.MultiIndex):
+        present = set(data.columns.get_level_values(-1))
+        for ticker in tickers:
+            if ticker in present:
+                out[ticker] = data.xs(ticker, axis=1, level=-1).dropna(how="all")
+    elif len(tickers) == 1:
+        out[tickers[0]] = data.dropna(how="all")
+    return out
+
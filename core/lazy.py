@@ -0,0 +1,45 @@
+"""
+Swing — Deferred module imports.
+
+``lazy_import("plotly.express")`` returns a stand-in that imports the module
+on first attribute access, so heavy dependencies a given session may never
+touch (charting, the yfinance client) stay off the cold-start path.
+
+The stand-in is deliberately kept out of ``sys.modules`` until the real
+import happens: anything that walks ``sys.modules`` (``inspect.getmodule``,
+which Streamlit reaches through ``inspect.stack()``) would otherwise trigger
+every deferred import at once. Resolution goes through the normal import
+system, so a benchmark stub placed in ``sys.modules`` is honoured.
+"""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Module proxy that imports ``name`` when an attribute is first read."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: ModuleType | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """``import name`` deferred until the module is first used."""
+    return LazyModule(name)
@@ -0,0 +1,138 @@
+"""
+Swing — NSE cash-market session clock.
+
+Answers "is the market open right now?" and "when does it next open?" in
+India Standard Time, independent of the host's timezone, on the offline
+trading calendar (core.trading_calendar). Regular session only (09:15–15:30
+IST); pre-open and post-close blocks are treated as closed since quotes do not
+move in a way the dashboard cares about.
+
+Cache lifetimes follow the session: live quotes get a short TTL while the
+market is open (and through the post-close settle window, while closing prices
+are still being published), then stay valid until the next open; daily history
+only changes when a session settles.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from core.trading_calendar import (
+    BHAV_PUBLISHED,
+    NSE_CLOSE,
+    NSE_OPEN,
+    NSE_SETTLED,
+    default_calendar,
+)
+
+IST = timezone(timedelta(hours=5, minutes=30), name="IST")
+INTRADAY_TTL_S = 300.0
+
+
+def now_ist() -> datetime:
+    return datetime.now(IST)
+
+
+def _as_ist(now: datetime | None) -> datetime:
+    if now is None:
+        return now_ist()
+    if now.tzinfo is None:
+        return now.replace(tzinfo=IST)
+    return now.astimezone(IST)
+
+
+def is_trading_day(day: date) -> bool:
+    """True if ``day`` has an NSE equity session (weekends and holidays excluded)."""
+    return default_calendar().is_session(day)
+
+
+def is_market_open(now: datetime | None = None) -> bool:
+    """True during the regular NSE session. Naive datetimes are taken as IST."""
+    now = _as_ist(now)
+    return is_trading_day(now.date()) and NSE_OPEN <= now.time() < NSE_CLOSE
+
+
+def next_open(now: datetime | None = None) -> datetime:
+    """Start of the next regular session strictly after ``now`` (IST-aware)."""
+    now = _as_ist(now)
+    day = now.date()
+    if now.time() >= NSE_OPEN:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day, NSE_OPEN, tzinfo=IST)
+
+
+def _settled_on(day: date) -> datetime:
+    return datetime.combine(day, NSE_SETTLED, tzinfo=IST)
+
+
+def last_settled_session(now: datetime | None = None) -> date:
+    """Most recent trading day whose closing prices have settled."""
+    now = _as_ist(now)
+    day = now.date()
+    if not (is_trading_day(day) and now >= _settled_on(day)):
+        day -= timedelta(days=1)
+        while not is_trading_day(day):
+            day -= timedelta(days=1)
+    return day
+
+
+def latest_bhavcopy_session(now: datetime | None = None) -> date:
+    """Most recent session whose EOD bhavcopy should be published by ``now``."""
+    now = _as_ist(now)
+    day = now.date()
+    published = datetime.combine(day, BHAV_PUBLISHED, tzinfo=IST)
+    if is_trading_day(day) and now >= published:
+        return day
+    return default_calendar().previous_session(day)
+
+
+def next_settle(now: datetime | None = None) -> datetime:
+    """Next settle time strictly after ``now``."""
+    now = _as_ist(now)
+    day = now.date()
+    if now >= _settled_on(day):
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return _settled_on(day)
+
+
+def current_session(now: datetime | None = None) -> date:
+    """Session a live quote belongs to: today once it has opened, else the last one."""
+    now = _as_ist(now)
+    day = now.date()
+    if is_trading_day(day) and now.time() >= NSE_OPEN:
+        return day
+    return default_calendar().previous_session(day)
+
+
+def history_end(now: datetime | None = None) -> date:
+    """Exclusive end date for daily bars: the day after the last settled session."""
+    return last_settled_session(now) + timedelta(days=1)
+
+
+def quote_ttl(now: datetime | None = None, intraday: float = INTRADAY_TTL_S) -> float:
+    """Seconds a live quote fetched at ``now`` stays valid.
+
+    ``intraday`` from the open through the settle window; otherwise until the
+    next session opens (nothing trades in between).
+    """
+    now = _as_ist(now)
+    if is_trading_day(now.date()) and NSE_OPEN <= now.time() < NSE_SETTLED:
+        # Never carry an intraday quote past the settle boundary.
+        return max(1.0, min(intraday, (_settled_on(now.date()) - now).total_seconds()))
+    return max(1.0, (next_open(now) - now).total_seconds())
+
+
+def prev_close_ttl(now: datetime | None = None) -> float:
+    """Seconds a previous-session close stays valid: until the next open."""
+    now = _as_ist(now)
+    return max(1.0, (next_open(now) - now).total_seconds())
+
+
+def history_ttl(now: datetime | None = None) -> float:
+    """Seconds daily history stays valid: until the next session settles."""
+    now = _as_ist(now)
+    return max(1.0, (next_settle(now) - now).total_seconds())
@@ -0,0 +1,84 @@
+"""
+Swing — Timeframe windows and the per-window metrics cube.
+
+Every Analysis Mode timeframe is a start date over one shared history; the
+cube scores them all from a single portfolio value series (one row per
+window, one column per scalar ``compute_metrics`` key).
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from core.analytics import compute_metrics_batch, window_returns
+from core.console import log
+from core.history import BENCHMARK_NAME
+from core.market_session import now_ist
+from core.telemetry import telemetry
+from core.trading_calendar import default_calendar
+from core.valuation import Quantities, nan_report, portfolio_value
+
+TIMEFRAMES = {
+    '1W': 7,
+    '1M': 30,
+    '3M': 90,
+    '6M': 180,
+    'YTD': None,  # Special handling
+    '1Y': 365,
+    '2Y': 730,
+    '5Y': 1825,
+    'MAX': 3650
+}
+
+
+def days_back(tf: str, now: datetime | None = None) -> int:
+    """Calendar days of history behind a TIMEFRAMES key.
+
+    YTD reaches back to the last session of the previous year, whose close is
+    the base for the year's first daily return.
+    """
+    today = (now or now_ist()).date()
+    if TIMEFRAMES[tf] is None:
+        return (today - default_calendar().previous_session(date(today.year, 1, 1))).days
+    return TIMEFRAMES[tf]
+
+
+def timeframe_windows(anchor_date: date | None = None) -> dict[str, date]:
+    """First calendar date of every timeframe window, plus CUSTOM for an anchor."""
+    now = now_ist()
+    windows = {tf: (now - timedelta(days=days_back(tf, now))).date() for tf in TIMEFRAMES}
+    if anchor_date:
+        windows['CUSTOM'] = anchor_date
+    return windows
+
+
+def benchmark_returns(benchmark_prices: pd.DataFrame) -> pd.Series | None:
+    """Daily NIFTY 50 returns from a load_analysis_data benchmark frame."""
+    if benchmark_prices.empty or BENCHMARK_NAME not in benchmark_prices.columns:
+        return None
+    return benchmark_prices[BENCHMARK_NAME].pct_change(fill_method=None).dropna()
+
+
+def score_windows(
+    portfolio_prices: pd.DataFrame,
+    benchmark_prices: pd.DataFrame,
+    quantities: Quantities,
+    windows: dict[str, date],
+) -> pd.DataFrame:
+    """Metrics for every window from one history (empty if nothing is priced)."""
+    if portfolio_prices.empty:
+        return pd.DataFrame()
+    with telemetry.stage("metrics", "compute", portfolio_prices.shape[1],
+                         windows=len(windows), rows=len(portfolio_prices)):
+        port_value = portfolio_value(portfolio_prices, quantities)
+        gaps = nan_report(portfolio_prices, quantities)
+        if not gaps.empty:
+            unpriced = sorted({sym for syms in gaps for sym in syms})
+            log.warning(
+                f"{len(unpriced)} holding(s) unpriced on {len(gaps)} date(s), valued at 0: "
+                f"{', '.join(unpriced[:8])}{' …' if len(unpriced) > 8 else ''}"
+            )
+        matrix = window_returns(port_value, windows)
+        return compute_metrics_batch(matrix, benchmark_returns(benchmark_prices))
@@ -0,0 +1,93 @@
+"""
+Swing — Portfolio file loading and holding-level valuation.
+
+A portfolio is an Excel sheet with one row per holding (REQUIRED_COLUMNS;
+CURRENT PRICE is optional and only used where no quote resolves). Valuation
+takes resolved price maps and is pure pandas, shared by the dashboard and the
+batch CLI.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['ASSET NAME', 'SYMBOL', 'QUANTITY', 'AVERAGE PRICE']
+
+
+def read_portfolio(path: str | Path) -> pd.DataFrame:
+    """Read a portfolio sheet: blank rows dropped, header whitespace stripped.
+
+    Raises FileNotFoundError for a missing file and ValueError when a
+    required column is absent.
+    """
+    df = pd.read_excel(path)
+    df = df.dropna(how='all')
+    df.columns = df.columns.str.strip()
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    return df
+
+
+def value_holdings(
+    df: pd.DataFrame,
+    price_map: dict[str, float],
+    prev_close_map: dict[str, float],
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """Holding-level P&L, weights and today's change, plus portfolio totals.
+
+    Symbols missing from ``price_map`` (or NaN there) keep the sheet's
+    CURRENT PRICE, else their AVERAGE PRICE.
+    """
+    df = df.copy()
+
+    # Fetched prices win; the sheet's CURRENT PRICE (else cost) fills gaps
+    df['FETCHED PRICE'] = df['SYMBOL'].map(price_map)
+    df['CURRENT PRICE'] = df['FETCHED PRICE'].fillna(df.get('CURRENT PRICE', df['AVERAGE PRICE']))
+    
+    # Previous close for today's return calculation
+    df['PREV CLOSE'] = df['SYMBOL'].map(prev_close_map)
+
+    # Calculations use the updated 'CURRENT PRICE'
+    df['INVESTED'] = df['QUANTITY'] * df['AVERAGE PRICE']
+    df['CURR. VALUE'] = df['QUANTITY'] * df['CURRENT PRICE']
+    df['GAIN'] = df['CURR. VALUE'] - df['INVESTED']
+    
+    # Calculate today's change per holding
+    df['TODAY CHANGE'] = np.where(
+        df['PREV CLOSE'].notna(),
+        (df['CURRENT PRICE'] - df['PREV CLOSE']) * df['QUANTITY'],
+        0
+    )
+    df['TODAY %'] = np.where(
+        (df['PREV CLOSE'].notna()) & (df['PREV CLOSE'] != 0),
+        (df['CURRENT PRICE'] - df['PREV CLOSE']) / df['PREV CLOSE'] * 100,
+        0
+    )
+    
+    # Avoid division by zero
+    df['GAIN %'] = np.where(df['INVESTED'] != 0, df['GAIN'] / df['INVESTED'] * 100, 0)
+    
+    total_curr_value = df['CURR. VALUE'].sum()
+    df['WT'] = np.where(total_curr_value != 0, df['CURR. VALUE'] / total_curr_value * 100, 0)
+    df['WEIGHTED RETURN %'] = df['GAIN %'] * df['WT'] / 100
+    
+    # Calculate today's portfolio return
+    today_change_total = df['TODAY CHANGE'].sum()
+    prev_portfolio_value = total_curr_value - today_change_total
+    today_return_pct = (today_change_total / prev_portfolio_value * 100) if prev_portfolio_value != 0 else 0
+
+    metrics = {
+        'Total Current Value': total_curr_value,
+        'Total Invested': df['INVESTED'].sum(),
+        'Total Gain': df['GAIN'].sum(),
+        'Portfolio Return %': np.where(df['INVESTED'].sum() != 0, df['GAIN'].sum() / df['INVESTED'].sum() * 100, 0),
+        'Today Change': today_change_total,
+        'Today Return %': today_return_pct,
+        'Top 5 Concentration': df['WT'].nlargest(5).sum(),
+        'Number of Holdings': len(df)
+    }
+    return df, metrics
@@ -0,0 +1,123 @@
+"""
+Swing — Background quote warmer.
+
+A single daemon thread per process re-pulls quotes for every tracked symbol on
+a fixed interval while the NSE session is open, and publishes each result by
+replacing a single reference — readers see either the previous complete
+snapshot or the new one, never a partial update. Outside trading hours the
+thread sleeps until the next open instead of polling.
+
+The warmer knows nothing about data sources: ``fetch(symbols)`` returns an
+opaque payload (the dashboard passes a function that runs the primary +
+secondary resolution) and ``fresh(symbols)`` hands it back while it is recent
+enough and covers every requested symbol.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from core.market_session import is_market_open, next_open, now_ist
+
+# Re-check the clock at least this often while closed, so a changed system
+# clock or a long suspend never leaves the warmer asleep through a session.
+MAX_IDLE_S = 900.0
+
+
+class QuoteWarmer:
+    """Process-wide periodic refresher with an atomically swapped snapshot."""
+
+    def __init__(
+        self,
+        fetch: Callable[[list[str]], Any],
+        interval: float = 60.0,
+        is_open: Callable[[datetime], bool] = is_market_open,
+    ) -> None:
+        self.fetch = fetch
+        self.interval = interval
+        self.is_open = is_open
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._symbols: frozenset[str] = frozenset()
+        # (payload, symbols covered, monotonic stamp) — replaced as a whole.
+        self._snapshot: tuple[Any, frozenset[str], float] | None = None
+        self.last_refresh: datetime | None = None
+        self.last_duration: float | None = None
+        self.last_error: str | None = None
+
+    # ── control ─────────────────────────────────────────────────────────────
+    def track(self, symbols: list[str]) -> None:
+        """Add symbols to the refresh set and make sure the thread is running."""
+        # The liveness check and start() share the lock with the symbol
+        # update, so concurrent sessions can never start two warmers.
+        with self._lock:
+            added = not set(symbols) <= self._symbols
+            self._symbols = self._symbols | frozenset(symbols)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="swing-quote-warmer", daemon=True
+                )
+                self._thread.start()
+            elif added:
+                self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def polling(self) -> bool:
+        """True while the thread is alive and the market is open."""
+        alive = self._thread is not None and self._thread.is_alive()
+        return alive and self.is_open(now_ist())
+
+    # ── snapshot ────────────────────────────────────────────────────────────
+    def fresh(self, symbols: list[str], max_age: float | None = None) -> Any | None:
+        """Latest payload if it covers ``symbols`` and is at most ``max_age`` old."""
+        snap = self._snapshot
+        if snap is None:
+            return None
+        payload, covered, stamp = snap
+        max_age = 2 * self.interval if max_age is None else max_age
+        if time.monotonic() - stamp > max_age or not set(symbols) <= covered:
+            return None
+        return payload
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot (readers fall back until the next refresh)."""
+        self._snapshot = None
+
+    def refresh(self) -> None:
+        """Fetch every tracked symbol once and publish the result."""
+        with self._lock:
+            symbols = sorted(self._symbols)
+        if not symbols:
+            return
+        t0 = time.perf_counter()
+        try:
+            payload = self.fetch(symbols)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return
+        self._snapshot = (payload, frozenset(symbols), time.monotonic())
+        self.last_refresh = now_ist()
+        self.last_duration = time.perf_counter() - t0
+        self.last_error = None
+
+    # ── loop ────────────────────────────────────────────────────────────────
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = now_ist()
+            if self.is_open(now):
+                self.refresh()
+                wait = self.interval
+            else:
+                wait = min(MAX_IDLE_S, (next_open(now) - now).total_seconds())
+            self._wake.wait(timeout=max(1.0, wait))
+            self._wake.clear()
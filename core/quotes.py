@@ -0,0 +1,672 @@
+"""
+Swing — Live quote resolution: yfinance primary, NSE/BSE secondary sources.
+
+``download_quote_snapshot`` prices a book from one bulk yfinance download
+(last price + previous close); ``resolve_fallback_quotes`` fills whatever it
+left unpriced from the exchanges, live first with the EOD bhavcopy as a
+backstop. Both are uncached and Streamlit-free: the dashboard wraps them in
+its cache layers and background warmer, the batch CLI calls them directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from core.bhav_cache import BhavCache, NotPublished
+from core.console import fmt_symlist, log
+from core.lazy import lazy_import
+from core.market_session import latest_bhavcopy_session
+from core.telemetry import telemetry
+from core.trading_calendar import default_calendar
+
+# Loaded on the first download (~0.8 s of imports).
+yf = lazy_import("yfinance")
+
+# Silence yfinance's own console chatter (HTTP errors, "Failed download",
+# FutureWarnings) so SWING's curated terminal log stays clean. Genuine
+# failures are still captured and reported via core.console.
+logging.getLogger("yfinance").setLevel(logging.CRITICAL)
+warnings.filterwarnings("ignore", category=FutureWarning, module="yfinance")
+# yfinance raises some FutureWarnings at the caller's line, so also match by
+# message (module-agnostic) — e.g. the auto_adjust default-change notice.
+warnings.filterwarnings("ignore", message=r".*auto_adjust.*")
+
+
+# Map a portfolio symbol to a yfinance ticker.
+# Symbols WITHOUT a '.' get the .NS (NSE) suffix as a fallback (e.g. RELIANCE -> RELIANCE.NS).
+# Symbols that ALREADY contain a '.' are exchange-qualified and used exactly as-is
+# (e.g. NSDL.BO -> NSDL.BO, QUEST.BO -> QUEST.BO).
+def to_yf_ticker(symbol: str) -> str:
+    return symbol if '.' in symbol else f"{symbol}.NS"
+
+
+# ---------------------------------------------------------------------------
+# Secondary data infrastructure (fallback when yfinance is non-responsive).
+#
+# yfinance stays the PRIMARY source and the portfolio SYMBOL convention is
+# unchanged (no dot -> NSE; ".BO" -> BSE; ".NS" -> NSE). These helpers adapt
+# that convention to each secondary source's naming, then fill ONLY the
+# symbols yfinance left as NaN.
+#
+# Per exchange: live first, EOD bhavcopy as a post-close backstop.
+#   NSE  live -> NseKit.cm_live_equity_full_info ; EOD -> jugaad bhavcopy
+#   BSE  live -> bse.quote (scrip code by name)   ; EOD -> bse bhavcopy
+# Every source is optional and lazily imported: a missing/failing source is
+# silently skipped, so the app always degrades gracefully back to yfinance.
+# ---------------------------------------------------------------------------
+
+def _classify(symbol: str) -> tuple[str, str] | None:
+    """Map a raw portfolio symbol to (exchange, bare_symbol) for the fallbacks.
+
+    Mirrors to_yf_ticker: no dot or ".NS" -> NSE; ".BO" -> BSE.
+    Returns None for symbols/exchanges we have no fallback for.
+    """
+    if not symbol or not isinstance(symbol, str):
+        return None
+    s = symbol.strip().upper()
+    if '.' not in s:
+        return ('NSE', s)
+    if s.endswith('.NS'):
+        return ('NSE', s[:-3])
+    if s.endswith('.BO'):
+        return ('BSE', s[:-3])
+    return None
+
+
+def _num(value: Any) -> float:
+    """Best-effort float parse; returns NaN for blanks/None/garbage."""
+    try:
+        if value is None:
+            return np.nan
+        if isinstance(value, str):
+            value = value.replace(',', '').strip()
+            if value in ('', '-'):
+                return np.nan
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+# Concurrency limits for the secondary resolver. Each source gets its own
+# bounded pool (so neither host is hammered), and the whole secondary pass
+# shares one wall-clock deadline so a hung upstream can never stall a load.
+# Individual requests are already capped by the libraries' own 10s timeouts.
+SECONDARY_WORKERS = {'NSE': 4, 'BSE': 4}
+SECONDARY_DEADLINE_S = 45.0
+# Tail of that deadline kept for the bhavcopy backstop: the live step must
+# finish this much earlier, so slow live endpoints cannot leave the safety
+# net with no time to probe.
+BHAV_RESERVE_S = 12.0
+
+
+class _ClientPool:
+    """Hands each worker thread its own client (HTTP sessions aren't shared).
+
+    The probe client built up-front (which also proves the source is usable)
+    is handed to the first worker; the rest are created on demand.
+    """
+
+    def __init__(self, factory: Any, first: Any) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._spare = [first]
+        self.clients = [first]
+
+    def get(self) -> Any:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            with self._lock:
+                client = self._spare.pop() if self._spare else None
+            if client is None:
+                client = self._factory()
+                with self._lock:
+                    self.clients.append(client)
+            self._local.client = client
+        return client
+
+    def close(self, method: str) -> None:
+        """Call ``client.<method>()`` on every client built, ignoring errors."""
+        with self._lock:
+            clients, self.clients = self.clients, []
+        for client in clients:
+            try:
+                getattr(client, method)()
+            except Exception:
+                pass
+
+
+def _map_bounded(
+    fn: Any, items: list[str], workers: int, deadline: float, label: str,
+    on_settled: Any = None,
+) -> dict[str, Any]:
+    """Run ``fn(item)`` on a bounded pool until ``deadline`` (monotonic).
+
+    Returns {item: result} for calls that finished with a non-None result;
+    anything still in flight at the deadline is abandoned, not awaited.
+    ``on_settled()`` runs once every call has finished or been cancelled —
+    possibly after this returns, on the last abandoned worker's thread — so
+    it can release resources those workers are still using.
+    """
+    out: dict[str, Any] = {}
+    if not items:
+        if on_settled is not None:
+            on_settled()
+        return out
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(items)),
+                              thread_name_prefix=f"swing-{label}")
+    futures = {pool.submit(fn, item): item for item in items}
+    if on_settled is not None:
+        left = [len(futures)]
+        left_lock = threading.Lock()
+
+        def settle(_: Any) -> None:
+            with left_lock:
+                left[0] -= 1
+                last = left[0] == 0
+            if last:
+                on_settled()
+
+        for fut in futures:
+            fut.add_done_callback(settle)
+    try:
+        for fut in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            try:
+                result = fut.result()
+            except Exception:
+                continue
+            if result is not None:
+                out[futures[fut]] = result
+    except FuturesTimeout:
+        pending = sum(1 for f in futures if not f.done())
+        log.warning(f"{label} deadline hit · {pending} request(s) abandoned")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return out
+
+
+def _fallback_nse_live(
+    bare_symbols: list[str], deadline: float | None = None
+) -> dict[str, tuple[float, float]]:
+    """NseKit live quotes, fanned out over a bounded pool. {bare: (last, prev_close)}."""
+    try:
+        from NseKit import Nse
+        clients = _ClientPool(Nse, Nse())
+    except Exception as e:
+        log.warning(f"NseKit unavailable ({type(e).__name__}); skipping NSE live")
+        return {}
+
+    def quote_one(bare: str) -> tuple[float, float] | None:
+        d = clients.get().cm_live_equity_full_info(bare)
+        if not d:
+            return None
+        q = (_num(d.get('LastTradedPrice')), _num(d.get('PreviousClose')))
+        log.detail(f"NseKit · {bare} → {q[0]}")
+        return q
+
+    deadline = deadline or time.monotonic() + SECONDARY_DEADLINE_S
+    return _map_bounded(quote_one, bare_symbols, SECONDARY_WORKERS['NSE'], deadline, "NSE live")
+
+
+def _fallback_bse_live(
+    bare_symbols: list[str], deadline: float | None = None
+) -> dict[str, tuple[float, float]]:
+    """bse.quote live quotes (scrip code resolved by name), fanned out over a bounded pool."""
+    try:
+        import tempfile
+        from bse import BSE
+        folder = tempfile.gettempdir()
+        clients = _ClientPool(lambda: BSE(download_folder=folder), BSE(download_folder=folder))
+    except Exception as e:
+        log.warning(f"bse unavailable ({type(e).__name__}); skipping BSE live")
+        return {}
+
+    def quote_one(bare: str) -> tuple[float, float] | None:
+        b = clients.get()
+        code = b.getScripCode(bare)
+        if not code:
+            return None
+        q = b.quote(code)
+        if not q:
+            return None
+        out = (_num(q.get('LTP')), _num(q.get('PrevClose')))
+        log.detail(f"bse · {bare} (#{code}) → {out[0]}")
+        return out
+
+    deadline = deadline or time.monotonic() + SECONDARY_DEADLINE_S
+    # Clients are closed only once every worker is done with them: workers
+    # abandoned at the deadline keep using theirs until their request ends.
+    return _map_bounded(quote_one, bare_symbols, SECONDARY_WORKERS['BSE'], deadline,
+                        "BSE live", on_settled=lambda: clients.close('exit'))
+
+
+def _bhav_prices(col: pd.Series | None, n: int) -> np.ndarray:
+    """Columnar counterpart of _num: comma-stripped float array, NaN for junk."""
+    if col is None:
+        return np.full(n, np.nan)
+    if pd.api.types.is_numeric_dtype(col):
+        return col.to_numpy(dtype=float, na_value=np.nan)
+    cleaned = col.astype(str).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+
+
+def _bhav_lookup(df: pd.DataFrame, eq_only: bool) -> pd.DataFrame:
+    """Index a UDiFF bhavcopy as TckrSymb → [close, prev_close].
+
+    Vectorized: one columnar numeric coercion and one de-duplication pass
+    (first occurrence wins, as in the exchange file order), so resolving the
+    requested symbols is a single reindex via _bhav_pick.
+    """
+    empty = pd.DataFrame(columns=['close', 'prev_close'], dtype=float)
+    if df is None or 'TckrSymb' not in df.columns:
+        return empty
+    rows = df
+    if eq_only and 'SctySrs' in df.columns:
+        rows = df[df['SctySrs'].astype(str).str.strip() == 'EQ']
+    syms = rows['TckrSymb'].astype(str).str.strip()
+    keep = (syms != '').to_numpy() & ~syms.duplicated(keep='first').to_numpy()
+    n = len(rows)
+    return pd.DataFrame(
+        {
+            'close': _bhav_prices(rows.get('ClsPric'), n)[keep],
+            'prev_close': _bhav_prices(rows.get('PrvsClsgPric'), n)[keep],
+        },
+        index=pd.Index(syms.to_numpy()[keep], name='TckrSymb'),
+    )
+
+
+def _bhav_pick(lookup: pd.DataFrame, bare_symbols: list[str]) -> dict[str, tuple[float, float]]:
+    """Resolve requested bare symbols against a _bhav_lookup index in one reindex."""
+    hits = lookup.reindex(pd.Index(bare_symbols).intersection(lookup.index))
+    return {
+        sym: (float(close), float(prev))
+        for sym, close, prev in zip(hits.index, hits['close'], hits['prev_close'])
+    }
+
+
+# Parsed bhavcopies persisted per exchange/trade date, with a manifest of
+# known-missing days (holidays/weekends). Candidate days are probed in
+# parallel, so once warm the EOD backstop is a single local read.
+_BHAV = BhavCache()
+
+
+def _read_bhav_csv(path: Any, eq_only: bool) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df.columns = [c.strip() for c in df.columns]
+    return _bhav_lookup(df, eq_only=eq_only)
+
+
+def _not_published(e: Exception) -> bool:
+    """Whether a bhavcopy fetch error means "no file for that date".
+
+    Only an HTTP 404 (from a requests-style ``response`` or the message) or
+    an empty file counts; timeouts, DNS failures and 5xx errors do not.
+    """
+    if isinstance(e, (NotPublished, pd.errors.EmptyDataError)):
+        return True
+    if getattr(getattr(e, 'response', None), 'status_code', None) == 404:
+        return True
+    return re.search(r'\b404\b', str(e)) is not None
+
+
+def _fetch_bhav(fetch: Any) -> Any:
+    """Wrap a bhavcopy fetch so definite not-founds raise NotPublished."""
+    def run(d: date) -> pd.DataFrame:
+        try:
+            return fetch(d)
+        except Exception as e:
+            if _not_published(e):
+                raise NotPublished(f"no bhavcopy for {d:%d-%b-%Y}") from e
+            raise
+    return run
+
+
+def _latest_bhav(
+    exch: str, fetch: Any, bare_symbols: list[str], deadline: float | None
+) -> dict[str, tuple[float, float]]:
+    """Resolve symbols against the newest cached-or-fetched bhavcopy.
+
+    The trading calendar names the one session whose file should be out by
+    now; its predecessor is the fallback, so a warm cache means one probe.
+    """
+    expected = latest_bhavcopy_session()
+    candidates = [expected, default_calendar().previous_session(expected)]
+    with telemetry.stage(f"{exch.lower()}_bhavcopy", "bhavcopy", len(bare_symbols)) as ev:
+        hit = _BHAV.latest(exch, expected, _fetch_bhav(fetch), deadline=deadline,
+                           candidates=candidates)
+        if hit is None:
+            ev.status = "unavailable"
+            log.warning(f"{exch} bhavcopy unavailable "
+                        f"({' / '.join(f'{d:%d-%b}' for d in candidates)})")
+            return {}
+        d, lookup, cached = hit
+        picked = _bhav_pick(lookup, bare_symbols)
+        ev.resolved(len(picked))
+        ev.fields.update(trade_date=d.isoformat(), cached=cached)
+    log.detail(f"{exch} bhavcopy {d:%d-%b-%Y} {'cached' if cached else 'loaded'} "
+               f"({len(lookup)} scrips)")
+    return picked
+
+
+def _fallback_nse_bhav(
+    bare_symbols: list[str], deadline: float | None = None
+) -> dict[str, tuple[float, float]]:
+    """Most-recent NSE EOD bhavcopy (jugaad), matched on TckrSymb."""
+    try:
+        import tempfile
+        from jugaad_data.nse import bhavcopy_save
+    except Exception:
+        return {}
+
+    def fetch(d: date) -> pd.DataFrame:
+        with tempfile.TemporaryDirectory(prefix="swing-bhav-") as folder:
+            return _read_bhav_csv(bhavcopy_save(d, folder), eq_only=True)
+
+    return _latest_bhav('NSE', fetch, bare_symbols, deadline)
+
+
+def _fallback_bse_bhav(
+    bare_symbols: list[str], deadline: float | None = None
+) -> dict[str, tuple[float, float]]:
+    """Most-recent BSE EOD bhavcopy (bse), matched on TckrSymb."""
+    try:
+        import tempfile
+        from bse import BSE
+    except Exception:
+        return {}
+
+    def fetch(d: date) -> pd.DataFrame:
+        # One client per probe: candidate days are fetched concurrently.
+        with tempfile.TemporaryDirectory(prefix="swing-bhav-") as folder:
+            b = BSE(download_folder=folder)
+            try:
+                return _read_bhav_csv(b.bhavcopyReport(d), eq_only=False)
+            finally:
+                try:
+                    b.exit()
+                except Exception:
+                    pass
+
+    return _latest_bhav('BSE', fetch, bare_symbols, deadline)
+
+
+def _merge_live_bhav(
+    bare_to_orig: dict[str, str],
+    live: dict[str, tuple[float, float]],
+    bhav: dict[str, tuple[float, float]],
+    resolved: dict[str, tuple[float, float]],
+) -> None:
+    """Prefer live (must carry a last price); fall back to bhavcopy."""
+    for bare, orig in bare_to_orig.items():
+        lq, bq = live.get(bare), bhav.get(bare)
+        if lq and not pd.isna(lq[0]):
+            resolved[orig] = lq
+        elif bq and not pd.isna(bq[0]):
+            resolved[orig] = bq
+        elif lq:
+            resolved[orig] = lq
+
+
+def _resolve_lane(
+    exch: str, bare_map: dict[str, str], deadline: float
+) -> tuple[dict[str, tuple[float, float]], dict[str, tuple[float, float]]]:
+    """One exchange lane: live quotes first, bhavcopy for what live missed.
+
+    Live stops ``BHAV_RESERVE_S`` before ``deadline``, so the backstop
+    always has that reserve to probe in.
+    """
+    if exch == 'NSE':
+        source, live_fn, bhav_fn = "NseKit", _fallback_nse_live, _fallback_nse_bhav
+    else:
+        source, live_fn, bhav_fn = "bse.quote", _fallback_bse_live, _fallback_bse_bhav
+    log.detail(f"{exch} live ({source}) · {len(bare_map)} symbol(s)")
+    with telemetry.stage(f"{exch.lower()}_live", source, len(bare_map)) as ev:
+        live = live_fn(list(bare_map), deadline - BHAV_RESERVE_S)
+        ev.resolved(sum(1 for q in live.values() if not pd.isna(q[0])))
+    still = [b for b in bare_map if b not in live or pd.isna(live[b][0])]
+    if still:
+        log.detail(f"{exch} backstop (bhavcopy) · {len(still)} unresolved live")
+    bhav = bhav_fn(still, deadline) if still else {}
+    return live, bhav
+
+
+def resolve_fallback_quotes(symbols: tuple[str, ...]) -> dict[str, tuple[float, float]]:
+    """Resolve {original_symbol: (last, prev_close)} from secondary sources.
+
+    Live-first per exchange, EOD bhavcopy as a backstop. Only called for the
+    symbols yfinance could not price.
+    """
+    if not symbols:
+        return {}
+    nse: dict[str, str] = {}
+    bse: dict[str, str] = {}
+    other: list[str] = []
+    for s in symbols:
+        c = _classify(s)
+        if not c:
+            other.append(s)
+            continue
+        exch, bare = c
+        (nse if exch == 'NSE' else bse)[bare] = s
+
+    t0 = time.perf_counter()
+    log.step(f"SECONDARY · {len(symbols)} unpriced → NSE:{len(nse)} BSE:{len(bse)}"
+             + (f" · {len(other)} unsupported" if other else ""))
+
+    resolved: dict[str, tuple[float, float]] = {}
+
+    # NSE and BSE lanes run in parallel under one global deadline; each lane
+    # is merged as soon as it finishes, so a slow exchange never holds back
+    # the other's results.
+    lanes = {
+        exch: bare_map
+        for exch, bare_map in (('NSE', nse), ('BSE', bse))
+        if bare_map
+    }
+    deadline = time.monotonic() + SECONDARY_DEADLINE_S
+    pool = ThreadPoolExecutor(max_workers=max(1, len(lanes)),
+                              thread_name_prefix="swing-secondary")
+    futures = {
+        pool.submit(_resolve_lane, exch, bare_map, deadline): exch
+        for exch, bare_map in lanes.items()
+    }
+    try:
+        # Small grace past the deadline so lanes can return partial results.
+        remaining = max(0.0, deadline - time.monotonic()) + 5.0
+        for fut in as_completed(futures, timeout=remaining):
+            try:
+                live, bhav = fut.result()
+            except Exception as e:
+                log.warning(f"{futures[fut]} lane failed ({type(e).__name__})")
+                continue
+            _merge_live_bhav(lanes[futures[fut]], live, bhav, resolved)
+    except FuturesTimeout:
+        stuck = [futures[f] for f in futures if not f.done()]
+        log.warning(f"Secondary deadline hit · lane(s) {', '.join(stuck)} abandoned")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    dt = time.perf_counter() - t0
+    got = sum(1 for v in resolved.values() if not pd.isna(v[0]))
+    log.success(f"Secondary resolved {got}/{len(symbols)} in {dt:.1f}s")
+    telemetry.record("secondary", "NSE+BSE", dt, symbols=len(symbols), hits=got,
+                     nse=len(nse), bse=len(bse), unsupported=len(other))
+    return resolved
+
+
+def _close_frame(data: pd.DataFrame, tickers: list[str]) -> pd.DataFrame | None:
+    """Normalize a yf.download frame to a Close DataFrame with ticker columns.
+
+    Single-ticker downloads come back as a Series (or a one-column frame,
+    depending on the yfinance version); both are coerced to one column.
+    """
+    if data is None or data.empty:
+        return None
+    if 'Close' not in data.columns.get_level_values(0):
+        return None
+    close = data['Close']
+    if isinstance(close, pd.Series):
+        close = close.to_frame(name=tickers[0])
+    elif len(tickers) == 1 and close.shape[1] == 1:
+        close.columns = [tickers[0]]
+    return close
+
+
+def download_quote_snapshot(symbols: list[str]) -> dict[str, tuple[float, float]]:
+    """
+    Fetches {original_symbol: (last_price, prev_close)} in a single bulk call.
+
+    See download_dated_quote_snapshot for the session date of the last row.
+    """
+    return download_dated_quote_snapshot(symbols)[0]
+
+
+def download_dated_quote_snapshot(
+    symbols: list[str],
+) -> tuple[dict[str, tuple[float, float]], date | None]:
+    """
+    ``(quotes, session)``: download_quote_snapshot's quotes plus the date of
+    the download's last row (None if nothing came back). ``prev_close`` is the
+    row before that one, so it is only the current session's previous close
+    once Yahoo has published the current session's bar.
+
+    Uses the same proven approach as returns.py:
+    - Daily data (no intraday interval) to avoid rate limits
+    - Single bulk download for all tickers
+    - 5-day period to handle weekends/holidays
+
+    Diagnostics are routed to the terminal log (see core.console); no Streamlit
+    banners/spinners are emitted here so the UI stays cohesive.
+    """
+    if not symbols:
+        return {}, None
+
+    # Build ticker list (.NS fallback) and a ticker -> original symbol map
+    ticker_map = {
+        to_yf_ticker(s): s for s in symbols if s and isinstance(s, str)
+    }
+    tickers_with_suffix = list(ticker_map.keys())
+
+    log.section("SWING · CURRENT PRICES")
+    log.step(f"PRIMARY · yfinance · {len(tickers_with_suffix)} symbol(s) (period=5d)")
+    t0 = time.perf_counter()
+
+    quotes = {s: (np.nan, np.nan) for s in symbols}
+    session: date | None = None
+    error = None
+
+    try:
+        # Fetch daily data for last 5 days (handles weekends/holidays)
+        # NO interval parameter = daily data = less rate limiting
+        data = yf.download(
+            tickers=tickers_with_suffix,
+            period="5d",
+            progress=False,
+            threads=True,
+            auto_adjust=False
+        )
+
+        close_prices = _close_frame(data, tickers_with_suffix)
+        if data.empty:
+            log.error("yfinance returned empty data")
+        elif close_prices is None:
+            log.error("yfinance response had no 'Close' column")
+        elif close_prices.empty:
+            log.error("yfinance 'Close' frame was empty")
+        else:
+            if len(tickers_with_suffix) == 1:
+                # Single ticker: drop non-trading rows so last/prev are the
+                # two most recent sessions for that one symbol.
+                close_prices = close_prices.dropna()
+            latest = close_prices.iloc[-1] if len(close_prices) >= 1 else None
+            if latest is not None:
+                session = pd.Timestamp(close_prices.index[-1]).date()
+            previous = close_prices.iloc[-2] if len(close_prices) >= 2 else None
+            for ticker in tickers_with_suffix:
+                original = ticker_map[ticker]
+                last = prev = np.nan
+                try:
+                    if latest is not None and not pd.isna(latest[ticker]):
+                        last = float(latest[ticker])
+                    if previous is not None and not pd.isna(previous[ticker]):
+                        prev = float(previous[ticker])
+                except (KeyError, TypeError):
+                    pass
+                quotes[original] = (last, prev)
+
+    except Exception as e:
+        error = type(e).__name__
+        log.error(f"yfinance request failed: {error}: {e}")
+
+    dt = time.perf_counter() - t0
+    failed = [s for s in symbols if pd.isna(quotes[s][0])]
+    priced = len(symbols) - len(failed)
+    if failed:
+        log.warning(f"Primary priced {priced}/{len(symbols)} in {dt:.1f}s")
+        log.item("Unpriced", fmt_symlist(failed))
+        log.detail("Handing off to secondary sources…")
+    else:
+        log.success(f"Primary priced {priced}/{len(symbols)} in {dt:.1f}s")
+    telemetry.record(
+        "primary_quotes", "yfinance", dt, symbols=len(symbols), hits=priced,
+        **({"status": "error", "error": error} if error else {}),
+    )
+
+    return quotes, session
+
+
+def apply_secondary(
+    price_map: dict[str, float],
+    prev_close_map: dict[str, float],
+    secondary: dict[str, tuple[float, float]],
+) -> int:
+    """Fill gaps in the primary maps in place; returns how many prices were filled.
+
+    A secondary last price is taken for every symbol it resolves (callers only
+    pass the symbols primary missed); a secondary previous close only fills a
+    missing one.
+    """
+    filled = 0
+    for s, (last, prev) in secondary.items():
+        if not pd.isna(last):
+            price_map[s] = last
+            filled += 1
+        if pd.isna(prev_close_map.get(s, np.nan)) and not pd.isna(prev):
+            prev_close_map[s] = prev
+    return filled
+
+
+def fetch_quotes(
+    symbols: list[str],
+) -> tuple[dict[str, float], dict[str, float], dict[str, int]]:
+    """Uncached primary + secondary resolution for a batch run.
+
+    Returns ``(price_map, prev_close_map, counts)`` where counts has the
+    ``primary`` / ``secondary`` / ``unpriced`` tallies.
+    """
+    snapshot = download_quote_snapshot(symbols)
+    price_map = {s: snapshot.get(s, (np.nan, np.nan))[0] for s in symbols}
+    prev_close_map = {s: snapshot.get(s, (np.nan, np.nan))[1] for s in symbols}
+    missing = [s for s in symbols if pd.isna(price_map[s])]
+    secondary = 0
+    if missing:
+        secondary = apply_secondary(
+            price_map, prev_close_map, resolve_fallback_quotes(tuple(sorted(missing)))
+        )
+    counts = {
+        'primary': len(symbols) - len(missing),
+        'secondary': secondary,
+        'unpriced': len(missing) - secondary,
+    }
+    return price_map, prev_close_map, counts
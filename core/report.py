@@ -0,0 +1,145 @@
+"""
+Swing — Headless portfolio reports for batch runs.
+
+Scores any number of portfolio files in one pass without Streamlit or Plotly:
+quotes are resolved once for the union of their symbols, the daily history
+for the widest requested timeframe is loaded once, and every file is then
+valued and scored from those shared inputs. The result is plain JSON-able
+data (``python -m core report …``).
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from core.console import fmt_symlist, log
+from core.history import load_analysis_data
+from core.market_session import history_end, now_ist
+from core.metrics import TIMEFRAMES, days_back, score_windows, timeframe_windows
+from core.portfolio import read_portfolio, value_holdings
+from core.quotes import fetch_quotes
+
+HOLDING_FIELDS = [
+    'SYMBOL', 'ASSET NAME', 'QUANTITY', 'AVERAGE PRICE', 'CURRENT PRICE',
+    'INVESTED', 'CURR. VALUE', 'GAIN', 'GAIN %', 'TODAY %', 'WT',
+]
+
+
+def parse_timeframes(spec: str) -> list[str]:
+    """``"1M,1Y"`` → ``['1M', '1Y']``; raises ValueError on an unknown key."""
+    tfs = [tf.strip().upper() for tf in spec.split(',') if tf.strip()]
+    unknown = [tf for tf in tfs if tf not in TIMEFRAMES]
+    if unknown or not tfs:
+        raise ValueError(
+            f"unknown timeframe(s) {', '.join(unknown) or '(none)'}; "
+            f"choose from {', '.join(TIMEFRAMES)}"
+        )
+    return list(dict.fromkeys(tfs))
+
+
+def _jsonable(value: Any) -> Any:
+    """Scalars as plain Python; NaN/inf become None."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (np.generic, np.ndarray)):
+        value = value.item() if np.ndim(value) == 0 else value.tolist()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (date, pd.Timestamp)):
+        return value.isoformat()
+    return value
+
+
+def _failed(key: str, error: Exception) -> dict[str, Any]:
+    log.error(f"{key}: {type(error).__name__}: {error}")
+    return {'file': key, 'error': f"{type(error).__name__}: {error}"}
+
+
+def _report(
+    key: str, df: pd.DataFrame, now: datetime,
+    price_map: dict[str, float], prev_close_map: dict[str, float],
+    portfolio_prices: pd.DataFrame, benchmark_prices: pd.DataFrame,
+    windows: dict[str, date], timeframes: list[str],
+) -> dict[str, Any]:
+    """Value and score one book from the shared quotes and history."""
+    df = df.assign(SYMBOL=df['SYMBOL'].astype(str))
+    holdings, summary = value_holdings(df, price_map, prev_close_map)
+    own = list(dict.fromkeys(df['SYMBOL']))
+    quantities = df.set_index('SYMBOL')['QUANTITY'].to_dict()
+    prices = (
+        portfolio_prices.reindex(columns=own)
+        if not portfolio_prices.empty else portfolio_prices
+    )
+    cube = score_windows(prices, benchmark_prices, quantities, windows)
+    fields = [f for f in HOLDING_FIELDS if f in holdings.columns]
+    report = _jsonable({
+        'file': key,
+        'as_of': now.isoformat(timespec='seconds'),
+        'summary': summary,
+        'timeframes': {
+            tf: {**cube.loc[tf].to_dict(), 'start': windows[tf]}
+            for tf in timeframes if tf in cube.index
+        },
+        'holdings': holdings[fields].to_dict(orient='records'),
+    })
+    log.success(f"{key} · {len(df)} holding(s) · {len(cube)} timeframe(s) scored")
+    return report
+
+
+def build_reports(paths: list[str | Path], timeframes: list[str]) -> list[dict[str, Any]]:
+    """One report dict per portfolio file, in ``paths`` order.
+
+    A file that cannot be read or scored (missing, not a workbook, corrupt
+    archive, wrong columns, …) yields ``{"file": ..., "error": ...}`` instead
+    of aborting the batch.
+    """
+    books: dict[str, pd.DataFrame] = {}
+    reports: dict[str, dict[str, Any]] = {}
+    for path in paths:
+        key = str(path)
+        try:
+            books[key] = read_portfolio(path)
+        except Exception as e:
+            # Readers raise far more than OSError/ValueError on a bad file
+            # (BadZipFile, openpyxl's KeyError/InvalidFileException, …).
+            reports[key] = _failed(key, e)
+
+    now = now_ist()
+    windows = {tf: start for tf, start in timeframe_windows().items() if tf in timeframes}
+    symbols = sorted({s for df in books.values() for s in df['SYMBOL'].dropna().astype(str)})
+    price_map: dict[str, float] = {}
+    prev_close_map: dict[str, float] = {}
+    portfolio_prices = benchmark_prices = pd.DataFrame()
+    if symbols:
+        price_map, prev_close_map, counts = fetch_quotes(symbols)
+        unresolved = [s for s in symbols if pd.isna(price_map[s])]
+        log.summary("PRICE RESOLUTION", {
+            "Portfolios": len(books),
+            "Holdings": len(symbols),
+            "Primary (yfinance)": counts['primary'],
+            "Secondary (fallback)": counts['secondary'],
+            "Avg-price fallback": f"{len(unresolved)}" + (
+                f" ({fmt_symlist(unresolved)})" if unresolved else ""
+            ),
+        })
+
+        fetch_days = max(days_back(tf, now) for tf in timeframes)
+        portfolio_prices, benchmark_prices = load_analysis_data(symbols, fetch_days, history_end(now))
+
+    for key, df in books.items():
+        try:
+            reports[key] = _report(key, df, now, price_map, prev_close_map,
+                                   portfolio_prices, benchmark_prices, windows, timeframes)
+        except Exception as e:
+            reports[key] = _failed(key, e)
+
+    return [reports[str(path)] for path in paths]
+
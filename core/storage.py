@@ -0,0 +1,30 @@
+"""
+Swing — Shared on-disk cache location and atomic file writes for core stores.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+# Default location: <repo>/.swing_cache (override with SWING_CACHE_DIR).
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("SWING_CACHE_DIR", Path(__file__).resolve().parent.parent / ".swing_cache")
+)
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write via a temp file + rename so readers never see a torn file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
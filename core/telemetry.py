@@ -0,0 +1,325 @@
+"""
+Swing — Structured per-stage timings for the data pipeline.
+
+The console log (core.console) is for a person watching the terminal; this is
+the machine-readable side of the same run. Every pipeline stage — primary
+quotes, NSE/BSE live, bhavcopy, history load, metrics, chart render — emits
+one event with its duration, symbol counts, hit/miss status and the session
+run id:
+
+    {"ts": "2026-10-16T10:05:11.402+05:30", "run_id": "20261016_100509_1a2b3c4d",
+     "stage": "nse_live", "source": "NseKit", "status": "partial",
+     "duration_s": 1.8421, "symbols": 12, "hits": 11, "misses": 1}
+
+Sinks (both fed by the same events):
+
+    JSON lines   appended to ``<cache>/telemetry/YYYY-MM-DD.jsonl`` (IST date);
+                 ``SWING_TELEMETRY=<dir>`` moves them, ``SWING_TELEMETRY=off``
+                 turns them off.
+    Prometheus   text-format file rewritten when ``SWING_PROM_FILE`` is set
+                 (node_exporter textfile collector): a duration histogram plus
+                 hit/miss counters per stage/source, and the serialized bytes
+                 of every chart sent. Values are cumulative for the process.
+
+Recording an event only appends to an in-memory buffer, so no stage (least of
+all a chart render) pays for file I/O. A daemon thread writes the buffered
+lines and one fresh Prometheus snapshot every ``FLUSH_INTERVAL_S``, and once
+more at interpreter exit; ``telemetry.flush()`` forces a write.
+
+``python -m core telemetry`` summarises the JSON lines (p50/p95 per stage and
+source, optionally per day; chart renders also get their median payload).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+import pandas as pd
+
+from core.console import SESSION_RUN_ID
+from core.market_session import now_ist
+from core.storage import DEFAULT_CACHE_DIR, atomic_write_bytes
+
+# Histogram buckets (seconds): sub-second cache hits through the 45 s
+# secondary deadline and cold multi-year history downloads.
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 45.0, 90.0)
+
+# Buffered events are written at most this often (and at exit), so a burst of
+# chart renders costs one append and one Prometheus rewrite, not one each.
+FLUSH_INTERVAL_S = 5.0
+
+_OFF = {"0", "off", "false", "no"}
+
+
+def _default_dir() -> Path | None:
+    value = os.environ.get("SWING_TELEMETRY", "").strip()
+    if value.lower() in _OFF:
+        return None
+    return Path(value) if value else DEFAULT_CACHE_DIR / "telemetry"
+
+
+def _default_prom() -> Path | None:
+    value = os.environ.get("SWING_PROM_FILE", "").strip()
+    return Path(value) if value else None
+
+
+class StageEvent:
+    """One stage in flight; the caller fills in counts before it closes."""
+
+    def __init__(self, stage: str, source: str, symbols: int, fields: dict[str, Any]) -> None:
+        self.stage = stage
+        self.source = source
+        self.symbols = symbols
+        self.hits: int | None = None
+        self.status: str | None = None
+        self.fields = fields
+
+    def resolved(self, hits: int, symbols: int | None = None) -> None:
+        """Record how many of the stage's symbols it priced or loaded."""
+        if symbols is not None:
+            self.symbols = symbols
+        self.hits = hits
+
+    def _status(self) -> str:
+        if self.status:
+            return self.status
+        if self.hits is None or not self.symbols:
+            return "ok"
+        if self.hits >= self.symbols:
+            return "hit"
+        return "partial" if self.hits else "miss"
+
+
+class _Prometheus:
+    """Process-cumulative histogram + counters rendered in text format."""
+
+    def __init__(self) -> None:
+        self.durations: dict[tuple[str, str], list[int]] = {}
+        self.sums: dict[tuple[str, str], float] = {}
+        self.symbols: dict[tuple[str, str, str], int] = {}
+        self.runs: dict[tuple[str, str, str], int] = {}
+        self.bytes: dict[tuple[str, str], int] = {}
+
+    def observe(self, event: dict[str, Any]) -> None:
+        key = (event["stage"], event["source"])
+        buckets = self.durations.setdefault(key, [0] * (len(DURATION_BUCKETS) + 1))
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if event["duration_s"] <= bound:
+                buckets[i] += 1
+        buckets[-1] += 1
+        self.sums[key] = self.sums.get(key, 0.0) + event["duration_s"]
+        status_key = (*key, event["status"])
+        self.runs[status_key] = self.runs.get(status_key, 0) + 1
+        if "hits" in event:
+            for result, count in (("hit", event["hits"]), ("miss", event["misses"])):
+                self.symbols[(*key, result)] = self.symbols.get((*key, result), 0) + count
+        if "bytes" in event:
+            self.bytes[key] = self.bytes.get(key, 0) + event["bytes"]
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        def escape(v: str) -> str:
+            return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return "{" + ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items()) + "}"
+
+    def render(self) -> str:
+        out = [
+            "# HELP swing_stage_duration_seconds Wall time of a SWING pipeline stage.",
+            "# TYPE swing_stage_duration_seconds histogram",
+        ]
+        for (stage, source), buckets in sorted(self.durations.items()):
+            for bound, count in zip((*DURATION_BUCKETS, "+Inf"), buckets):
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                out.append("swing_stage_duration_seconds_bucket"
+                           f"{self._labels(stage=stage, source=source, le=le)} {count}")
+            labels = self._labels(stage=stage, source=source)
+            out.append(f"swing_stage_duration_seconds_sum{labels} {self.sums[(stage, source)]:.6f}")
+            out.append(f"swing_stage_duration_seconds_count{labels} {buckets[-1]}")
+        out += [
+            "# HELP swing_stage_runs_total Completed stage runs by outcome.",
+            "# TYPE swing_stage_runs_total counter",
+        ]
+        for (stage, source, status), count in sorted(self.runs.items()):
+            out.append(f"swing_stage_runs_total{self._labels(stage=stage, source=source, status=status)}"
+                       f" {count}")
+        out += [
+            "# HELP swing_stage_symbols_total Symbols a stage was asked for, by result.",
+            "# TYPE swing_stage_symbols_total counter",
+        ]
+        for (stage, source, result), count in sorted(self.symbols.items()):
+            out.append(f"swing_stage_symbols_total{self._labels(stage=stage, source=source, result=result)}"
+                       f" {count}")
+        out += [
+            "# HELP swing_stage_bytes_total Serialized payload a stage sent (chart specs).",
+            "# TYPE swing_stage_bytes_total counter",
+        ]
+        for (stage, source), count in sorted(self.bytes.items()):
+            out.append(f"swing_stage_bytes_total{self._labels(stage=stage, source=source)} {count}")
+        return "\n".join(out) + "\n"
+
+
+class Telemetry:
+    """Stage timer feeding the JSON-lines and Prometheus sinks."""
+
+    def __init__(self, directory: Path | None = None, prom_file: Path | None = None) -> None:
+        self.directory = directory
+        self.prom_file = prom_file
+        self.enabled = True
+        self._prom = _Prometheus()
+        self._lock = threading.Lock()
+        self._pending: list[dict[str, Any]] = []
+        self._flusher: threading.Thread | None = None
+        self._prom_dirty = False
+        self._write_lock = threading.Lock()  # keeps concurrent flushes in order
+
+    @contextmanager
+    def stage(
+        self, stage: str, source: str = "", symbols: int = 0, **fields: Any
+    ) -> Iterator[StageEvent]:
+        """Time the block as ``stage``; an exception marks it ``error`` and propagates."""
+        event = StageEvent(stage, source, symbols, fields)
+        t0 = time.perf_counter()
+        try:
+            yield event
+        except BaseException as e:
+            event.status = "error"
+            event.fields["error"] = type(e).__name__
+            raise
+        finally:
+            self._emit(event, time.perf_counter() - t0)
+
+    def record(
+        self,
+        stage: str,
+        source: str,
+        duration_s: float,
+        symbols: int = 0,
+        hits: int | None = None,
+        status: str | None = None,
+        **fields: Any,
+    ) -> None:
+        """Emit an event for a stage the caller already timed."""
+        event = StageEvent(stage, source, symbols, fields)
+        event.hits = hits
+        event.status = status
+        self._emit(event, duration_s)
+
+    def _emit(self, event: StageEvent, duration_s: float) -> None:
+        if not self.enabled or (self.directory is None and self.prom_file is None):
+            return
+        now = now_ist()
+        record: dict[str, Any] = {
+            "ts": now.isoformat(timespec="milliseconds"),
+            "run_id": SESSION_RUN_ID,
+            "stage": event.stage,
+            "source": event.source,
+            "status": event._status(),
+            "duration_s": round(duration_s, 4),
+            "symbols": event.symbols,
+        }
+        if event.hits is not None:
+            record["hits"] = event.hits
+            record["misses"] = max(0, event.symbols - event.hits)
+        record.update(event.fields)
+        with self._lock:
+            if self.directory is not None:
+                self._pending.append(record)
+            if self.prom_file is not None:
+                self._prom.observe(record)
+                self._prom_dirty = True
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="swing-telemetry", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(FLUSH_INTERVAL_S)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered events and the Prometheus snapshot now."""
+        with self._write_lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            prom = self._prom.render() if self._prom_dirty and self.prom_file is not None else None
+            self._prom_dirty = False
+        # Telemetry must never take the pipeline down with it.
+        if pending and self.directory is not None:
+            by_day: dict[str, list[str]] = {}
+            for record in pending:
+                by_day.setdefault(record["ts"][:10], []).append(json.dumps(record, default=str))
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                for day, lines in by_day.items():
+                    with open(self.directory / f"{day}.jsonl", "a", encoding="utf-8") as fh:
+                        fh.write("\n".join(lines) + "\n")
+            except OSError:
+                pass
+        if prom is not None:
+            try:
+                atomic_write_bytes(self.prom_file, prom.encode())
+            except OSError:
+                pass
+
+
+telemetry = Telemetry(_default_dir(), _default_prom())
+atexit.register(telemetry.flush)
+
+
+def read_events(directory: Path, days: int, today: date | None = None) -> pd.DataFrame:
+    """Events from the last ``days`` daily files (today included)."""
+    today = today or now_ist().date()
+    rows: list[dict[str, Any]] = []
+    for offset in range(days):
+        path = directory / f"{today - timedelta(days=offset):%Y-%m-%d}.jsonl"
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn tail from a killed process
+    return pd.DataFrame(rows)
+
+
+def summarize(events: pd.DataFrame, by_day: bool = False) -> pd.DataFrame:
+    """Runs, p50/p95/max seconds and symbol hit rate per stage and source.
+
+    Stages that report a payload (chart renders) also get ``bytes_p50``.
+    """
+    if events.empty:
+        return pd.DataFrame()
+    events = events.assign(day=events['ts'].str[:10])
+    keys = (['day'] if by_day else []) + ['stage', 'source']
+    for col in ('hits', 'symbols'):
+        if col not in events.columns:
+            events[col] = float('nan')
+    grouped = events.groupby(keys, sort=True)
+    out = pd.DataFrame({
+        'runs': grouped.size(),
+        'p50_s': grouped['duration_s'].quantile(0.50),
+        'p95_s': grouped['duration_s'].quantile(0.95),
+        'max_s': grouped['duration_s'].max(),
+        'errors': grouped['status'].apply(lambda s: int((s == 'error').sum())),
+    })
+    counted = events[events['hits'].notna()]
+    totals = counted.groupby(keys)[['hits', 'symbols']].sum()
+    out['hit_rate'] = (totals['hits'] / totals['symbols'].where(totals['symbols'] > 0)).reindex(out.index)
+    if 'bytes' in events.columns:
+        out['bytes_p50'] = grouped['bytes'].median()
+    return out
@@ -0,0 +1,119 @@
+"""
+Swing — Offline NSE/BSE trading calendar.
+
+Which days have an equity session, and when it runs, answered locally: weekends
+plus an exchange holiday table (``nse_holidays.csv`` next to this module, with
+optional local additions in ``$SWING_CACHE_DIR/nse_holidays.csv``) and the
+regular session times. NSE and BSE share the equity calendar.
+
+The table only covers the years it lists. For earlier years, weekdays are
+assumed to be sessions unless the caller passes the dates actually observed in
+stored bars, which then decide (``sessions(..., observed=...)``).
+"""
+
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from core.storage import DEFAULT_CACHE_DIR
+
+NSE_OPEN = time(9, 15)
+NSE_CLOSE = time(15, 30)
+# Closing-price auction + EOD publication: quotes can still move until here.
+NSE_SETTLED = time(16, 0)
+# EOD bhavcopies are reliably on the exchange sites by this time.
+BHAV_PUBLISHED = time(18, 30)
+
+HOLIDAY_FILE = Path(__file__).with_name("nse_holidays.csv")
+LOCAL_HOLIDAY_FILE = DEFAULT_CACHE_DIR / "nse_holidays.csv"
+
+HOLIDAY = "holiday"
+SESSION = "session"
+
+
+class TradingCalendar:
+    """Session days for one exchange calendar."""
+
+    def __init__(
+        self,
+        holidays: dict[date, str] | None = None,
+        special_sessions: dict[date, str] | None = None,
+    ) -> None:
+        self.holidays = dict(holidays or {})
+        self.special_sessions = dict(special_sessions or {})
+        listed = set(self.holidays) | set(self.special_sessions)
+        self.years = frozenset(d.year for d in listed)
+
+    @classmethod
+    def from_csv(cls, *paths: str | Path) -> TradingCalendar:
+        """Build from ``date,kind,description`` files; later files win per date."""
+        holidays: dict[date, str] = {}
+        sessions: dict[date, str] = {}
+        for path in paths:
+            try:
+                table = pd.read_csv(path, comment="#", dtype=str).fillna("")
+            except (OSError, ValueError):
+                continue
+            for row in table.itertuples(index=False):
+                day = date.fromisoformat(row.date.strip())
+                holidays.pop(day, None)
+                sessions.pop(day, None)
+                target = sessions if row.kind.strip() == SESSION else holidays
+                target[day] = row.description.strip()
+        return cls(holidays, sessions)
+
+    # ── days ────────────────────────────────────────────────────────────────
+    def covers(self, day: date) -> bool:
+        """True if the holiday table lists the year of ``day``."""
+        return day.year in self.years
+
+    def is_session(self, day: date) -> bool:
+        if day in self.special_sessions:
+            return True
+        return day.weekday() < 5 and day not in self.holidays
+
+    def next_session(self, day: date) -> date:
+        """First session strictly after ``day``."""
+        day += timedelta(days=1)
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_session(self, day: date) -> date:
+        """Last session strictly before ``day``."""
+        day -= timedelta(days=1)
+        while not self.is_session(day):
+            day -= timedelta(days=1)
+        return day
+
+    def sessions(
+        self, start: date, end: date, observed: pd.DatetimeIndex | None = None
+    ) -> pd.DatetimeIndex:
+        """Session dates in ``[start, end)``.
+
+        Years outside the holiday table use ``observed`` (dates present in
+        stored bars) when given, since their holidays are unknown here.
+        """
+        days = pd.date_range(start, end - timedelta(days=1), freq="D")
+        if days.empty:
+            return pd.DatetimeIndex([])
+        listed = pd.DatetimeIndex(list(self.special_sessions)) if self.special_sessions else None
+        mask = days.dayofweek < 5
+        if self.holidays:
+            mask &= ~days.isin(pd.DatetimeIndex(list(self.holidays)))
+        if listed is not None:
+            mask |= days.isin(listed)
+        if observed is not None:
+            uncovered = ~days.year.isin(sorted(self.years))
+            mask = (mask & ~uncovered) | (uncovered & days.isin(observed.normalize()))
+        return days[mask]
+
+
+@lru_cache(maxsize=1)
+def default_calendar() -> TradingCalendar:
+    """Bundled NSE table plus any local additions (read once per process)."""
+    return TradingCalendar.from_csv(HOLIDAY_FILE, LOCAL_HOLIDAY_FILE)
@@ -0,0 +1,73 @@
+"""
+Swing — Matrix portfolio valuation.
+
+Portfolio value is ``prices ⊙ quantities`` summed across holdings, computed on
+dense NumPy arrays rather than column by column. Quantities are either a
+constant per holding (today's book applied to the whole history) or a
+dates × holdings matrix of positions as actually held, forward-filled from each
+change date — so historical value reflects when positions were open.
+
+A holding that is held on a date but has no price there contributes NaN; such
+cells count as zero in the total (matching the legacy per-column sum) and are
+reported by ``nan_report`` so a gap in the value series can be traced back to
+the holdings that caused it.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+Quantities = Mapping[str, float] | pd.Series | pd.DataFrame
+
+
+def quantity_matrix(quantities: Quantities, prices: pd.DataFrame) -> np.ndarray:
+    """Quantities aligned to ``prices`` as a float array of the same shape.
+
+    - mapping / Series   → broadcast along the date axis
+    - DataFrame          → positions from each row's date until the next row
+      (forward-filled onto the price dates; zero before the first row)
+
+    Holdings without a quantity are treated as not held (zero).
+    """
+    cols = prices.columns
+    if isinstance(quantities, pd.DataFrame):
+        q = quantities.reindex(columns=cols).sort_index()
+        q = q.reindex(q.index.union(prices.index)).ffill().reindex(prices.index)
+        return q.fillna(0.0).to_numpy(dtype=float)
+    q = pd.Series(quantities, dtype=float).reindex(cols).fillna(0.0)
+    return np.broadcast_to(q.to_numpy(), prices.shape)
+
+
+def value_matrix(prices: pd.DataFrame, quantities: Quantities) -> pd.DataFrame:
+    """Per-holding position values (dates × holdings).
+
+    Zero where a holding is not held, NaN where it is held but unpriced.
+    """
+    px = prices.to_numpy(dtype=float)
+    qty = quantity_matrix(quantities, prices)
+    values = np.where(qty != 0, px * qty, 0.0)
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
+
+
+def portfolio_value(prices: pd.DataFrame, quantities: Quantities) -> pd.Series:
+    """Daily portfolio value: Σ price × quantity, unpriced holdings as zero."""
+    values = value_matrix(prices, quantities).to_numpy()
+    return pd.Series(np.nansum(values, axis=1), index=prices.index, name="Portfolio")
+
+
+def nan_report(prices: pd.DataFrame, quantities: Quantities) -> pd.Series:
+    """Holdings held but unpriced, per date (only dates with at least one)."""
+    px = prices.to_numpy(dtype=float)
+    qty = quantity_matrix(quantities, prices)
+    gaps = np.isnan(px) & (qty != 0)
+    rows = np.flatnonzero(gaps.any(axis=1))
+    cols = np.asarray(prices.columns)
+    return pd.Series(
+        [list(cols[gaps[r]]) for r in rows],
+        index=prices.index[rows],
+        dtype=object,
+        name="unpriced",
+    )
@@ -11,21 +11,52 @@ UI — "Obsidian Quant" Institutional Research Terminal design language.
 
 from __future__ import annotations
 
-import sys
 import time
-import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from io import BytesIO
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
-import yfinance as yf
-from plotly.subplots import make_subplots
 
+from core.analytics import (
+    compute_metrics,
+    drawdown_series,
+    holding_attribution,
+    monthly_returns_grid,
+    rolling_stats,
+)
+from core.console import fmt_symlist, log
+from core.formatting import format_currency, format_inr, format_pct
+from core.history import BENCHMARK_NAME, load_analysis_data
+from core.lazy import lazy_import
+from core.market_session import (
+    INTRADAY_TTL_S,
+    current_session,
+    history_end,
+    history_ttl,
+    now_ist,
+    prev_close_ttl,
+    quote_ttl,
+)
+from core.metrics import (
+    TIMEFRAMES,
+    benchmark_returns,
+    days_back,
+    score_windows,
+    timeframe_windows,
+)
+from core.portfolio import REQUIRED_COLUMNS, read_portfolio, value_holdings
+from core.quote_warmer import QuoteWarmer
+from core.quotes import (
+    apply_secondary,
+    download_dated_quote_snapshot,
+    download_quote_snapshot,
+    resolve_fallback_quotes,
+)
+from core.telemetry import telemetry
+from core.valuation import portfolio_value, value_matrix
 from ui.theme import (
     CHART_HEIGHT_LG,
     CHART_HEIGHT_MD,
@@ -48,6 +79,14 @@ from ui.components import (
     render_metric_card,
     render_section_header,
 )
+from ui.downsample import downsample, wire_x, wire_y
+from ui.figure_cache import FigureCache
+
+# Charting loads on first use: the KPI cards render before any figure is
+# built, so plotly (~0.4 s of imports) stays off the time to first paint.
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+plotly_subplots = lazy_import("plotly.subplots")
 
 # --- Constants ---
 VERSION = "v1.2.0"
@@ -66,6 +105,13 @@ CHART_INK_MUTED = "#94A3B8"
 CHART_INK_SUBTLE = "#64748B"
 CHART_GRID = "rgba(255,255,255,0.035)"
 
+# Long time-series traces (5Y, MAX) are thinned to this many points with LTTB
+# before they are sent (None sends every point). A trace whose series is
+# longer than WEBGL_MIN_POINTS *before* thinning is drawn with WebGL instead
+# of SVG, so the switch follows the data's length, not the budget.
+CHART_POINT_BUDGET: int | None = 400
+WEBGL_MIN_POINTS = 1000
+
 # Streamlit page configuration
 st.set_page_config(
     page_title="SWING | Portfolio Tracker",
@@ -76,515 +122,181 @@ st.set_page_config(
 inject_css()
 
 
-# ===========================================================================
-# TERMINAL LOG — curated, colored console output for the data pipeline.
-#
-# Writes directly to stdout (visible in the terminal running `streamlit run`).
-# All UI-facing fetch chatter (native warnings/spinners) is routed here so the
-# Streamlit surface stays cohesive with the app's UI/UX fidelity.
-# ===========================================================================
-
-try:
-    if hasattr(sys.stdout, "reconfigure"):
-        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-except Exception:
-    pass
-
-# Silence yfinance's own console chatter (HTTP errors, "Failed download",
-# FutureWarnings) so SWING's curated terminal log stays clean. Genuine
-# failures are still captured and reported via the _Console below.
-import logging as _logging
-import warnings as _warnings
-
-_logging.getLogger("yfinance").setLevel(_logging.CRITICAL)
-_warnings.filterwarnings("ignore", category=FutureWarning, module="yfinance")
-# yfinance raises some FutureWarnings at the caller's line, so also match by
-# message (module-agnostic) — e.g. the auto_adjust default-change notice.
-_warnings.filterwarnings("ignore", message=r".*auto_adjust.*")
-
-_SESSION_RUN_ID = f"{datetime.now():%Y%m%d_%H%M%S}_{str(uuid.uuid4())[:8]}"
-
-
-class _Console:
-    """Minimal styled console logger (Nishkarsh-style) for SWING's pipeline."""
-
-    _USE_COLOR = bool(getattr(sys.stdout, "isatty", lambda: False)())
-
-    RESET = "\033[0m"
-    BOLD = "\033[1m"
-    DIM = "\033[2m"
-    RED = "\033[91m"
-    GREEN = "\033[92m"
-    YELLOW = "\033[93m"
-    BLUE = "\033[94m"
-    CYAN = "\033[96m"
-    GRAY = "\033[90m"
-
-    def _c(self, code: str, text: str) -> str:
-        return f"{code}{text}{self.RESET}" if self._USE_COLOR else text
-
-    def _write(self, message: str = "") -> None:
-        try:
-            sys.stdout.write(message + "\n")
-            sys.stdout.flush()
-        except Exception:
-            pass
-
-    def _ts(self) -> str:
-        return datetime.now().strftime("%H:%M:%S")
-
-    def line(self, char: str = "─", length: int = 70) -> None:
-        self._write(self._c(self.GRAY, char * length))
-
-    def section(self, title: str) -> None:
-        """Open a titled data-pipeline section with the run id + timestamp."""
-        self._write()
-        self.line("═", 70)
-        self._write("  " + self._c(self.BOLD + self.CYAN, title))
-        self._write(
-            "  " + self._c(self.GRAY, f"Run {_SESSION_RUN_ID} · {self._ts()}")
-        )
-        self.line("═", 70)
-
-    def step(self, title: str) -> None:
-        self._write("  " + self._c(self.BOLD + self.BLUE, f"▸ {title}"))
-
-    def detail(self, message: str) -> None:
-        self._write("    " + self._c(self.CYAN, "→") + f" {message}")
-
-    def item(self, label: str, value: Any, indent: int = 6) -> None:
-        self._write(f"{' ' * indent}{self._c(self.GRAY, label + ':')} {value}")
-
-    def success(self, message: str) -> None:
-        self._write("    " + self._c(self.GREEN, "✓") + f" {message}")
+# Sentinel set by fetch_quote_snapshot's body, which executes only on a cache
+# MISS. calculate_metrics uses it to log the PRICE RESOLUTION summary exactly
+# once per real fetch — not on cache-hit reruns (Streamlit double-runs the
+# script on load), which would otherwise duplicate the summary block.
+_FETCH_RAN: dict[str, bool] = {"primary": False}
 
-    def warning(self, message: str) -> None:
-        self._write("    " + self._c(self.YELLOW, "⚠") + f" {message}")
 
-    def error(self, message: str) -> None:
-        self._write("    " + self._c(self.RED, "✗") + f" {message}")
+# Cache layers. Each st.cache_data function is registered under the data it
+# holds so "Refresh Prices" can drop live quotes (primary and NSE/BSE
+# fallback) alone while the portfolio file and multi-year histories stay
+# warm; a deep refresh clears them all.
+CACHE_LAYERS: dict[str, list[Callable[..., Any]]] = {
+    'quotes': [],       # live last-price snapshot (yfinance)
+    'prev_close': [],   # previous session close
+    'secondary': [],    # NSE/BSE fallback quotes
+    'history': [],      # analysis histories + metrics cube
+    'portfolio': [],    # Summary Report.xlsx
+}
+QUOTE_LAYERS = ('quotes', 'secondary')
 
-    def summary(self, title: str, data: dict[str, Any]) -> None:
-        self._write()
-        self._write("  " + self._c(self.GRAY, f"┌─ {title}"))
-        for key, value in data.items():
-            self._write("  " + self._c(self.GRAY, f"│   {key}:") + f" {value}")
-        self._write("  " + self._c(self.GRAY, "└─"))
 
+def cache_layer(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a cached function under a CACHE_LAYERS entry."""
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        CACHE_LAYERS[name].append(fn)
+        return fn
+    return register
 
-log = _Console()
 
+def clear_cache_layers(layers: tuple[str, ...] | list[str] = QUOTE_LAYERS) -> None:
+    """Clear the given cache layers (default: live and fallback quotes only)."""
+    for name in layers:
+        for fn in CACHE_LAYERS[name]:
+            fn.clear()
 
-def _fmt_symlist(symbols: list[str], cap: int = 12) -> str:
-    """Compact, capped symbol list for terminal output."""
-    if not symbols:
-        return "none"
-    shown = ", ".join(symbols[:cap])
-    extra = len(symbols) - cap
-    return f"{shown} (+{extra} more)" if extra > 0 else shown
 
+def _read_through(cached: Callable[..., tuple[float, Any]], *args: Any) -> Any:
+    """Value of a cached ``(expires_at, value)`` function, refetched once expired.
 
-# Sentinel set by fetch_current_prices' body, which executes only on a cache
-# MISS. calculate_metrics uses it to log the PRICE RESOLUTION summary exactly
-# once per real fetch — not on cache-hit reruns (Streamlit double-runs the
-# script on load), which would otherwise duplicate the summary block.
-_FETCH_RAN: dict[str, bool] = {"primary": False}
+    st.cache_data fixes its TTL at decoration time, so session-aware lifetimes
+    (core.market_session) are stamped on each entry and enforced here.
+    """
+    expires_at, value = cached(*args)
+    if time.time() >= expires_at:
+        cached.clear(*args)
+        expires_at, value = cached(*args)
+    return value
 
 
-# Map a portfolio symbol to a yfinance ticker.
-# Symbols WITHOUT a '.' get the .NS (NSE) suffix as a fallback (e.g. RELIANCE -> RELIANCE.NS).
-# Symbols that ALREADY contain a '.' are exchange-qualified and used exactly as-is
-# (e.g. NSDL.BO -> NSDL.BO, QUEST.BO -> QUEST.BO).
-def _to_yf_ticker(symbol: str) -> str:
-    return symbol if '.' in symbol else f"{symbol}.NS"
-
-
-# ---------------------------------------------------------------------------
-# Secondary data infrastructure (fallback when yfinance is non-responsive).
-#
-# yfinance stays the PRIMARY source and the portfolio SYMBOL convention is
-# unchanged (no dot -> NSE; ".BO" -> BSE; ".NS" -> NSE). These helpers adapt
-# that convention to each secondary source's naming, then fill ONLY the
-# symbols yfinance left as NaN.
-#
-# Per exchange: live first, EOD bhavcopy as a post-close backstop.
-#   NSE  live -> NseKit.cm_live_equity_full_info ; EOD -> jugaad bhavcopy
-#   BSE  live -> bse.quote (scrip code by name)   ; EOD -> bse bhavcopy
-# Every source is optional and lazily imported: a missing/failing source is
-# silently skipped, so the app always degrades gracefully back to yfinance.
-# ---------------------------------------------------------------------------
-
-def _classify(symbol: str) -> tuple[str, str] | None:
-    """Map a raw portfolio symbol to (exchange, bare_symbol) for the fallbacks.
-
-    Mirrors _to_yf_ticker: no dot or ".NS" -> NSE; ".BO" -> BSE.
-    Returns None for symbols/exchanges we have no fallback for.
-    """
-    if not symbol or not isinstance(symbol, str):
-        return None
-    s = symbol.strip().upper()
-    if '.' not in s:
-        return ('NSE', s)
-    if s.endswith('.NS'):
-        return ('NSE', s[:-3])
-    if s.endswith('.BO'):
-        return ('BSE', s[:-3])
-    return None
-
-
-def _num(value: Any) -> float:
-    """Best-effort float parse; returns NaN for blanks/None/garbage."""
-    try:
-        if value is None:
-            return np.nan
-        if isinstance(value, str):
-            value = value.replace(',', '').strip()
-            if value in ('', '-'):
-                return np.nan
-        return float(value)
-    except (ValueError, TypeError):
-        return np.nan
-
-
-def _fallback_nse_live(bare_symbols: list[str]) -> dict[str, tuple[float, float]]:
-    """NseKit live quotes, per symbol. {bare: (last, prev_close)}."""
-    out: dict[str, tuple[float, float]] = {}
-    try:
-        from NseKit import Nse
-        nse = Nse()
-    except Exception as e:
-        log.warning(f"NseKit unavailable ({type(e).__name__}); skipping NSE live")
-        return out
-    for bare in bare_symbols:
-        try:
-            d = nse.cm_live_equity_full_info(bare)
-            if d:
-                out[bare] = (_num(d.get('LastTradedPrice')), _num(d.get('PreviousClose')))
-                log.detail(f"NseKit · {bare} → {out[bare][0]}")
-        except Exception:
-            continue
-    return out
-
-
-def _fallback_bse_live(bare_symbols: list[str]) -> dict[str, tuple[float, float]]:
-    """bse.quote live quotes, per symbol (scrip code resolved by name)."""
-    out: dict[str, tuple[float, float]] = {}
-    try:
-        import tempfile
-        from bse import BSE
-        b = BSE(download_folder=tempfile.gettempdir())
-    except Exception as e:
-        log.warning(f"bse unavailable ({type(e).__name__}); skipping BSE live")
-        return out
-    try:
-        for bare in bare_symbols:
-            try:
-                code = b.getScripCode(bare)
-                if not code:
-                    continue
-                q = b.quote(code)
-                if q:
-                    out[bare] = (_num(q.get('LTP')), _num(q.get('PrevClose')))
-                    log.detail(f"bse · {bare} (#{code}) → {out[bare][0]}")
-            except Exception:
-                continue
-    finally:
-        try:
-            b.exit()
-        except Exception:
-            pass
-    return out
-
-
-def _bhav_lookup(df: pd.DataFrame, eq_only: bool) -> dict[str, tuple[float, float]]:
-    """Build {TckrSymb: (close, prev_close)} from a UDiFF bhavcopy DataFrame."""
-    lookup: dict[str, tuple[float, float]] = {}
-    if df is None or 'TckrSymb' not in df.columns:
-        return lookup
-    rows = df
-    if eq_only and 'SctySrs' in df.columns:
-        rows = df[df['SctySrs'].astype(str).str.strip() == 'EQ']
-    for _, r in rows.iterrows():
-        sym = str(r['TckrSymb']).strip()
-        if sym and sym not in lookup:
-            lookup[sym] = (_num(r.get('ClsPric')), _num(r.get('PrvsClsgPric')))
-    return lookup
-
-
-def _fallback_nse_bhav(bare_symbols: list[str]) -> dict[str, tuple[float, float]]:
-    """Most-recent NSE EOD bhavcopy (jugaad), matched on TckrSymb."""
-    try:
-        import tempfile
-        from jugaad_data.nse import bhavcopy_save
-    except Exception:
-        return {}
-    folder, today = tempfile.gettempdir(), datetime.now().date()
-    for back in range(0, 7):
-        try:
-            d = today - timedelta(days=back)
-            path = bhavcopy_save(d, folder)
-            df = pd.read_csv(path)
-            df.columns = [c.strip() for c in df.columns]
-            lookup = _bhav_lookup(df, eq_only=True)
-            log.detail(f"NSE bhavcopy {d:%d-%b-%Y} loaded ({len(lookup)} scrips)")
-            return {b: lookup[b] for b in bare_symbols if b in lookup}
-        except Exception:
-            continue
-    log.warning("NSE bhavcopy unavailable (last 7 days)")
-    return {}
-
-
-def _fallback_bse_bhav(bare_symbols: list[str]) -> dict[str, tuple[float, float]]:
-    """Most-recent BSE EOD bhavcopy (bse), matched on TckrSymb."""
-    try:
-        import tempfile
-        from bse import BSE
-        b = BSE(download_folder=tempfile.gettempdir())
-    except Exception:
-        return {}
-    try:
-        today = datetime.now().date()
-        for back in range(0, 7):
-            try:
-                d = today - timedelta(days=back)
-                path = b.bhavcopyReport(d)
-                df = pd.read_csv(path)
-                df.columns = [c.strip() for c in df.columns]
-                lookup = _bhav_lookup(df, eq_only=False)
-                log.detail(f"BSE bhavcopy {d:%d-%b-%Y} loaded ({len(lookup)} scrips)")
-                return {s: lookup[s] for s in bare_symbols if s in lookup}
-            except Exception:
-                continue
-        log.warning("BSE bhavcopy unavailable (last 7 days)")
-    finally:
-        try:
-            b.exit()
-        except Exception:
-            pass
-    return {}
-
-
-def _merge_live_bhav(
-    bare_to_orig: dict[str, str],
-    live: dict[str, tuple[float, float]],
-    bhav: dict[str, tuple[float, float]],
-    resolved: dict[str, tuple[float, float]],
-) -> None:
-    """Prefer live (must carry a last price); fall back to bhavcopy."""
-    for bare, orig in bare_to_orig.items():
-        lq, bq = live.get(bare), bhav.get(bare)
-        if lq and not pd.isna(lq[0]):
-            resolved[orig] = lq
-        elif bq and not pd.isna(bq[0]):
-            resolved[orig] = bq
-        elif lq:
-            resolved[orig] = lq
-
-
-@st.cache_data(ttl=300, show_spinner=False)
 def _fetch_fallback_quotes(symbols: tuple[str, ...]) -> dict[str, tuple[float, float]]:
-    """Resolve {original_symbol: (last, prev_close)} from secondary sources.
+    """Secondary resolution (see core.quotes.resolve_fallback_quotes), session-cached."""
+    return _read_through(_cached_fallback_quotes, symbols)
+
+
+@cache_layer('secondary')
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_fallback_quotes(
+    symbols: tuple[str, ...],
+) -> tuple[float, dict[str, tuple[float, float]]]:
+    resolved = resolve_fallback_quotes(symbols)
+    complete = all(not pd.isna(resolved.get(s, (np.nan,))[0]) for s in symbols)
+    return time.time() + _quote_lifetime(complete), resolved
+
+
+def _quote_lifetime(complete: bool) -> float:
+    """Seconds to keep a quote fetch: session-aware when every symbol priced,
+    otherwise at most the intraday TTL so gaps are retried."""
+    ttl = quote_ttl()
+    return ttl if complete else min(ttl, INTRADAY_TTL_S)
+
+
+# Shared quote snapshot: ONE 5-day daily download per refresh, from which both
+# the last price and the previous close are derived. fetch_current_prices and
+# fetch_previous_close are thin views over it, so a cold load pays a single
+# Yahoo round-trip instead of two. Cached for INTRADAY_TTL_S while the market
+# is open and until the next open once closing prices have settled.
+def fetch_quote_snapshot(symbols: list[str]) -> dict[str, tuple[float, float]]:
+    """Cached {original_symbol: (last_price, prev_close)} snapshot."""
+    return _read_through(_cached_quote_snapshot, symbols)[0]
+
+
+@cache_layer('quotes')
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_quote_snapshot(
+    symbols: list[str],
+) -> tuple[float, tuple[dict[str, tuple[float, float]], date | None]]:
+    # Body runs only on a cache miss → mark that a real fetch occurred so the
+    # caller logs the resolution summary once (not on cache-hit reruns).
+    _FETCH_RAN["primary"] = True
+    quotes, session = download_dated_quote_snapshot(symbols)
+    complete = all(not pd.isna(v[0]) for v in quotes.values())
+    return time.time() + _quote_lifetime(complete), (quotes, session)
+
 
-    Live-first per exchange, EOD bhavcopy as a backstop. Only called for the
-    symbols yfinance could not price.
-    """
-    if not symbols:
-        return {}
-    nse: dict[str, str] = {}
-    bse: dict[str, str] = {}
-    other: list[str] = []
-    for s in symbols:
-        c = _classify(s)
-        if not c:
-            other.append(s)
-            continue
-        exch, bare = c
-        (nse if exch == 'NSE' else bse)[bare] = s
-
-    t0 = time.perf_counter()
-    log.step(f"SECONDARY · {len(symbols)} unpriced → NSE:{len(nse)} BSE:{len(bse)}"
-             + (f" · {len(other)} unsupported" if other else ""))
-
-    resolved: dict[str, tuple[float, float]] = {}
-
-    if nse:
-        log.detail(f"NSE live (NseKit) · {len(nse)} symbol(s)")
-        live = _fallback_nse_live(list(nse))
-        still = [b for b in nse if b not in live or pd.isna(live[b][0])]
-        if still:
-            log.detail(f"NSE backstop (bhavcopy) · {len(still)} unresolved live")
-        bhav = _fallback_nse_bhav(still) if still else {}
-        _merge_live_bhav(nse, live, bhav, resolved)
-
-    if bse:
-        log.detail(f"BSE live (bse.quote) · {len(bse)} symbol(s)")
-        live = _fallback_bse_live(list(bse))
-        still = [b for b in bse if b not in live or pd.isna(live[b][0])]
-        if still:
-            log.detail(f"BSE backstop (bhavcopy) · {len(still)} unresolved live")
-        bhav = _fallback_bse_bhav(still) if still else {}
-        _merge_live_bhav(bse, live, bhav, resolved)
-
-    dt = time.perf_counter() - t0
-    got = sum(1 for v in resolved.values() if not pd.isna(v[0]))
-    log.success(f"Secondary resolved {got}/{len(symbols)} in {dt:.1f}s")
-    return resolved
-
-
-# Function to fetch current prices from yfinance
-@st.cache_data(ttl=300, show_spinner=False)  # 5 min cache
 def fetch_current_prices(symbols: list[str]) -> dict[str, float | Any]:
+    """Latest close per symbol, served from the shared quote snapshot.
+
+    Returns a dictionary of {original_symbol: price} (NaN when unpriced).
     """
-    Fetches the latest closing price for a list of symbols with the .NS suffix.
-    Returns a dictionary of {original_symbol: price}.
+    snapshot = fetch_quote_snapshot(symbols)
+    return {s: snapshot.get(s, (np.nan, np.nan))[0] for s in symbols}
 
-    Uses the same proven approach as returns.py:
-    - Daily data (no intraday interval) to avoid rate limits
-    - Single bulk download for all tickers
-    - 5-day period to handle weekends/holidays
 
-    Diagnostics are routed to the terminal log (see _Console); no Streamlit
-    banners/spinners are emitted here so the UI stays cohesive.
-    """
-    if not symbols:
-        return {}
+# Background quote warmer: while NSE is open, one process-wide thread re-runs
+# the primary + secondary resolution every QUOTE_WARM_INTERVAL_S for every
+# symbol of any loaded portfolio. calculate_metrics serves its snapshot when
+# fresh, so dashboard reruns stop blocking on the network after TTL expiry.
+QUOTE_WARM_INTERVAL_S = 60.0
 
-    # Body runs only on a cache miss → mark that a real fetch occurred so the
-    # caller logs the resolution summary once (not on cache-hit reruns).
-    _FETCH_RAN["primary"] = True
 
-    # Build ticker list (.NS fallback) and a ticker -> original symbol map
-    ticker_map = {
-        _to_yf_ticker(s): s for s in symbols if s and isinstance(s, str)
-    }
-    tickers_with_suffix = list(ticker_map.keys())
+def _warm_quotes(
+    symbols: list[str],
+) -> tuple[dict[str, tuple[float, float]], dict[str, tuple[float, float]]]:
+    """(primary snapshot, secondary quotes for what primary missed)."""
+    quotes = download_quote_snapshot(symbols)
+    missing = tuple(sorted(s for s in symbols if pd.isna(quotes.get(s, (np.nan,))[0])))
+    return quotes, (resolve_fallback_quotes(missing) if missing else {})
 
-    log.section("SWING · CURRENT PRICES")
-    log.step(f"PRIMARY · yfinance · {len(tickers_with_suffix)} symbol(s) (period=5d)")
-    t0 = time.perf_counter()
 
-    prices = {s: np.nan for s in symbols}
+@st.cache_resource(show_spinner=False)
+def _quote_warmer() -> QuoteWarmer:
+    return QuoteWarmer(_warm_quotes, interval=QUOTE_WARM_INTERVAL_S)
 
-    try:
-        # Fetch daily data for last 5 days (handles weekends/holidays)
-        # NO interval parameter = daily data = less rate limiting
-        data = yf.download(
-            tickers=tickers_with_suffix,
-            period="5d",
-            progress=False,
-            auto_adjust=False
-        )
 
-        if data.empty:
-            log.error("yfinance returned empty data")
-        else:
-            close_prices = data['Close'] if 'Close' in data.columns.get_level_values(0) else None
-            if close_prices is None:
-                log.error("yfinance response had no 'Close' column")
-            elif close_prices.empty:
-                log.error("yfinance 'Close' frame was empty")
-            elif len(tickers_with_suffix) == 1:
-                # Single ticker case: close_prices is a Series
-                ticker = tickers_with_suffix[0]
-                original = ticker_map[ticker]
-                series = close_prices.dropna()
-                if not series.empty:
-                    prices[original] = float(series.iloc[-1])
-            else:
-                # Multiple tickers case: close_prices is a DataFrame
-                latest_prices = close_prices.iloc[-1]
-                for ticker in tickers_with_suffix:
-                    original = ticker_map[ticker]
-                    try:
-                        price = latest_prices[ticker]
-                        prices[original] = float(price) if not pd.isna(price) else np.nan
-                    except (KeyError, TypeError):
-                        prices[original] = np.nan
-
-    except Exception as e:
-        log.error(f"yfinance request failed: {type(e).__name__}: {e}")
-
-    dt = time.perf_counter() - t0
-    failed = [s for s in symbols if pd.isna(prices.get(s))]
-    priced = len(symbols) - len(failed)
-    if failed:
-        log.warning(f"Primary priced {priced}/{len(symbols)} in {dt:.1f}s")
-        log.item("Unpriced", _fmt_symlist(failed))
-        log.detail("Handing off to secondary sources…")
-    else:
-        log.success(f"Primary priced {priced}/{len(symbols)} in {dt:.1f}s")
+def _warmer_status(warmer: QuoteWarmer) -> str:
+    """Sidebar label: last background refresh time and duration."""
+    if warmer.last_refresh is None:
+        return "Warming…" if warmer.is_open(now_ist()) else "Idle · market closed"
+    stamp = f"{warmer.last_refresh:%H:%M:%S} IST · {warmer.last_duration:.1f}s"
+    return stamp if warmer.polling else f"Idle · last {stamp}"
 
-    return prices
-    
 
 # Function to load data
+@cache_layer('portfolio')
 @st.cache_data(show_spinner=False)
 def load_data() -> pd.DataFrame | None:
     """Load portfolio data from Excel file."""
     file_path = "Summary Report.xlsx"
     try:
-        df = pd.read_excel(file_path)
-        df = df.dropna(how='all')
-        df.columns = df.columns.str.strip()
-        return df
+        return read_portfolio(file_path)
     except FileNotFoundError:
         st.error(f"File '{file_path}' not found. Please upload the data file.")
         return None
+    except ValueError:
+        st.error(
+            f"Excel file must contain: {', '.join(REQUIRED_COLUMNS)}. "
+            "The 'CURRENT PRICE' column is now automatically fetched."
+        )
+        return None
 
 # Function to fetch previous day close prices for Today Return calculation
-@st.cache_data(ttl=300, show_spinner=False)
 def fetch_previous_close(symbols: list[str]) -> dict[str, float | Any]:
-    """Fetch previous trading day close prices for calculating today return."""
-    if not symbols:
-        return {}
-    
-    prices = {}
-    ticker_map = {_to_yf_ticker(s): s for s in symbols}
-    tickers_with_suffix = list(ticker_map.keys())
+    """Previous trading day close per symbol, from the shared quote snapshot.
 
-    try:
-        # Fetch 5 days of data to ensure we get previous close
-        data = yf.download(
-            tickers=tickers_with_suffix,
-            period='5d',
-            interval='1d',
-            progress=False,
-            threads=True,
-            auto_adjust=False
-        )
-
-        if data.empty:
-            return {s: np.nan for s in symbols}
-        
-        close_prices = data['Close']
-        
-        # Single ticker case
-        if len(tickers_with_suffix) == 1:
-            ticker = tickers_with_suffix[0]
-            original = ticker_map[ticker]
-            if len(close_prices.dropna()) >= 2:
-                prev_close = close_prices.dropna().iloc[-2]  # Second to last
-                prices[original] = float(prev_close)
-            else:
-                prices[original] = np.nan
-        else:
-            # Multiple tickers - get second to last row
-            if len(close_prices) >= 2:
-                prev_prices = close_prices.iloc[-2]
-                for ticker in tickers_with_suffix:
-                    original = ticker_map[ticker]
-                    try:
-                        price = prev_prices[ticker]
-                        prices[original] = float(price) if not pd.isna(price) else np.nan
-                    except (KeyError, TypeError):
-                        prices[original] = np.nan
-            else:
-                return {s: np.nan for s in symbols}
-                
-    except Exception as e:
-        return {s: np.nan for s in symbols}
-    
-    return prices
+    Used for the Today Return calculation; shares fetch_current_prices'
+    download, so calling both costs a single Yahoo round-trip.
+    """
+    return _read_through(_previous_close_layer, symbols)
+
+
+# Previous closes are cached as their own layer: a quote refresh re-downloads
+# the snapshot but keeps these, since the prior session's close is settled
+# until the next session opens. That only holds once the snapshot carries the
+# current session's bar: early in a session Yahoo may not have it yet, and the
+# second-to-last row is then the close from two sessions back, so it is kept
+# only as long as a live quote.
+@cache_layer('prev_close')
+@st.cache_data(max_entries=32, show_spinner=False)
+def _previous_close_layer(symbols: list[str]) -> tuple[float, dict[str, float]]:
+    snapshot, session = _read_through(_cached_quote_snapshot, symbols)
+    prev = {s: snapshot.get(s, (np.nan, np.nan))[1] for s in symbols}
+    ttl = prev_close_ttl() if session == current_session() else quote_ttl()
+    if any(pd.isna(v) for v in prev.values()):
+        ttl = min(ttl, INTRADAY_TTL_S)
+    return time.time() + ttl, prev
 
 # Function to calculate metrics
 def calculate_metrics(
@@ -600,16 +312,27 @@ def calculate_metrics(
         if progress:
             progress(pct, label, sub)
 
-    df = df.copy()
     symbols = df['SYMBOL'].tolist()
 
     _FETCH_RAN["primary"] = False  # set True only if the fetch actually runs
+    warmer = _quote_warmer()
+    warmer.track(symbols)
+    # One background refresh's (primary, secondary) pair, taken together so
+    # both halves come from the same swap; None → regular cached fetch.
+    warm = warmer.fresh(symbols)
+
     _p(20, "Fetching live prices", f"yfinance · {len(symbols)} holdings")
-    price_map = fetch_current_prices(symbols)
+    if warm is not None:
+        price_map = {s: warm[0].get(s, (np.nan, np.nan))[0] for s in symbols}
+    else:
+        price_map = fetch_current_prices(symbols)
 
     # 2. Fetch previous close for today's return
     _p(45, "Reconciling previous close", "Today's change basis")
-    prev_close_map = fetch_previous_close(symbols)
+    if warm is not None:
+        prev_close_map = {s: warm[0].get(s, (np.nan, np.nan))[1] for s in symbols}
+    else:
+        prev_close_map = fetch_previous_close(symbols)
 
     # 2b. Secondary sources (live-first, EOD bhavcopy backstop) fill ONLY the
     # symbols yfinance could not price. yfinance remains the primary source.
@@ -619,22 +342,15 @@ def calculate_metrics(
     if missing:
         _p(65, "Querying secondary sources",
            f"{len(missing)} unpriced · NseKit / BSE / bhavcopy")
-        fb = _fetch_fallback_quotes(tuple(sorted(missing)))
-        for s, (last, prev) in fb.items():
-            if not pd.isna(last):
-                price_map[s] = last
-                secondary_count += 1
-            if pd.isna(prev_close_map.get(s, np.nan)) and not pd.isna(prev):
-                prev_close_map[s] = prev
+        if warm is not None:
+            fb = {sym: warm[1][sym] for sym in missing if sym in warm[1]}
+        else:
+            fb = _fetch_fallback_quotes(tuple(sorted(missing)))
+        secondary_count = apply_secondary(price_map, prev_close_map, fb)
 
     _p(90, "Computing analytics", f"{len(symbols)} holdings")
 
-    # 3. Update CURRENT PRICE column using fetched data
-    df['FETCHED PRICE'] = df['SYMBOL'].map(price_map)
-    df['CURRENT PRICE'] = df['FETCHED PRICE'].fillna(df.get('CURRENT PRICE', df['AVERAGE PRICE']))
-    
-    # 4. Add previous close for today's return calculation
-    df['PREV CLOSE'] = df['SYMBOL'].map(prev_close_map)
+    df, metrics = value_holdings(df, price_map, prev_close_map)
 
     # Final resolution summary -> terminal log only (no Streamlit banner).
     # Logged once per real fetch; skipped on cache-hit reruns so the box is
@@ -646,89 +362,167 @@ def calculate_metrics(
             "Primary (yfinance)": primary_count,
             "Secondary (fallback)": secondary_count,
             "Avg-price fallback": f"{len(unresolved)}" + (
-                f" ({_fmt_symlist(unresolved)})" if unresolved else ""
+                f" ({fmt_symlist(unresolved)})" if unresolved else ""
             ),
         })
         log.line("═", 70)
 
-    # 5. Perform calculations using the updated 'CURRENT PRICE'
-    df['INVESTED'] = df['QUANTITY'] * df['AVERAGE PRICE']
-    df['CURR. VALUE'] = df['QUANTITY'] * df['CURRENT PRICE']
-    df['GAIN'] = df['CURR. VALUE'] - df['INVESTED']
-    
-    # Calculate today's change per holding
-    df['TODAY CHANGE'] = np.where(
-        df['PREV CLOSE'].notna(),
-        (df['CURRENT PRICE'] - df['PREV CLOSE']) * df['QUANTITY'],
-        0
-    )
-    df['TODAY %'] = np.where(
-        (df['PREV CLOSE'].notna()) & (df['PREV CLOSE'] != 0),
-        (df['CURRENT PRICE'] - df['PREV CLOSE']) / df['PREV CLOSE'] * 100,
-        0
-    )
-    
-    # Avoid division by zero
-    df['GAIN %'] = np.where(df['INVESTED'] != 0, df['GAIN'] / df['INVESTED'] * 100, 0)
-    
-    total_curr_value = df['CURR. VALUE'].sum()
-    df['WT'] = np.where(total_curr_value != 0, df['CURR. VALUE'] / total_curr_value * 100, 0)
-    df['WEIGHTED RETURN %'] = df['GAIN %'] * df['WT'] / 100
-    
-    # Calculate today's portfolio return
-    today_change_total = df['TODAY CHANGE'].sum()
-    prev_portfolio_value = total_curr_value - today_change_total
-    today_return_pct = (today_change_total / prev_portfolio_value * 100) if prev_portfolio_value != 0 else 0
-
-    metrics = {
-        'Total Current Value': total_curr_value,
-        'Total Invested': df['INVESTED'].sum(),
-        'Total Gain': df['GAIN'].sum(),
-        'Portfolio Return %': np.where(df['INVESTED'].sum() != 0, df['GAIN'].sum() / df['INVESTED'].sum() * 100, 0),
-        'Today Change': today_change_total,
-        'Today Return %': today_return_pct,
-        'Top 5 Concentration': df['WT'].nlargest(5).sum(),
-        'Number of Holdings': len(df)
-    }
     return df, metrics
 
-# Function to format currency (Indian Rupee with Indian comma style)
-def format_currency(value: float) -> str:
+# Portfolio Details grid: sortable columns (label → holdings column) and page sizes.
+HOLDINGS_SORT = {
+    'Rank': 'RANK',
+    'Asset': 'ASSET NAME',
+    'Symbol': 'SYMBOL',
+    'Quantity': 'QUANTITY',
+    'Invested': 'INVESTED',
+    'Value': 'CURR. VALUE',
+    'Gain': 'GAIN',
+    'Gain %': 'GAIN %',
+    'Weight': 'WT',
+}
+HOLDINGS_PAGE_SIZES = [25, 50, 100, 250]
+
+
+def rank_holdings(df: pd.DataFrame) -> pd.DataFrame:
+    """Holdings with RANK by current value (1 = largest) across the whole book."""
+    return df.assign(RANK=df['CURR. VALUE'].rank(ascending=False).astype(int))
+
+
+def page_holdings(
+    ranked: pd.DataFrame,
+    query: str,
+    sort_by: str,
+    descending: bool,
+    page: int,
+    page_size: int,
+) -> tuple[pd.DataFrame, int]:
+    """Filter (symbol / asset name substring), sort and slice ranked holdings.
+
+    Returns the requested page of numeric rows and the number of rows that
+    matched the filter; nothing is formatted here.
     """
-    Formats a number in Indian numbering system (lakhs, crores).
-    Example: 6797258.49 -> Rs 67,97,258.49
+    rows = ranked
+    query = query.strip()
+    if query:
+        mask = (
+            rows['SYMBOL'].astype(str).str.contains(query, case=False, regex=False)
+            | rows['ASSET NAME'].astype(str).str.contains(query, case=False, regex=False)
+        )
+        rows = rows[mask]
+    # Ties (equal gains, same asset name) keep rank order.
+    keys = [sort_by] if sort_by == 'RANK' else [sort_by, 'RANK']
+    rows = rows.sort_values(keys, ascending=[not descending] + [True] * (len(keys) - 1),
+                            kind='stable')
+    start = page * page_size
+    return rows.iloc[start:start + page_size], len(rows)
+
+
+def holdings_table(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
+    """The full Portfolio Details table, ranked by value."""
+    return format_holdings(rank_holdings(df).sort_values('RANK'), compact=compact)
+
+
+def format_holdings(rows: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
+    """Display frame for ranked holdings rows, every cell formatted in one pass.
+
+    Prices always show paise; ``compact`` shortens the amount columns
+    (INVESTED, CURR. VALUE, GAIN) to ₹ K / L / Cr.
     """
-    value = float(value)
-    negative = value < 0
-    value = abs(value)
-    
-    # Split into integer and decimal parts
-    integer_part = int(value)
-    decimal_part = value - integer_part
-    
-    # Convert integer to string
-    int_str = str(integer_part)
-    
-    # Indian numbering: first group of 3 from right, then groups of 2
-    if len(int_str) <= 3:
-        formatted = int_str
-    else:
-        # Last 3 digits
-        result = int_str[-3:]
-        # Remaining digits, grouped by 2 from right to left
-        remaining = int_str[:-3]
-        while len(remaining) > 2:
-            result = remaining[-2:] + ',' + result
-            remaining = remaining[:-2]
-        if remaining:
-            result = remaining + ',' + result
-        formatted = result
-    
-    # Add decimal places (always show 2 decimal places)
-    formatted += f"{decimal_part:.2f}"[1:]
-    
-    formatted = f"{'-' if negative else ''}₹{formatted}"
-    return formatted
+    prices = format_inr(rows[['AVERAGE PRICE', 'CURRENT PRICE']].to_numpy(dtype=float))
+    amounts = format_inr(rows[['INVESTED', 'CURR. VALUE', 'GAIN']].to_numpy(dtype=float),
+                         compact=compact)
+    gain = rows['GAIN'].to_numpy(dtype=float)
+    color = np.where(gain >= 0, 'var(--emerald)', 'var(--rose)')
+    open_span = np.char.add(np.char.add("<span style='color:", color), ";font-weight:600;'>")
+
+    def span(text: np.ndarray) -> np.ndarray:
+        return np.char.add(np.char.add(open_span, text), "</span>")
+
+    # Object columns: the frame only feeds to_html, so skip string-dtype conversion.
+    return pd.DataFrame({
+        'RANK': rows['RANK'].to_numpy(),
+        'ASSET NAME': rows['ASSET NAME'].to_numpy(),
+        'SYMBOL': rows['SYMBOL'].to_numpy(),
+        'QUANTITY': rows['QUANTITY'].to_numpy(),
+        'AVERAGE PRICE': prices[:, 0],
+        'CURRENT PRICE': prices[:, 1],
+        'INVESTED': amounts[:, 0],
+        'CURR. VALUE': amounts[:, 1],
+        'GAIN': span(amounts[:, 2]),
+        'GAIN %': span(format_pct(rows['GAIN %'].to_numpy(dtype=float))),
+        'WT': format_pct(rows['WT'].to_numpy(dtype=float)),
+    }, index=rows.index, dtype=object)
+
+
+def _reset_holdings_page() -> None:
+    st.session_state.holdings_page = 0
+
+
+def _turn_holdings_page(step: int) -> None:
+    st.session_state.holdings_page = max(0, st.session_state.holdings_page + step)
+
+
+@st.fragment
+def render_holdings_grid(df: pd.DataFrame) -> None:
+    """Portfolio Details grid with server-side filter, sort and pagination.
+
+    Runs as a fragment, so grid controls rerun only the grid. Just the
+    visible page is formatted and sent to the browser, so paging a
+    5,000-holding book costs the same as paging a 50-holding one.
+    """
+    st.session_state.setdefault('holdings_page', 0)
+    c_query, c_sort, c_order, c_size, c_compact = st.columns([3, 1.6, 1.2, 1.1, 1.8])
+    with c_query:
+        query = st.text_input("Filter", key="holdings_query", placeholder="Symbol or asset name",
+                              on_change=_reset_holdings_page)
+    with c_sort:
+        sort_label = st.selectbox("Sort by", list(HOLDINGS_SORT), key="holdings_sort",
+                                  on_change=_reset_holdings_page)
+    with c_order:
+        descending = st.toggle("Descending", key="holdings_desc", on_change=_reset_holdings_page)
+    with c_size:
+        page_size = st.selectbox("Rows", HOLDINGS_PAGE_SIZES, index=1, key="holdings_page_size",
+                                 on_change=_reset_holdings_page)
+    with c_compact:
+        compact = st.toggle("Compact amounts (₹ K / L / Cr)", key="compact_amounts")
+
+    ranked = rank_holdings(df)
+    rows, matched = page_holdings(ranked, query, HOLDINGS_SORT[sort_label], descending,
+                                  st.session_state.holdings_page, page_size)
+    pages = max(1, -(-matched // page_size))
+    if st.session_state.holdings_page >= pages:
+        # The book shrank (refresh) or the filter narrowed: show the last page.
+        st.session_state.holdings_page = pages - 1
+        rows, matched = page_holdings(ranked, query, HOLDINGS_SORT[sort_label], descending,
+                                      pages - 1, page_size)
+    page = st.session_state.holdings_page
+
+    if rows.empty:
+        st.info(f"No holdings match “{query.strip()}”.")
+        return
+
+    table_html = format_holdings(rows, compact=compact).to_html(
+        escape=False,
+        index=False,
+        border=0,
+        classes="portfolio-table",
+    )
+    st.markdown(f'<div class="portfolio-table">{table_html}</div>',
+                unsafe_allow_html=True)
+
+    c_prev, c_info, c_next = st.columns([1, 4, 1])
+    with c_prev:
+        st.button("‹ Prev", key="holdings_prev", width="stretch", disabled=page == 0,
+                  on_click=_turn_holdings_page, args=(-1,))
+    with c_info:
+        first = page * page_size + 1
+        filtered = f" matching ({len(df):,} holdings)" if matched < len(df) else ""
+        st.caption(f"Rows {first:,}–{first + len(rows) - 1:,} of {matched:,}{filtered}"
+                   f" · page {page + 1} / {pages}")
+    with c_next:
+        st.button("Next ›", key="holdings_next", width="stretch", disabled=page >= pages - 1,
+                  on_click=_turn_holdings_page, args=(1,))
 
 
 # Function to create downloadable Excel
@@ -762,6 +556,571 @@ def _apply_obsidian(fig, *, height: int = 360, show_legend: bool = False,
     style_axes(fig, y_title=y_title, x_title=x_title)
 
 
+def _monthly_heatmap_figure(grid: pd.DataFrame, title: str) -> go.Figure:
+    """Obsidian-styled Year × Month heatmap for a monthly_returns_grid frame."""
+    # z is sent as a fraction and labelled with d3's '%' format: plotly.js
+    # leaves an empty month's label blank, where a literal '%' suffix after
+    # %{z:.1f} would still print.
+    year_labels = [str(y) for y in grid.index]
+    fig_heat = go.Figure(data=go.Heatmap(
+        z=wire_y(grid.to_numpy() / 100),
+        x=list(grid.columns),
+        y=year_labels,
+        colorscale=[[0, CHART_ROSE], [0.5, "#0A0E17"], [1, CHART_EMERALD]],
+        zmid=0,
+        texttemplate="%{z:.1%}",
+        textfont=dict(size=10, color=CHART_INK, family="JetBrains Mono, monospace"),
+        hovertemplate="Year: %{y}<br>%{x}: %{z:.2%}<extra></extra>",
+        showscale=False,
+    ))
+
+    fig_heat.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=PLOTLY_FONT,
+        margin=CHART_MARGIN_HEATMAP,
+        title=dict(
+            text=title,
+            font=dict(size=12, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
+            x=0, xanchor='left',
+        ),
+        xaxis=dict(side='top', tickangle=0, type='category', dtick=1,
+                   tickfont=dict(size=9, family="JetBrains Mono, monospace",
+                                 color=CHART_INK_SUBTLE)),
+        yaxis=dict(autorange='reversed', type='category', dtick=1,
+                   tickfont=dict(size=9, family="JetBrains Mono, monospace",
+                                 color=CHART_INK_SUBTLE)),
+        height=max(CHART_HEIGHT_SM, len(year_labels) * 38 + 80),
+        hoverlabel=PLOTLY_HOVERLABEL,
+    )
+    return fig_heat
+
+
+# ── Figure builders ─────────────────────────────────────────────────────────
+# Pure functions of their arguments: render_figure() caches what they return
+# by a fingerprint of those arguments, so they must not read anything else
+# that varies between reruns, and callers pass only the columns they plot.
+
+def _line_trace(x: Any, y: Any, source_len: int | None = None, **kwargs: Any) -> go.Scatter:
+    """Scatter trace with compact x/y encoding, drawn with WebGL when long.
+
+    ``source_len`` is the series length before downsampling (default
+    ``len(y)``); it, not the thinned length, decides SVG vs WebGL.
+    """
+    n = len(y) if source_len is None else source_len
+    trace = go.Scattergl if n > WEBGL_MIN_POINTS else go.Scatter
+    if isinstance(x, pd.Index):
+        x = wire_x(x)
+    return trace(x=x, y=wire_y(y), **kwargs)
+
+
+def _pct_text(axis: str, spec: str) -> str:
+    """texttemplate labelling each point's ``axis`` value as a percentage.
+
+    Plotly formats the label in the browser with the d3 ``spec`` ('+.2f'),
+    so no per-point string is serialized with the figure.
+    """
+    return f"%{{{axis}:{spec}}}%"
+
+
+def _sign_marker(values: Any) -> dict[str, Any]:
+    """Bar marker: emerald for values ≥ 0, rose below, from a 0/1 array."""
+    return dict(
+        color=(np.asarray(values) >= 0).astype(np.int8),
+        colorscale=[[0, CHART_ROSE], [1, CHART_EMERALD]],
+        cmin=0, cmax=1,
+    )
+
+
+def _top_movers_figure(rows: pd.DataFrame, color: str, label: str) -> go.Figure:
+    """Horizontal bars of GAIN % for SYMBOL rows, drawn bottom-up in row order.
+
+    ``label`` is the d3 format of the bar labels, e.g. '+.1f'.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=rows['SYMBOL'],
+        x=wire_y(rows['GAIN %']),
+        orientation='h',
+        marker_color=color,
+        texttemplate=_pct_text('x', label),
+        textposition='auto',
+        textfont=dict(size=11, color=CHART_INK),
+        hovertemplate="<b>%{y}</b><br>Return: %{x:.2f}%<br>Weight: %{customdata[0]:.1f}%<br>Contribution: %{customdata[1]:.2f}%<extra></extra>",
+        customdata=wire_y(rows[['WT', 'WEIGHTED RETURN %']]),
+    ))
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_SM, show_legend=False,
+        margin=CHART_MARGIN_BAR,
+        title="Absolute Return %",
+    )
+    return fig
+
+
+def _risk_return_figure(points: pd.DataFrame) -> go.Figure:
+    """Weight vs return bubbles (SYMBOL, WT, GAIN %, CURR. VALUE)."""
+    bubble_sizes = (points['CURR. VALUE'] / points['CURR. VALUE'].max() * 40) + 10
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=points['WT'],
+        y=points['GAIN %'],
+        mode='markers+text',
+        marker=dict(
+            size=bubble_sizes,
+            color=points['GAIN %'],
+            colorscale=[[0, CHART_ROSE], [0.5, CHART_AMBER], [1, CHART_EMERALD]],
+            cmid=0,
+            line=dict(width=1, color="rgba(255,255,255,0.18)"),
+            opacity=0.85,
+        ),
+        text=points['SYMBOL'],
+        textposition='top center',
+        textfont=dict(size=9, color=CHART_INK),
+        hovertemplate="<b>%{text}</b><br>Weight: %{x:.1f}%<br>Return: %{y:.2f}%<br>Value: ₹%{customdata:,.0f}<extra></extra>",
+        customdata=points['CURR. VALUE'],
+    ))
+
+    fig.add_hline(y=0, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1)
+    avg_weight = points['WT'].mean()
+    fig.add_vline(
+        x=avg_weight, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1,
+        annotation_text=f"Avg Wt: {avg_weight:.1f}%", annotation_position="top",
+    )
+
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_LG, show_legend=False,
+        margin=CHART_MARGIN,
+        title="Weight vs Return Matrix",
+        x_title="Portfolio Weight (%)",
+        y_title="Gain/Loss (%)",
+    )
+    return fig
+
+
+def _return_attribution_figure(contrib: pd.DataFrame) -> go.Figure:
+    """WEIGHTED RETURN % bars per SYMBOL, largest contribution first."""
+    contrib_sorted = contrib.sort_values('WEIGHTED RETURN %', ascending=False)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=contrib_sorted['SYMBOL'],
+        y=wire_y(contrib_sorted['WEIGHTED RETURN %']),
+        marker=_sign_marker(contrib_sorted['WEIGHTED RETURN %']),
+        texttemplate=_pct_text('y', '+.2f'),
+        textposition='auto',
+        textfont=dict(size=10, color=CHART_INK),
+        hovertemplate="<b>%{x}</b><br>Contribution: %{y:.3f}%<br>Return: %{customdata[0]:.1f}%<br>Weight: %{customdata[1]:.1f}%<extra></extra>",
+        customdata=wire_y(contrib_sorted[['GAIN %', 'WT']]),
+    ))
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_LG, show_legend=False,
+        margin=CHART_MARGIN_ROTATED,
+        title="Weighted Return Contribution · sorted by impact",
+        y_title="Contribution (%)",
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def _composition_figure(alloc: pd.DataFrame) -> go.Figure:
+    """Value treemap (SYMBOL, CURR. VALUE) colored by GAIN %."""
+    min_gain_pct = alloc['GAIN %'].min()
+    max_gain_pct = alloc['GAIN %'].max()
+    color_scale_config: dict = {}
+    if min_gain_pct >= 0:
+        color_scale_config['color_continuous_scale'] = [CHART_AMBER, CHART_EMERALD]
+        color_scale_config['range_color'] = [min_gain_pct, max_gain_pct]
+    elif max_gain_pct <= 0:
+        color_scale_config['color_continuous_scale'] = ["#F07075", CHART_ROSE]
+        color_scale_config['range_color'] = [min_gain_pct, max_gain_pct]
+    else:
+        color_scale_config['color_continuous_scale'] = [CHART_ROSE, CHART_AMBER, CHART_EMERALD]
+        color_scale_config['color_continuous_midpoint'] = 0
+
+    fig = px.treemap(
+        alloc,
+        path=['SYMBOL'],
+        values='CURR. VALUE',
+        color='GAIN %',
+        **color_scale_config,
+    )
+    fig.update_layout(
+        margin=CHART_MARGIN_NOAXIS,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=PLOTLY_FONT,
+        title=dict(
+            text="Value Allocation · color = Gain/Loss %",
+            font=dict(size=12, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
+            x=0, xanchor='left',
+        ),
+        height=CHART_HEIGHT_LG,
+    )
+    return fig
+
+
+def _weight_treemap_figure(alloc: pd.DataFrame) -> go.Figure:
+    """Weight treemap (SYMBOL, WT) colored by GAIN %."""
+    fig = px.treemap(
+        alloc,
+        path=['SYMBOL'],
+        values='WT',
+        color='GAIN %',
+        color_continuous_scale=[CHART_ROSE, CHART_AMBER, CHART_EMERALD],
+        color_continuous_midpoint=0,
+    )
+    fig.update_layout(
+        margin=CHART_MARGIN_NOAXIS,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=PLOTLY_FONT,
+        title=dict(text="Weight % · color = Gain/Loss",
+                   font=dict(size=11, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
+                   x=0, xanchor='left'),
+        height=CHART_HEIGHT_MD,
+    )
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+
+def _lorenz_figure(weights: np.ndarray) -> go.Figure:
+    """Cumulative weight of holdings ranked largest first, vs equal weight."""
+    sorted_weights = np.sort(weights)[::-1]
+    cum_weights = np.cumsum(sorted_weights)
+    n = len(sorted_weights)
+
+    fig = go.Figure()
+    fig.add_trace(_line_trace(
+        np.arange(n + 1),
+        np.concatenate([[0.0], np.linspace(0, 100, n)]),
+        mode='lines',
+        name='Equal Weight',
+        line=dict(color=CHART_INK_SUBTLE, dash='dash', width=1),
+    ))
+    fig.add_trace(_line_trace(
+        np.arange(n + 1),
+        np.concatenate([[0.0], cum_weights]),
+        mode='lines+markers',
+        name='Portfolio',
+        line=dict(color=CHART_AMBER, width=2),
+        marker=dict(size=4),
+        fill='tonexty',
+        fillcolor=CHART_AMBER_GLOW,
+    ))
+    fig.add_hline(y=50, line_dash="dot", line_color=CHART_EMERALD,
+                  annotation_text="50%", annotation_position="right")
+    fig.add_hline(y=80, line_dash="dot", line_color=CHART_CYAN,
+                  annotation_text="80%", annotation_position="right")
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_MD, show_legend=True,
+        margin=CHART_MARGIN,
+        title="Lorenz Curve · cumulative %",
+        x_title='# Holdings (ranked)',
+        y_title='Cumulative Weight (%)',
+    )
+    fig.update_yaxes(range=[0, 105])
+    return fig
+
+
+def _risk_contribution_figure(contrib: pd.DataFrame, hhi: float) -> go.Figure:
+    """Return contribution beside risk weight (WT² / HHI) per SYMBOL."""
+    contrib = contrib.assign(**{'Risk Weight': (contrib['WT'] ** 2) / hhi * 100})
+    contrib = contrib.sort_values('WEIGHTED RETURN %', ascending=False)
+
+    fig = plotly_subplots.make_subplots(rows=1, cols=2, shared_yaxes=True,
+                                        subplot_titles=('Return Contribution', 'Risk Contribution'),
+                                        horizontal_spacing=0.02)
+
+    fig.add_trace(go.Bar(
+        y=contrib['SYMBOL'],
+        x=wire_y(contrib['WEIGHTED RETURN %']),
+        orientation='h',
+        marker=_sign_marker(contrib['WEIGHTED RETURN %']),
+        texttemplate=_pct_text('x', '.2f'),
+        textposition='auto',
+        textfont=dict(size=9, color=CHART_INK),
+        showlegend=False,
+    ), row=1, col=1)
+
+    fig.add_trace(go.Bar(
+        y=contrib['SYMBOL'],
+        x=wire_y(contrib['Risk Weight']),
+        orientation='h',
+        marker_color=CHART_AMBER,
+        texttemplate=_pct_text('x', '.1f'),
+        textposition='auto',
+        textfont=dict(size=9, color=CHART_INK),
+        showlegend=False,
+    ), row=1, col=2)
+
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=PLOTLY_FONT,
+        margin=CHART_MARGIN_BAR,
+        height=max(CHART_HEIGHT_MD, len(contrib) * 22 + 80),
+        showlegend=False,
+        hoverlabel=PLOTLY_HOVERLABEL,
+    )
+
+    fig.update_xaxes(gridcolor=CHART_GRID, zeroline=False,
+                     tickfont=dict(size=9, family="JetBrains Mono, monospace",
+                                   color=CHART_INK_SUBTLE))
+    fig.update_yaxes(gridcolor=CHART_GRID, zeroline=False,
+                     tickfont=dict(size=9, family="JetBrains Mono, monospace",
+                                   color=CHART_INK_SUBTLE))
+    return fig
+
+
+def _performance_figure(port_value: pd.Series, bench_series: pd.Series | None,
+                        total_return: float) -> go.Figure:
+    """Portfolio vs benchmark, both rebased to 100."""
+    port_norm = downsample((port_value / port_value.iloc[0]) * 100, CHART_POINT_BUDGET)
+
+    fig = go.Figure()
+    fig.add_trace(_line_trace(
+        port_norm.index,
+        port_norm.values,
+        len(port_value),
+        mode='lines',
+        name=f'Portfolio ({total_return:+.2f}%)',
+        line=dict(color=CHART_AMBER, width=2.5),
+        hovertemplate='%{x|%b %d, %Y}<br>Portfolio: %{y:.2f}<extra></extra>',
+    ))
+
+    if bench_series is not None and len(bench_series) > 0:
+        bench_norm = downsample((bench_series / bench_series.iloc[0]) * 100, CHART_POINT_BUDGET)
+        bench_ret = ((bench_series.iloc[-1] / bench_series.iloc[0]) - 1) * 100
+        fig.add_trace(_line_trace(
+            bench_norm.index,
+            bench_norm.values,
+            len(bench_series),
+            mode='lines',
+            name=f'{BENCHMARK_NAME} ({bench_ret:+.2f}%)',
+            line=dict(color=CHART_CYAN, width=2, dash='dot'),
+            hovertemplate=f'%{{x|%b %d, %Y}}<br>{BENCHMARK_NAME}: %{{y:.2f}}<extra></extra>',
+        ))
+
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_LG, show_legend=True,
+        margin=CHART_MARGIN_NOTITLE,
+    )
+    fig.update_yaxes(side='right')
+    fig.update_layout(hovermode='closest')
+    fig.update_xaxes(rangeslider=dict(visible=False), rangeselector=dict(visible=False))
+    return fig
+
+
+def _drawdown_figure(dd_series: pd.Series, max_drawdown: float) -> go.Figure:
+    """Underwater equity curve with the maximum drawdown marked."""
+    n = len(dd_series)
+    dd_series = downsample(dd_series, CHART_POINT_BUDGET)
+    fig = go.Figure()
+    fig.add_trace(_line_trace(
+        dd_series.index,
+        dd_series.values,
+        n,
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color=CHART_ROSE, width=1),
+        fillcolor='rgba(232, 85, 90, 0.25)',
+        hovertemplate='%{x|%b %d, %Y}<br>Drawdown: %{y:.2f}%<extra></extra>',
+    ))
+    fig.add_hline(
+        y=max_drawdown,
+        line_dash="dash",
+        line_color=CHART_AMBER,
+        annotation_text=f"Max: {max_drawdown:.1f}%",
+        annotation_position="right",
+    )
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_MD, show_legend=False,
+        margin=CHART_MARGIN,
+        title="Underwater Equity Curve",
+    )
+    return fig
+
+
+def _returns_histogram_figure(port_returns: pd.Series, var_95: float) -> go.Figure:
+    """Daily return histogram with zero, mean and VaR markers."""
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=wire_y(port_returns * 100),
+        nbinsx=40,
+        marker_color=CHART_AMBER,
+        opacity=0.78,
+        hovertemplate='Return: %{x:.2f}%<br>Count: %{y}<extra></extra>',
+    ))
+    fig.add_vline(x=0, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1)
+    fig.add_vline(
+        x=port_returns.mean() * 100,
+        line_dash="dot",
+        line_color=CHART_EMERALD,
+        annotation_text=f"μ: {port_returns.mean()*100:.2f}%",
+        annotation_position="top",
+    )
+    fig.add_vline(
+        x=var_95,
+        line_dash="dash",
+        line_color=CHART_ROSE,
+        annotation_text=f"VaR: {var_95:.1f}%",
+        annotation_position="bottom left",
+    )
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_MD, show_legend=False,
+        margin=CHART_MARGIN,
+        title="Daily Returns Histogram",
+        x_title='Daily Return (%)',
+    )
+    return fig
+
+
+def _rolling_sharpe_figure(roll_sharpe: pd.Series) -> go.Figure:
+    """Rolling annualised Sharpe ratio against the 1.0 target."""
+    n = len(roll_sharpe)
+    roll_sharpe = downsample(roll_sharpe, CHART_POINT_BUDGET)
+    fig = go.Figure()
+    fig.add_trace(_line_trace(
+        roll_sharpe.index,
+        roll_sharpe.values,
+        n,
+        mode='lines',
+        line=dict(color=CHART_AMBER, width=1.5),
+        hovertemplate='%{x|%b %d, %Y}<br>Sharpe: %{y:.2f}<extra></extra>',
+    ))
+    fig.add_hline(y=1, line_dash="dash", line_color=CHART_EMERALD,
+                  annotation_text="Target", annotation_position="right")
+    fig.add_hline(y=0, line_dash="dash", line_color=CHART_INK_SUBTLE)
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_SM, show_legend=False,
+        margin=CHART_MARGIN,
+        title="Rolling Sharpe Ratio",
+    )
+    fig.update_xaxes(tickformat='%b %Y')
+    return fig
+
+
+def _rolling_beta_figure(roll: pd.DataFrame) -> go.Figure:
+    """Rolling beta, with correlation, alpha and tracking error on hover."""
+    n = len(roll)
+    roll = downsample(roll, CHART_POINT_BUDGET, column='beta')
+    fig = go.Figure()
+    fig.add_trace(_line_trace(
+        roll.index,
+        roll['beta'].values,
+        n,
+        mode='lines',
+        line=dict(color=CHART_CYAN, width=1.5),
+        customdata=wire_y(roll[['correlation', 'alpha', 'tracking_error']].values),
+        hovertemplate='%{x|%b %d, %Y}<br>Beta: %{y:.2f}'
+                      '<br>Corr: %{customdata[0]:.2f}'
+                      '<br>Alpha: %{customdata[1]:+.1f}%'
+                      '<br>TE: %{customdata[2]:.1f}%<extra></extra>',
+    ))
+    fig.add_hline(y=1, line_dash="dash", line_color=CHART_INK_SUBTLE,
+                  annotation_text="Market", annotation_position="right")
+    _apply_obsidian(
+        fig, height=CHART_HEIGHT_SM, show_legend=False,
+        margin=CHART_MARGIN,
+        title=f"Rolling Beta vs {BENCHMARK_NAME}",
+    )
+    fig.update_xaxes(tickformat='%b %Y')
+    return fig
+
+
+def _holding_attribution_figure(attr_df: pd.DataFrame) -> go.Figure:
+    """Per-holding contribution bars with time-weighted markers."""
+    attr_df = attr_df.sort_values('Contribution', ascending=True)
+    tw_total = attr_df['TW Contribution'].sum()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Current weight',
+        y=attr_df.index,
+        x=wire_y(attr_df['Contribution']),
+        orientation='h',
+        marker=_sign_marker(attr_df['Contribution']),
+        texttemplate=_pct_text('x', '+.2f'),
+        textposition='auto',
+        textfont=dict(size=10, color=CHART_INK),
+        hovertemplate="<b>%{y}</b><br>Return: %{customdata[0]:.1f}%<br>Weight: %{customdata[1]:.1f}%<br>Contribution: %{x:.2f}%<br>Time-weighted: %{customdata[2]:+.2f}%<extra></extra>",
+        customdata=wire_y(attr_df[['Return', 'Weight', 'TW Contribution']]),
+    ))
+    fig.add_trace(go.Scatter(
+        name='Time-weighted',
+        y=attr_df.index,
+        x=wire_y(attr_df['TW Contribution']),
+        mode='markers',
+        marker=dict(color=CHART_CYAN, size=7, symbol='diamond'),
+        hovertemplate="<b>%{y}</b><br>Time-weighted: %{x:+.2f}%<extra></extra>",
+    ))
+    _apply_obsidian(
+        fig, height=max(CHART_HEIGHT_MD, len(attr_df) * 25 + 70), show_legend=True,
+        margin=CHART_MARGIN_BAR,
+        title=f"Contribution to Portfolio Return (%) · time-weighted Σ {tw_total:+.2f}%",
+    )
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def _figure_cache() -> FigureCache:
+    """One figure cache per server process, shared by every session."""
+    return FigureCache()
+
+
+def _figure_cache_status(cache: FigureCache) -> str:
+    """Sidebar summary, e.g. '92% reused · 48/52'."""
+    lookups = cache.hits + cache.misses
+    if not lookups:
+        return "—"
+    return f"{cache.hit_rate:.0%} reused · {cache.hits}/{lookups}"
+
+
+def _trace_points(fig) -> int:
+    """Data points across a figure's traces (x, else values, else y)."""
+    total = 0
+    for trace in fig.data:
+        for attr in ('x', 'values', 'y'):
+            points = getattr(trace, attr, None)
+            if points is not None:
+                total += len(points)
+                break
+    return total
+
+
+def _figure_bytes(fig) -> int:
+    """Size of the JSON spec st.plotly_chart sends to the browser for ``fig``."""
+    return len(fig.to_json().encode())
+
+
+def render_chart(fig, name: str, cached: bool | None = None, size: int | None = None,
+                 **kwargs: Any) -> None:
+    """st.plotly_chart at full width, timed as a ``chart_render`` stage.
+
+    The event records the figure's serialized ``bytes`` (measured here unless
+    the caller already knows it).
+    """
+    kwargs.setdefault('width', "stretch")
+    fields: dict[str, Any] = {} if cached is None else {'cached': cached}
+    fields['bytes'] = _figure_bytes(fig) if size is None else size
+    with telemetry.stage('chart_render', name, traces=len(fig.data),
+                         points=_trace_points(fig), **fields):
+        st.plotly_chart(fig, **kwargs)
+
+
+def render_figure(name: str, build: Callable[..., go.Figure], *args: Any, **kwargs: Any) -> None:
+    """Render ``build(*args)``, reusing the figure built for identical inputs.
+
+    ``args`` are fingerprinted by content (see ui.figure_cache); ``kwargs``
+    go to st.plotly_chart. The serialized size is measured once per build and
+    cached with the figure.
+    """
+    def build_sized(*build_args: Any) -> tuple[go.Figure, int]:
+        fig = build(*build_args)
+        return fig, _figure_bytes(fig)
+
+    (fig, size), hit = _figure_cache().get(name, build_sized, *args)
+    render_chart(fig, name, cached=hit, size=size, **kwargs)
+
+
 # Main app
 def main() -> None:
     """Main application entry point."""
@@ -785,13 +1144,23 @@ def main() -> None:
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
         st.markdown('<div class="sidebar-title">Data Controls</div>', unsafe_allow_html=True)
-        if st.button("Refresh Prices", help="Clear cached prices and fetch fresh data"):
-            st.cache_data.clear()
-            # Re-arm the progress cards: the next run is a real (slow) cache
-            # miss, so show loading feedback for both dashboard and analysis.
+        deep_refresh = st.checkbox(
+            "Deep refresh",
+            help="Also reload the portfolio file, previous closes and "
+                 "analysis histories",
+        )
+        if st.button("Refresh Prices", help="Fetch fresh live quotes (cached data otherwise kept)"):
+            # Re-arm the progress cards for the layers being rebuilt: the next
+            # run is a real (slow) cache miss for those, so show feedback.
             st.session_state.pop('_swing_dash_loaded', None)
-            st.session_state.pop('_swing_an_key', None)
-            st.toast("Price cache cleared")
+            _quote_warmer().invalidate()
+            if deep_refresh:
+                clear_cache_layers(list(CACHE_LAYERS))
+                st.session_state.pop('_swing_an_key', None)
+                st.toast("All caches cleared")
+            else:
+                clear_cache_layers(QUOTE_LAYERS)
+                st.toast("Live quotes cleared")
             st.rerun()
 
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
@@ -805,23 +1174,6 @@ def main() -> None:
 
         st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
-        st.markdown('<div class="sidebar-title">Anchor Date</div>', unsafe_allow_html=True)
-        st.caption("Set a custom start date for Analysis Mode metrics")
-
-        use_anchor = st.toggle("Enable Anchor Date", value=False, key="use_anchor_date")
-        anchor_date = None
-        if use_anchor:
-            anchor_date = st.date_input(
-                "Investment Start Date",
-                value=datetime.now() - timedelta(days=365),
-                max_value=datetime.now().date(),
-                min_value=datetime(2010, 1, 1).date(),
-                label_visibility="collapsed",
-            )
-            st.caption(f"Metrics calculated from {anchor_date.strftime('%b %d, %Y')}")
-
-        st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
-
         st.markdown('<div class="sidebar-title">System</div>', unsafe_allow_html=True)
         st.markdown(
             f"""
@@ -836,7 +1188,15 @@ def main() -> None:
                 </div>
                 <div class="sys-meta-row">
                     <span class="sys-meta-key">Refresh</span>
-                    <span class="sys-meta-val">5 min</span>
+                    <span class="sys-meta-val">{INTRADAY_TTL_S / 60:.0f} min · session-aware</span>
+                </div>
+                <div class="sys-meta-row">
+                    <span class="sys-meta-key">Quotes</span>
+                    <span class="sys-meta-val">{_warmer_status(_quote_warmer())}</span>
+                </div>
+                <div class="sys-meta-row">
+                    <span class="sys-meta-key">Figures</span>
+                    <span class="sys-meta-val">{_figure_cache_status(_figure_cache())}</span>
                 </div>
             </div>
             """,
@@ -854,14 +1214,6 @@ def main() -> None:
     if df is None:
         return
 
-    required_columns = ['ASSET NAME', 'SYMBOL', 'QUANTITY', 'AVERAGE PRICE']
-    if not all(col in df.columns for col in required_columns):
-        st.error(
-            f"Excel file must contain: {', '.join(required_columns)}. "
-            "The 'CURRENT PRICE' column is now automatically fetched."
-        )
-        return
-
     # Themed progress card — shown on first dashboard load of the session
     # (prices are cached afterwards, so cosmetic reruns stay instant/quiet).
     _show_prog = not st.session_state.get('_swing_dash_loaded', False)
@@ -1019,47 +1371,15 @@ def main() -> None:
 
             with col_gainers:
                 render_section_header("Top Gainers", icon="trending", accent="emerald")
-                top_5_gainers = df.nlargest(5, 'GAIN %')[['SYMBOL', 'GAIN %', 'WT', 'WEIGHTED RETURN %', 'GAIN']]
-                fig_gainers = go.Figure()
-                fig_gainers.add_trace(go.Bar(
-                    y=top_5_gainers['SYMBOL'][::-1],
-                    x=top_5_gainers['GAIN %'][::-1],
-                    orientation='h',
-                    marker_color=CHART_EMERALD,
-                    text=[f"{x:+.1f}%" for x in top_5_gainers['GAIN %'][::-1]],
-                    textposition='auto',
-                    textfont=dict(size=11, color=CHART_INK),
-                    hovertemplate="<b>%{y}</b><br>Return: %{x:.2f}%<br>Weight: %{customdata[0]:.1f}%<br>Contribution: %{customdata[1]:.2f}%<extra></extra>",
-                    customdata=top_5_gainers[['WT', 'WEIGHTED RETURN %']][::-1].values,
-                ))
-                _apply_obsidian(
-                    fig_gainers, height=CHART_HEIGHT_SM, show_legend=False,
-                    margin=CHART_MARGIN_BAR,
-                    title="Absolute Return %",
-                )
-                st.plotly_chart(fig_gainers, width="stretch")
+                top_5_gainers = df.nlargest(5, 'GAIN %')[['SYMBOL', 'GAIN %', 'WT', 'WEIGHTED RETURN %']]
+                render_figure('top_gainers', _top_movers_figure,
+                              top_5_gainers[::-1], CHART_EMERALD, '+.1f')
 
             with col_losers:
                 render_section_header("Top Losers", icon="trending", accent="rose")
-                top_5_losers = df.nsmallest(5, 'GAIN %')[['SYMBOL', 'GAIN %', 'WT', 'WEIGHTED RETURN %', 'GAIN']]
-                fig_losers = go.Figure()
-                fig_losers.add_trace(go.Bar(
-                    y=top_5_losers['SYMBOL'],
-                    x=top_5_losers['GAIN %'],
-                    orientation='h',
-                    marker_color=CHART_ROSE,
-                    text=[f"{x:.1f}%" for x in top_5_losers['GAIN %']],
-                    textposition='auto',
-                    textfont=dict(size=11, color=CHART_INK),
-                    hovertemplate="<b>%{y}</b><br>Return: %{x:.2f}%<br>Weight: %{customdata[0]:.1f}%<br>Contribution: %{customdata[1]:.2f}%<extra></extra>",
-                    customdata=top_5_losers[['WT', 'WEIGHTED RETURN %']].values,
-                ))
-                _apply_obsidian(
-                    fig_losers, height=CHART_HEIGHT_SM, show_legend=False,
-                    margin=CHART_MARGIN_BAR,
-                    title="Absolute Return %",
-                )
-                st.plotly_chart(fig_losers, width="stretch")
+                top_5_losers = df.nsmallest(5, 'GAIN %')[['SYMBOL', 'GAIN %', 'WT', 'WEIGHTED RETURN %']]
+                render_figure('top_losers', _top_movers_figure,
+                              top_5_losers, CHART_ROSE, '.1f')
 
             # ── Risk-Return Profile ─────────────────────────────────────────
             render_section_header(
@@ -1069,44 +1389,8 @@ def main() -> None:
                 accent="violet",
             )
 
-            max_val = df['CURR. VALUE'].max()
-            bubble_sizes = (df['CURR. VALUE'] / max_val * 40) + 10
-
-            fig_scatter = go.Figure()
-            fig_scatter.add_trace(go.Scatter(
-                x=df['WT'],
-                y=df['GAIN %'],
-                mode='markers+text',
-                marker=dict(
-                    size=bubble_sizes,
-                    color=df['GAIN %'],
-                    colorscale=[[0, CHART_ROSE], [0.5, CHART_AMBER], [1, CHART_EMERALD]],
-                    cmid=0,
-                    line=dict(width=1, color="rgba(255,255,255,0.18)"),
-                    opacity=0.85,
-                ),
-                text=df['SYMBOL'],
-                textposition='top center',
-                textfont=dict(size=9, color=CHART_INK),
-                hovertemplate="<b>%{text}</b><br>Weight: %{x:.1f}%<br>Return: %{y:.2f}%<br>Value: ₹%{customdata:,.0f}<extra></extra>",
-                customdata=df['CURR. VALUE'],
-            ))
-
-            fig_scatter.add_hline(y=0, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1)
-            avg_weight = df['WT'].mean()
-            fig_scatter.add_vline(
-                x=avg_weight, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1,
-                annotation_text=f"Avg Wt: {avg_weight:.1f}%", annotation_position="top",
-            )
-
-            _apply_obsidian(
-                fig_scatter, height=CHART_HEIGHT_LG, show_legend=False,
-                margin=CHART_MARGIN,
-                title="Weight vs Return Matrix",
-                x_title="Portfolio Weight (%)",
-                y_title="Gain/Loss (%)",
-            )
-            st.plotly_chart(fig_scatter, width="stretch")
+            render_figure('risk_return', _risk_return_figure,
+                          df[['SYMBOL', 'WT', 'GAIN %', 'CURR. VALUE']])
 
             # ── Return Attribution ──────────────────────────────────────────
             render_section_header(
@@ -1115,27 +1399,8 @@ def main() -> None:
                 icon="bar-chart",
             )
 
-            contrib_sorted = df.sort_values('WEIGHTED RETURN %', ascending=False).copy()
-            fig_waterfall = go.Figure()
-            colors = [CHART_EMERALD if x >= 0 else CHART_ROSE for x in contrib_sorted['WEIGHTED RETURN %']]
-            fig_waterfall.add_trace(go.Bar(
-                x=contrib_sorted['SYMBOL'],
-                y=contrib_sorted['WEIGHTED RETURN %'],
-                marker_color=colors,
-                text=[f"{x:+.2f}%" for x in contrib_sorted['WEIGHTED RETURN %']],
-                textposition='auto',
-                textfont=dict(size=10, color=CHART_INK),
-                hovertemplate="<b>%{x}</b><br>Contribution: %{y:.3f}%<br>Return: %{customdata[0]:.1f}%<br>Weight: %{customdata[1]:.1f}%<extra></extra>",
-                customdata=contrib_sorted[['GAIN %', 'WT']].values,
-            ))
-            _apply_obsidian(
-                fig_waterfall, height=CHART_HEIGHT_LG, show_legend=False,
-                margin=CHART_MARGIN_ROTATED,
-                title="Weighted Return Contribution · sorted by impact",
-                y_title="Contribution (%)",
-            )
-            fig_waterfall.update_xaxes(tickangle=45)
-            st.plotly_chart(fig_waterfall, width="stretch")
+            render_figure('return_attribution', _return_attribution_figure,
+                          df[['SYMBOL', 'WEIGHTED RETURN %', 'GAIN %', 'WT']])
 
             # ── Portfolio Composition ───────────────────────────────────────
             render_section_header(
@@ -1145,39 +1410,8 @@ def main() -> None:
                 accent="cyan",
             )
 
-            min_gain_pct = df['GAIN %'].min()
-            max_gain_pct = df['GAIN %'].max()
-            color_scale_config: dict = {}
-            if min_gain_pct >= 0:
-                color_scale_config['color_continuous_scale'] = [CHART_AMBER, CHART_EMERALD]
-                color_scale_config['range_color'] = [min_gain_pct, max_gain_pct]
-            elif max_gain_pct <= 0:
-                color_scale_config['color_continuous_scale'] = ["#F07075", CHART_ROSE]
-                color_scale_config['range_color'] = [min_gain_pct, max_gain_pct]
-            else:
-                color_scale_config['color_continuous_scale'] = [CHART_ROSE, CHART_AMBER, CHART_EMERALD]
-                color_scale_config['color_continuous_midpoint'] = 0
-
-            fig_treemap = px.treemap(
-                df,
-                path=['SYMBOL'],
-                values='CURR. VALUE',
-                color='GAIN %',
-                **color_scale_config,
-            )
-            fig_treemap.update_layout(
-                margin=CHART_MARGIN_NOAXIS,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=PLOTLY_FONT,
-                title=dict(
-                    text="Value Allocation · color = Gain/Loss %",
-                    font=dict(size=12, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
-                    x=0, xanchor='left',
-                ),
-                height=CHART_HEIGHT_LG,
-            )
-            st.plotly_chart(fig_treemap, width="stretch")
+            render_figure('composition', _composition_figure,
+                          df[['SYMBOL', 'CURR. VALUE', 'GAIN %']])
 
         with tab2:
             render_section_header(
@@ -1186,41 +1420,7 @@ def main() -> None:
                 icon="database",
             )
 
-            display_df = df[['ASSET NAME', 'SYMBOL', 'QUANTITY', 'AVERAGE PRICE', 'INVESTED',
-                             'CURRENT PRICE', 'CURR. VALUE', 'GAIN', 'GAIN %', 'WT']].copy()
-
-            display_df['RANK'] = display_df['CURR. VALUE'].rank(ascending=False).astype(int)
-            display_df = display_df.sort_values('RANK')
-
-            display_df['AVERAGE PRICE'] = display_df['AVERAGE PRICE'].apply(format_currency)
-            display_df['INVESTED'] = display_df['INVESTED'].apply(format_currency)
-            display_df['CURRENT PRICE'] = display_df['CURRENT PRICE'].apply(format_currency)
-
-            def format_gain(x):
-                color = 'var(--emerald)' if x >= 0 else 'var(--rose)'
-                return f"<span style='color:{color};font-weight:600;'>{format_currency(x)}</span>"
-
-            def format_gain_pct(x):
-                color = 'var(--emerald)' if x >= 0 else 'var(--rose)'
-                return f"<span style='color:{color};font-weight:600;'>{x:.2f}%</span>"
-
-            display_df['CURR. VALUE'] = display_df['CURR. VALUE'].apply(format_currency)
-            display_df['GAIN'] = display_df['GAIN'].apply(format_gain)
-            display_df['GAIN %'] = display_df['GAIN %'].apply(format_gain_pct)
-            display_df['WT'] = display_df['WT'].apply(lambda x: f"{x:.2f}%")
-
-            display_cols = ['RANK', 'ASSET NAME', 'SYMBOL', 'QUANTITY', 'AVERAGE PRICE', 'CURRENT PRICE',
-                            'INVESTED', 'CURR. VALUE', 'GAIN', 'GAIN %', 'WT']
-            display_df = display_df[display_cols]
-
-            table_html = display_df.to_html(
-                escape=False,
-                index=False,
-                border=0,
-                classes="portfolio-table",
-            )
-            st.markdown(f'<div class="portfolio-table">{table_html}</div>',
-                        unsafe_allow_html=True)
+            render_holdings_grid(df)
 
             st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
@@ -1245,8 +1445,6 @@ def main() -> None:
                 cum_weights = np.cumsum(sorted_weights)
                 gini = 1 - 2 * np.sum(cum_weights) / (n_holdings * cum_weights[-1]) if cum_weights[-1] > 0 else 0
 
-            avg_weight = weights.mean()
-            weight_std = weights.std()
             div_ratio = 1 / (hhi / 10000) if hhi > 0 else n_holdings
 
             render_section_header("Concentration Metrics", icon="layers", accent="cyan")
@@ -1311,122 +1509,18 @@ def main() -> None:
 
             with col_pie:
                 render_section_header("Weight Distribution", icon="grid", accent="cyan")
-                fig_tree = px.treemap(
-                    df,
-                    path=['SYMBOL'],
-                    values='WT',
-                    color='GAIN %',
-                    color_continuous_scale=[CHART_ROSE, CHART_AMBER, CHART_EMERALD],
-                    color_continuous_midpoint=0,
-                )
-                fig_tree.update_layout(
-                    margin=CHART_MARGIN_NOAXIS,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    font=PLOTLY_FONT,
-                    title=dict(text="Weight % · color = Gain/Loss",
-                               font=dict(size=11, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
-                               x=0, xanchor='left'),
-                    height=CHART_HEIGHT_MD,
-                )
-                fig_tree.update_coloraxes(showscale=False)
-                st.plotly_chart(fig_tree, width="stretch")
+                render_figure('weight_distribution', _weight_treemap_figure,
+                              df[['SYMBOL', 'WT', 'GAIN %']])
 
             with col_lorenz:
                 render_section_header("Concentration Curve", icon="activity", accent="violet")
-                sorted_weights = np.sort(df['WT'].values)[::-1]
-                cum_weights = np.cumsum(sorted_weights)
-                n = len(sorted_weights)
-
-                fig_lorenz = go.Figure()
-                fig_lorenz.add_trace(go.Scatter(
-                    x=list(range(n + 1)),
-                    y=[0] + list(np.linspace(0, 100, n)),
-                    mode='lines',
-                    name='Equal Weight',
-                    line=dict(color=CHART_INK_SUBTLE, dash='dash', width=1),
-                ))
-                fig_lorenz.add_trace(go.Scatter(
-                    x=list(range(n + 1)),
-                    y=[0] + list(cum_weights),
-                    mode='lines+markers',
-                    name='Portfolio',
-                    line=dict(color=CHART_AMBER, width=2),
-                    marker=dict(size=4),
-                    fill='tonexty',
-                    fillcolor=CHART_AMBER_GLOW,
-                ))
-                fig_lorenz.add_hline(y=50, line_dash="dot", line_color=CHART_EMERALD,
-                                    annotation_text="50%", annotation_position="right")
-                fig_lorenz.add_hline(y=80, line_dash="dot", line_color=CHART_CYAN,
-                                    annotation_text="80%", annotation_position="right")
-                _apply_obsidian(
-                    fig_lorenz, height=CHART_HEIGHT_MD, show_legend=True,
-                    margin=CHART_MARGIN,
-                    title="Lorenz Curve · cumulative %",
-                    x_title='# Holdings (ranked)',
-                    y_title='Cumulative Weight (%)',
-                )
-                fig_lorenz.update_yaxes(range=[0, 105])
-                st.plotly_chart(fig_lorenz, width="stretch")
+                render_figure('concentration', _lorenz_figure, df['WT'].to_numpy())
 
 
             render_section_header("Risk & Return Contribution", icon="shield", accent="rose")
 
-            contrib_df = df[['SYMBOL', 'ASSET NAME', 'WT', 'GAIN %', 'WEIGHTED RETURN %']].copy()
-            contrib_df['Weight'] = contrib_df['WT'].apply(lambda x: f"{x:.2f}%")
-            contrib_df['Return'] = contrib_df['GAIN %'].apply(lambda x: f"{x:+.2f}%")
-            contrib_df['Contribution'] = contrib_df['WEIGHTED RETURN %'].apply(lambda x: f"{x:+.3f}%")
-            contrib_df['Risk Weight'] = (contrib_df['WT'] ** 2) / hhi * 100
-            contrib_df['Risk Contrib'] = contrib_df['Risk Weight'].apply(lambda x: f"{x:.1f}%")
-            contrib_df = contrib_df.sort_values('WEIGHTED RETURN %', ascending=False)
-
-            fig_contrib = make_subplots(rows=1, cols=2, shared_yaxes=True,
-                                        subplot_titles=('Return Contribution', 'Risk Contribution'),
-                                        horizontal_spacing=0.02)
-
-            colors_ret = [CHART_EMERALD if x >= 0 else CHART_ROSE for x in contrib_df['WEIGHTED RETURN %']]
-
-            fig_contrib.add_trace(go.Bar(
-                y=contrib_df['SYMBOL'],
-                x=contrib_df['WEIGHTED RETURN %'],
-                orientation='h',
-                marker_color=colors_ret,
-                text=[f"{x:.2f}%" for x in contrib_df['WEIGHTED RETURN %']],
-                textposition='auto',
-                textfont=dict(size=9, color=CHART_INK),
-                showlegend=False,
-            ), row=1, col=1)
-
-            fig_contrib.add_trace(go.Bar(
-                y=contrib_df['SYMBOL'],
-                x=contrib_df['Risk Weight'],
-                orientation='h',
-                marker_color=CHART_AMBER,
-                text=[f"{x:.1f}%" for x in contrib_df['Risk Weight']],
-                textposition='auto',
-                textfont=dict(size=9, color=CHART_INK),
-                showlegend=False,
-            ), row=1, col=2)
-
-            fig_contrib.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=PLOTLY_FONT,
-                margin=CHART_MARGIN_BAR,
-                height=max(CHART_HEIGHT_MD, n_holdings * 22 + 80),
-                showlegend=False,
-                hoverlabel=PLOTLY_HOVERLABEL,
-            )
-
-            fig_contrib.update_xaxes(gridcolor=CHART_GRID, zeroline=False,
-                                     tickfont=dict(size=9, family="JetBrains Mono, monospace",
-                                                   color=CHART_INK_SUBTLE))
-            fig_contrib.update_yaxes(gridcolor=CHART_GRID, zeroline=False,
-                                     tickfont=dict(size=9, family="JetBrains Mono, monospace",
-                                                   color=CHART_INK_SUBTLE))
-
-            st.plotly_chart(fig_contrib, width="stretch")
+            render_figure('risk_contribution', _risk_contribution_figure,
+                          df[['SYMBOL', 'WT', 'WEIGHTED RETURN %']], hhi)
             
             # Summary Statistics in expander
             with st.expander("Detailed Statistics", expanded=False):
@@ -1476,7 +1570,7 @@ def main() -> None:
     # ANALYSIS MODE
     # =========================================================================
     if view_mode == "Analysis Mode":
-        render_analysis_mode(df, metrics, anchor_date)
+        render_analysis_mode(df, metrics)
     
     # ── Footer ──────────────────────────────────────────────────────────────
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
@@ -1501,393 +1595,191 @@ def main() -> None:
 # ANALYSIS MODE - INSTITUTIONAL GRADE ANALYTICS
 # =========================================================================
 
-BENCHMARK_TICKER = '^NSEI'  # NIFTY 50 only
-BENCHMARK_NAME = 'NIFTY 50'
-
-TIMEFRAMES = {
-    '1W': 7,
-    '1M': 30,
-    '3M': 90,
-    '6M': 180,
-    'YTD': None,  # Special handling
-    '1Y': 365,
-    '2Y': 730,
-    '5Y': 1825,
-    'MAX': 3650
-}
-
-@st.cache_data(ttl=300, show_spinner=False)
 def fetch_analysis_data(
     symbols: list[str], days_back: int
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Fetch historical data for portfolio and NIFTY 50 benchmark.
-    Portfolio data is aligned to NIFTY 50 trading dates to avoid
-    holiday/timezone edge cases.
+    """Historical closes for the portfolio and NIFTY 50 (core.history),
+    aligned to session dates to avoid holiday/timezone edge cases.
 
-    Diagnostics go to the terminal log; no Streamlit spinner/banners here.
+    Bars run through the last *settled* session (history_end), so the result
+    is keyed by that date and only changes when a session settles; settled
+    bars never expire.
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-
-    log.section("SWING · ANALYSIS HISTORY")
-    log.step(f"PRIMARY · yfinance · {len(symbols)} holding(s) + benchmark "
-             f"({start_date:%d-%b-%Y} → {end_date:%d-%b-%Y})")
-    t0 = time.perf_counter()
+    return _read_through(_cached_analysis_data, symbols, days_back, history_end())
+
+
+@cache_layer('history')
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_analysis_data(
+    symbols: list[str], days_back: int, end: date
+) -> tuple[float, tuple[pd.DataFrame, pd.DataFrame]]:
+    result = load_analysis_data(symbols, days_back, end)
+    ttl = history_ttl() if not result[0].empty else min(history_ttl(), INTRADAY_TTL_S)
+    return time.time() + ttl, result
+
+
+def build_metrics_cube(
+    symbols: list[str],
+    quantities: dict[str, float],
+    fetch_days: int,
+    windows: dict[str, date],
+) -> pd.DataFrame:
+    """Metrics for every timeframe window from ONE history fetch.
+
+    The widest window is fetched once, the portfolio value series is built
+    once, and all windows are scored in a single compute_metrics_batch pass.
+    Rows are window labels (TIMEFRAMES keys, plus CUSTOM), columns are the
+    scalar compute_metrics keys — a timeframe switch is a row lookup. Cached
+    alongside the history it is built from (until the next session settles).
+    """
+    return _read_through(
+        _cached_metrics_cube, symbols, quantities, fetch_days, windows, history_end()
+    )
 
-    try:
-        # First fetch NIFTY 50 to get valid trading dates
-        benchmark_data = yf.download(
-            tickers=BENCHMARK_TICKER,
-            start=start_date.strftime('%Y-%m-%d'),
-            end=end_date.strftime('%Y-%m-%d'),
-            interval='1d',
-            progress=False,
-            auto_adjust=False
-        )
-        
-        if benchmark_data.empty:
-            log.error("Benchmark (NIFTY 50) returned empty data")
-            log.line("═", 70)
-            return pd.DataFrame(), pd.DataFrame()
-
-        # Get NIFTY 50 close prices
-        benchmark_close = benchmark_data['Close']
-        if isinstance(benchmark_close, pd.DataFrame):
-            benchmark_close = benchmark_close.iloc[:, 0]
-        benchmark_df = benchmark_close.to_frame(name=BENCHMARK_NAME)
-        
-        # Get valid trading dates from NIFTY 50
-        valid_dates = benchmark_df.index
-        
-        # Now fetch portfolio holdings (.NS fallback; '.'-qualified symbols used as-is)
-        ticker_map = {_to_yf_ticker(s): s for s in symbols}
-        tickers = list(ticker_map.keys())
-
-        portfolio_data = yf.download(
-            tickers=tickers,
-            start=start_date.strftime('%Y-%m-%d'),
-            end=end_date.strftime('%Y-%m-%d'),
-            interval='1d',
-            progress=False,
-            threads=True,
-            auto_adjust=False
-        )
-        
-        if portfolio_data.empty:
-            log.warning(f"Benchmark OK ({len(benchmark_df)} rows) but portfolio data empty")
-            log.line("═", 70)
-            return pd.DataFrame(), benchmark_df
-
-        # Get close prices
-        if len(tickers) == 1:
-            portfolio_close = portfolio_data['Close'].to_frame()
-            portfolio_close.columns = [symbols[0]]
-        else:
-            portfolio_close = portfolio_data['Close']
-            portfolio_close.columns = [ticker_map.get(c, c) for c in portfolio_close.columns]
-        
-        # Align portfolio data to NIFTY 50 dates only
-        portfolio_aligned = portfolio_close.reindex(valid_dates)
-        
-        # Forward fill any missing values (in case some stocks didn't trade)
-        portfolio_aligned = portfolio_aligned.ffill()
 
-        dt = time.perf_counter() - t0
-        log.success(
-            f"History loaded · {len(portfolio_aligned.columns)} holdings × "
-            f"{len(portfolio_aligned)} rows · benchmark {len(benchmark_df)} rows in {dt:.1f}s"
+@cache_layer('history')
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_metrics_cube(
+    symbols: list[str],
+    quantities: dict[str, float],
+    fetch_days: int,
+    windows: dict[str, date],
+    end: date,
+) -> tuple[float, pd.DataFrame]:
+    # ``end`` (the history_end the cube was built for) only keys the entry.
+    portfolio_prices, benchmark_prices = fetch_analysis_data(symbols, fetch_days)
+    cube = score_windows(portfolio_prices, benchmark_prices, quantities, windows)
+    ttl = history_ttl() if not cube.empty else min(history_ttl(), INTRADAY_TTL_S)
+    return time.time() + ttl, cube
+
+
+def _select_timeframe(tf: str) -> None:
+    st.session_state.tf_selected = tf
+
+
+def _toast_on_change(key: str, value: Any, message: str | None) -> None:
+    """Toast ``message`` only when ``value`` differs from the last one seen under
+    ``key`` — fragment reruns from unrelated widgets in the panel stay quiet."""
+    if st.session_state.get(key) != value:
+        st.session_state[key] = value
+        if message:
+            st.toast(message)
+
+
+def _anchor_controls() -> date | None:
+    """Anchor-date toggle and picker; the chosen start date, or None."""
+    col_toggle, col_date, col_note = st.columns([1, 1, 2])
+    with col_toggle:
+        use_anchor = st.toggle("Enable Anchor Date", value=False, key="use_anchor_date",
+                               help="Set a custom start date for Analysis Mode metrics")
+    if not use_anchor:
+        return None
+    with col_date:
+        anchor_date = st.date_input(
+            "Investment Start Date",
+            value=datetime.now() - timedelta(days=365),
+            max_value=datetime.now().date(),
+            min_value=datetime(2010, 1, 1).date(),
+            key="anchor_date",
+            label_visibility="collapsed",
         )
-        log.line("═", 70)
-        return portfolio_aligned, benchmark_df
-
-    except Exception as e:
-        log.error(f"Analysis history fetch failed: {type(e).__name__}: {e}")
-        log.line("═", 70)
-        return pd.DataFrame(), pd.DataFrame()
+    with col_note:
+        st.caption(f"Metrics calculated from {anchor_date.strftime('%b %d, %Y')}")
+    return anchor_date
 
 
-def compute_metrics(
-    returns: pd.Series,
-    benchmark_returns: pd.Series | None = None,
-    rf_rate: float = 0.065,
-) -> dict[str, Any]:
-    """Compute institutional-grade performance metrics.
+@st.fragment
+def render_analysis_mode(df: pd.DataFrame, metrics: dict[str, float]) -> None:
+    """Render the Obsidian Quant analytics terminal.
 
-    Handles edge cases:
-    - Short periods (< 5 days)
-    - Negative total returns
-    - Zero volatility
-    - Missing benchmark data
+    Runs as a fragment: timeframe clicks and anchor-date edits rerun only
+    this panel, not main() (file load, price metrics, KPI cards, sidebar).
     """
-    m = {}
-    
-    if returns.empty or len(returns) < 2:
-        # Return empty dict with safe defaults
-        return {
-            'total_return': 0, 'cagr': 0, 'volatility': 0, 'daily_vol': 0,
-            'max_drawdown': 0, 'drawdown_series': pd.Series(),
-            'sharpe': 0, 'sortino': 0, 'calmar': 0,
-            'var_95': 0, 'var_99': 0, 'cvar_95': 0,
-            'win_rate': 0, 'win_days': 0, 'lose_days': 0,
-            'best_day': 0, 'worst_day': 0,
-            'skewness': 0, 'kurtosis': 0, 'profit_factor': 0,
-            'beta': 1, 'alpha': 0, 'correlation': 0, 'r_squared': 0,
-            'tracking_error': 0, 'info_ratio': 0, 'treynor': 0,
-            'up_capture': 100, 'down_capture': 100, 'benchmark_return': 0
-        }
-    
-    # Period metrics
-    total_ret = (1 + returns).prod() - 1
-    n_days = len(returns)
-    
-    # Annualization factor - cap at 1 for very short periods
-    ann_factor = min(252 / n_days, 1) if n_days < 252 else 252 / n_days
-    
-    m['total_return'] = total_ret * 100
-    
-    # CAGR calculation - handle negative returns properly
-    if total_ret > -1:  # Can only compute if not total loss
-        # For short periods, just annualize the total return
-        if n_days < 20:
-            m['cagr'] = total_ret * (252 / n_days) * 100  # Simple annualization
-        else:
-            m['cagr'] = ((1 + total_ret) ** ann_factor - 1) * 100
-    else:
-        m['cagr'] = -100  # Total loss
-    
-    # Volatility
-    daily_vol = returns.std()
-    m['volatility'] = daily_vol * np.sqrt(252) * 100 if daily_vol > 0 else 0
-    m['daily_vol'] = daily_vol * 100
-    
-    # Drawdown
-    cum = (1 + returns).cumprod()
-    peak = cum.expanding().max()
-    dd = (cum - peak) / peak
-    m['max_drawdown'] = dd.min() * 100
-    m['drawdown_series'] = dd * 100
-    
-    # Risk-adjusted ratios
-    rf_daily = rf_rate / 252
-    excess = returns - rf_daily
-    excess_mean = excess.mean()
-    
-    # Sharpe - handle zero/near-zero volatility
-    if daily_vol > 1e-8:
-        m['sharpe'] = (excess_mean / daily_vol) * np.sqrt(252)
-    else:
-        m['sharpe'] = 0 if abs(excess_mean) < 1e-8 else (np.sign(excess_mean) * 10)  # Cap at ±10
-    
-    # Sortino - use downside deviation
-    downside = returns[returns < 0]
-    if len(downside) > 0:
-        downside_vol = downside.std()
-        if downside_vol > 1e-8:
-            m['sortino'] = (excess_mean / downside_vol) * np.sqrt(252)
-        else:
-            m['sortino'] = m['sharpe']  # Fall back to Sharpe
-    else:
-        # No negative days - exceptional performance
-        m['sortino'] = m['sharpe'] * 1.5 if m['sharpe'] > 0 else 0
-    
-    # Calmar - handle zero drawdown
-    if abs(m['max_drawdown']) > 0.01:  # At least 0.01% drawdown
-        m['calmar'] = m['cagr'] / abs(m['max_drawdown'])
-    else:
-        m['calmar'] = m['cagr'] if m['cagr'] > 0 else 0
-    
-    # VaR and CVaR (always negative or zero for losses)
-    m['var_95'] = np.percentile(returns, 5) * 100
-    m['var_99'] = np.percentile(returns, 1) * 100
-    var_threshold = np.percentile(returns, 5)
-    tail = returns[returns <= var_threshold]
-    m['cvar_95'] = tail.mean() * 100 if len(tail) > 0 else m['var_95']
-    
-    # Win rate
-    m['win_rate'] = (returns > 0).mean() * 100
-    m['win_days'] = int((returns > 0).sum())
-    m['lose_days'] = int((returns < 0).sum())
-    
-    # Best/Worst
-    m['best_day'] = returns.max() * 100
-    m['worst_day'] = returns.min() * 100
-    
-    # Skew and Kurtosis - need enough data
-    if n_days >= 5:
-        m['skewness'] = returns.skew()
-        m['kurtosis'] = returns.kurtosis()
-    else:
-        m['skewness'] = 0
-        m['kurtosis'] = 0
-    
-    # Profit Factor
-    gains = returns[returns > 0].sum()
-    losses = abs(returns[returns < 0].sum())
-    if losses > 1e-8:
-        m['profit_factor'] = gains / losses
-    elif gains > 0:
-        m['profit_factor'] = 10  # Cap at 10 for display
-    else:
-        m['profit_factor'] = 0
-    
-    # Initialize benchmark defaults
-    m['beta'] = 1
-    m['alpha'] = 0
-    m['correlation'] = 0
-    m['r_squared'] = 0
-    m['tracking_error'] = 0
-    m['info_ratio'] = 0
-    m['treynor'] = 0
-    m['up_capture'] = 100
-    m['down_capture'] = 100
-    m['benchmark_return'] = 0
-    
-    # Benchmark-relative metrics
-    if benchmark_returns is not None and len(benchmark_returns) > 5:
-        aligned = pd.concat([returns, benchmark_returns], axis=1).dropna()
-        if len(aligned) > 5:
-            p_ret = aligned.iloc[:, 0]
-            b_ret = aligned.iloc[:, 1]
-            
-            # Beta
-            var_b = b_ret.var()
-            if var_b > 1e-10:
-                cov = np.cov(p_ret, b_ret)[0, 1]
-                m['beta'] = cov / var_b
-            else:
-                m['beta'] = 1
-            
-            # Benchmark return
-            b_total = (1 + b_ret).prod() - 1
-            m['benchmark_return'] = b_total * 100
-            
-            # Alpha (annualized) - CAPM formula
-            aligned_days = len(aligned)
-            aligned_ann = min(252 / aligned_days, 1) if aligned_days < 252 else 252 / aligned_days
-            
-            if b_total > -1:
-                b_cagr = ((1 + b_total) ** aligned_ann - 1) if aligned_days >= 20 else b_total * (252 / aligned_days)
-            else:
-                b_cagr = -1
-            
-            p_cagr = m['cagr'] / 100
-            expected_return = rf_rate + m['beta'] * (b_cagr - rf_rate)
-            m['alpha'] = (p_cagr - expected_return) * 100
-            
-            # Correlation and R-squared
-            corr = p_ret.corr(b_ret)
-            m['correlation'] = corr if not np.isnan(corr) else 0
-            m['r_squared'] = m['correlation'] ** 2
-            
-            # Tracking Error
-            tracking_diff = p_ret - b_ret
-            tracking = tracking_diff.std() * np.sqrt(252)
-            m['tracking_error'] = tracking * 100
-            
-            # Information Ratio
-            if tracking > 1e-8:
-                excess_ret = p_cagr - b_cagr
-                m['info_ratio'] = excess_ret / tracking
-            else:
-                m['info_ratio'] = 0
-            
-            # Treynor Ratio
-            if abs(m['beta']) > 0.01:
-                m['treynor'] = (p_cagr - rf_rate) / m['beta']
-            else:
-                m['treynor'] = 0
-            
-            # Up/Down Capture
-            up_mask = b_ret > 0
-            down_mask = b_ret < 0
-            
-            if up_mask.sum() > 0:
-                up_p = (1 + p_ret[up_mask]).prod()
-                up_b = (1 + b_ret[up_mask]).prod()
-                if up_b > 0:
-                    m['up_capture'] = (up_p / up_b) * 100
-            
-            if down_mask.sum() > 0:
-                down_p = (1 + p_ret[down_mask]).prod()
-                down_b = (1 + b_ret[down_mask]).prod()
-                if down_b > 0 and down_b != 1:
-                    m['down_capture'] = (down_p / down_b) * 100
-    
-    return m
-
-
-def render_analysis_mode(
-    df: pd.DataFrame, metrics: dict[str, float], anchor_date: datetime | None = None
-) -> None:
-    """Render the Obsidian Quant analytics terminal."""
-
+    header_slot = st.container()
+    tf_row = st.container()
+    anchor_date = _anchor_controls()
 
     # ── Header & timeframe selector ─────────────────────────────────────────
     header_desc = "Institutional-Grade Performance Analysis"
     if anchor_date:
         header_desc += f" · Anchor: {anchor_date.strftime('%b %d, %Y')}"
-    render_section_header(
-        "Portfolio Analytics Terminal",
-        header_desc,
-        icon="cpu",
-        accent="cyan",
-    )
+    with header_slot:
+        render_section_header(
+            "Portfolio Analytics Terminal",
+            header_desc,
+            icon="cpu",
+            accent="cyan",
+        )
     
     # Initialize session state
     if 'tf_selected' not in st.session_state:
         st.session_state.tf_selected = '1Y'
     
+    _toast_on_change(
+        '_swing_toast_anchor', anchor_date,
+        f"Anchor date active · metrics from {anchor_date.strftime('%b %d, %Y')}"
+        if anchor_date else None,
+    )
+
     # Timeframe buttons row (disabled when anchor date is active)
-    if anchor_date:
-        st.toast(f"Anchor date active · metrics from {anchor_date.strftime('%b %d, %Y')}")
-        days_back = (datetime.now().date() - anchor_date).days + 1
-        selected_tf = "CUSTOM"
-        
-        # Still show timeframe buttons but disabled style
-        tf_cols = st.columns(len(TIMEFRAMES))
-        for i, tf in enumerate(TIMEFRAMES.keys()):
-            with tf_cols[i]:
-                st.button(tf, key=f"tf_{tf}_disabled", width="stretch", disabled=True)
-    else:
-        tf_cols = st.columns(len(TIMEFRAMES))
-        for i, tf in enumerate(TIMEFRAMES.keys()):
-            with tf_cols[i]:
-                btn_type = "primary" if st.session_state.tf_selected == tf else "secondary"
-                if st.button(tf, key=f"tf_{tf}", width="stretch", type=btn_type):
-                    st.session_state.tf_selected = tf
-                    st.rerun()
-        
-        # Calculate days for selected timeframe
-        selected_tf = st.session_state.tf_selected
-        if selected_tf == 'YTD':
-            today = datetime.now()
-            days_back = (today - datetime(today.year, 1, 1)).days + 1
+    with tf_row:
+        if anchor_date:
+            selected_tf = "CUSTOM"
+
+            # Still show timeframe buttons but disabled style
+            tf_cols = st.columns(len(TIMEFRAMES))
+            for i, tf in enumerate(TIMEFRAMES.keys()):
+                with tf_cols[i]:
+                    st.button(tf, key=f"tf_{tf}_disabled", width="stretch", disabled=True)
         else:
-            days_back = TIMEFRAMES[selected_tf]
+            # The click callback updates the selection before the fragment
+            # reruns, so one (panel-only) run redraws everything.
+            tf_cols = st.columns(len(TIMEFRAMES))
+            for i, tf in enumerate(TIMEFRAMES.keys()):
+                with tf_cols[i]:
+                    btn_type = "primary" if st.session_state.tf_selected == tf else "secondary"
+                    st.button(tf, key=f"tf_{tf}", width="stretch", type=btn_type,
+                              on_click=_select_timeframe, args=(tf,))
+
+            selected_tf = st.session_state.tf_selected
     
     # =========================================================================
     # FETCH DATA (aligned to NIFTY 50 dates)
+    #
+    # The widest window (MAX, or an older anchor) is fetched once; every
+    # timeframe is a slice of it and its metrics come precomputed from the
+    # cube, so switching timeframes never refetches or rescores.
     # =========================================================================
     
     symbols = df['SYMBOL'].tolist()
     quantities = df.set_index('SYMBOL')['QUANTITY'].to_dict()
+    windows = timeframe_windows(anchor_date)
+    window_start = windows[selected_tf]
+    fetch_days = max(
+        days_back('MAX'),
+        (datetime.now().date() - anchor_date).days + 1 if anchor_date else 0,
+    )
 
-    # Themed progress card — shown only when the data window actually changes
-    # (new timeframe/anchor = real fetch). Cosmetic reruns hit cache and stay
-    # instant, so the bar is skipped. The native st.spinner is intentionally
-    # not used (UI/UX cohesion).
-    _an_key = (tuple(symbols), days_back, str(anchor_date))
+    # Themed progress card — shown only when the fetched history actually
+    # changes (new holdings/anchor = real fetch). Timeframe switches and
+    # cosmetic reruns hit cache and stay instant, so the bar is skipped. The
+    # native st.spinner is intentionally not used (UI/UX cohesion).
+    _an_key = (tuple(symbols), fetch_days)
     _show_prog = st.session_state.get('_swing_an_key') != _an_key
     _prog_slot = st.empty() if _show_prog else None
     if _prog_slot is not None:
         progress_bar(_prog_slot, 30, "Fetching analysis history",
                      f"yfinance · {len(symbols)} holdings + NIFTY 50")
 
-    portfolio_prices, benchmark_prices = fetch_analysis_data(symbols, days_back)
+    portfolio_prices, benchmark_prices = fetch_analysis_data(symbols, fetch_days)
+    if _prog_slot is not None:
+        progress_bar(_prog_slot, 70, "Scoring timeframes",
+                     f"{len(windows)} windows · one batched pass")
+    cube = build_metrics_cube(symbols, quantities, fetch_days, windows)
 
     if _prog_slot is not None:
         progress_bar(_prog_slot, 100, "History Ready",
-                     f"{selected_tf} · {len(portfolio_prices)} trading days")
+                     f"{len(portfolio_prices)} trading days · {len(windows)} timeframes")
         _prog_slot.empty()
         st.session_state['_swing_an_key'] = _an_key
     
@@ -1895,80 +1787,51 @@ def render_analysis_mode(
         st.error("Unable to fetch historical data. Please try again.")
         return
     
-    # Apply anchor date filter if set
-    if anchor_date:
-        anchor_datetime = pd.Timestamp(anchor_date)
-        portfolio_prices = portfolio_prices[portfolio_prices.index >= anchor_datetime]
-        benchmark_prices = benchmark_prices[benchmark_prices.index >= anchor_datetime]
-        
-        if portfolio_prices.empty:
+    # Slice the selected window out of the full history
+    window_ts = pd.Timestamp(window_start)
+    portfolio_prices = portfolio_prices[portfolio_prices.index >= window_ts]
+    benchmark_prices = benchmark_prices[benchmark_prices.index >= window_ts]
+
+    if portfolio_prices.empty:
+        if anchor_date:
             st.warning(f"No data available from {anchor_date.strftime('%b %d, %Y')}. Try an earlier anchor date.")
-            return
+        else:
+            st.warning(f"No data available for {selected_tf}.")
+        return
     
     # Build portfolio value series (already aligned to NIFTY 50 dates)
-    port_value = pd.DataFrame(index=portfolio_prices.index)
-    for sym in portfolio_prices.columns:
-        if sym in quantities:
-            port_value[sym] = portfolio_prices[sym] * quantities[sym]
-    port_value['Portfolio'] = port_value.sum(axis=1)
-    port_value = port_value['Portfolio'].dropna()
+    port_value = portfolio_value(portfolio_prices, quantities)
     
     # Calculate returns
     port_returns = port_value.pct_change(fill_method=None).dropna()
     
     # Get benchmark returns
-    bench_returns = None
-    if not benchmark_prices.empty and BENCHMARK_NAME in benchmark_prices.columns:
-        bench_returns = benchmark_prices[BENCHMARK_NAME].pct_change(fill_method=None).dropna()
+    bench_returns = benchmark_returns(benchmark_prices)
     
-    # Compute metrics
-    m = compute_metrics(port_returns, bench_returns)
+    # Metrics: precomputed row of the cube; only the drawdown curve (a chart
+    # input, not a scalar) is derived from the slice.
+    m = dict(cube.loc[selected_tf]) if selected_tf in cube.index else compute_metrics(
+        port_returns, bench_returns)
+    m['drawdown_series'] = drawdown_series(port_returns)
     
     # =========================================================================
     # MAIN COMPARISON CHART
     # =========================================================================
     
     
-    port_norm = (port_value / port_value.iloc[0]) * 100
-
-    fig = go.Figure()
-    port_ret_display = m.get('total_return', 0)
-    fig.add_trace(go.Scatter(
-        x=port_norm.index,
-        y=port_norm.values,
-        mode='lines',
-        name=f'Portfolio ({port_ret_display:+.2f}%)',
-        line=dict(color=CHART_AMBER, width=2.5),
-        hovertemplate='%{x|%b %d, %Y}<br>Portfolio: %{y:.2f}<extra></extra>',
-    ))
-
+    bench_series = None
     if not benchmark_prices.empty and BENCHMARK_NAME in benchmark_prices.columns:
         bench_series = benchmark_prices[BENCHMARK_NAME].dropna()
-        if len(bench_series) > 0:
-            bench_norm = (bench_series / bench_series.iloc[0]) * 100
-            bench_ret = ((bench_series.iloc[-1] / bench_series.iloc[0]) - 1) * 100
-            fig.add_trace(go.Scatter(
-                x=bench_norm.index,
-                y=bench_norm.values,
-                mode='lines',
-                name=f'{BENCHMARK_NAME} ({bench_ret:+.2f}%)',
-                line=dict(color=CHART_CYAN, width=2, dash='dot'),
-                hovertemplate=f'%{{x|%b %d, %Y}}<br>{BENCHMARK_NAME}: %{{y:.2f}}<extra></extra>',
-            ))
 
-    _apply_obsidian(
-        fig, height=CHART_HEIGHT_LG, show_legend=True,
-        margin=CHART_MARGIN_NOTITLE,
+    render_figure(
+        'performance', _performance_figure,
+        port_value, bench_series, m.get('total_return', 0),
+        config={
+            'displayModeBar': True,
+            'displaylogo': False,
+            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+        },
     )
-    fig.update_yaxes(side='right')
-    fig.update_layout(hovermode='closest')
-    fig.update_xaxes(rangeslider=dict(visible=False), rangeselector=dict(visible=False))
-
-    st.plotly_chart(fig, width="stretch", config={
-        'displayModeBar': True,
-        'displaylogo': False,
-        'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-    })
 
     # ── Returns & Risk-Adjusted Performance ─────────────────────────────────
     render_section_header("Returns & Risk-Adjusted Performance", icon="zap", accent="emerald")
@@ -2076,62 +1939,12 @@ def render_analysis_mode(
         render_section_header("Drawdown Analysis", icon="activity", accent="rose")
         dd_series = m.get('drawdown_series', pd.Series())
         if len(dd_series) > 0:
-            fig_dd = go.Figure()
-            fig_dd.add_trace(go.Scatter(
-                x=dd_series.index,
-                y=dd_series.values,
-                mode='lines',
-                fill='tozeroy',
-                line=dict(color=CHART_ROSE, width=1),
-                fillcolor='rgba(232, 85, 90, 0.25)',
-                hovertemplate='%{x|%b %d, %Y}<br>Drawdown: %{y:.2f}%<extra></extra>',
-            ))
-            fig_dd.add_hline(
-                y=m.get('max_drawdown', 0),
-                line_dash="dash",
-                line_color=CHART_AMBER,
-                annotation_text=f"Max: {m.get('max_drawdown', 0):.1f}%",
-                annotation_position="right",
-            )
-            _apply_obsidian(
-                fig_dd, height=CHART_HEIGHT_MD, show_legend=False,
-                margin=CHART_MARGIN,
-                title="Underwater Equity Curve",
-            )
-            st.plotly_chart(fig_dd, width="stretch")
+            render_figure('drawdown', _drawdown_figure, dd_series, m.get('max_drawdown', 0))
 
     with col_dist:
         render_section_header("Returns Distribution", icon="bar-chart", accent="emerald")
-        fig_hist = go.Figure()
-        fig_hist.add_trace(go.Histogram(
-            x=port_returns * 100,
-            nbinsx=40,
-            marker_color=CHART_AMBER,
-            opacity=0.78,
-            hovertemplate='Return: %{x:.2f}%<br>Count: %{y}<extra></extra>',
-        ))
-        fig_hist.add_vline(x=0, line_dash="dash", line_color=CHART_INK_SUBTLE, line_width=1)
-        fig_hist.add_vline(
-            x=port_returns.mean() * 100,
-            line_dash="dot",
-            line_color=CHART_EMERALD,
-            annotation_text=f"μ: {port_returns.mean()*100:.2f}%",
-            annotation_position="top",
-        )
-        fig_hist.add_vline(
-            x=m.get('var_95', 0),
-            line_dash="dash",
-            line_color=CHART_ROSE,
-            annotation_text=f"VaR: {m.get('var_95', 0):.1f}%",
-            annotation_position="bottom left",
-        )
-        _apply_obsidian(
-            fig_hist, height=CHART_HEIGHT_MD, show_legend=False,
-            margin=CHART_MARGIN,
-            title="Daily Returns Histogram",
-            x_title='Daily Return (%)',
-        )
-        st.plotly_chart(fig_hist, width="stretch")
+        render_figure('returns_distribution', _returns_histogram_figure,
+                      port_returns, m.get('var_95', 0))
     
     # ── Rolling Analytics (dynamic window based on timeframe) ───────────────
     data_length = len(port_returns)
@@ -2157,182 +1970,40 @@ def render_analysis_mode(
             roll_sharpe = roll_sharpe.dropna()
 
             if len(roll_sharpe) > 0:
-                fig_rs = go.Figure()
-                fig_rs.add_trace(go.Scatter(
-                    x=roll_sharpe.index,
-                    y=roll_sharpe.values,
-                    mode='lines',
-                    line=dict(color=CHART_AMBER, width=1.5),
-                    hovertemplate='%{x|%b %d, %Y}<br>Sharpe: %{y:.2f}<extra></extra>',
-                ))
-                fig_rs.add_hline(y=1, line_dash="dash", line_color=CHART_EMERALD,
-                                 annotation_text="Target", annotation_position="right")
-                fig_rs.add_hline(y=0, line_dash="dash", line_color=CHART_INK_SUBTLE)
-                _apply_obsidian(
-                    fig_rs, height=CHART_HEIGHT_SM, show_legend=False,
-                    margin=CHART_MARGIN,
-                    title="Rolling Sharpe Ratio",
-                )
-                fig_rs.update_xaxes(tickformat='%b %Y')
-                st.plotly_chart(fig_rs, width="stretch")
+                render_figure('rolling_sharpe', _rolling_sharpe_figure, roll_sharpe)
 
         with col_rb:
             if bench_returns is not None and len(bench_returns) > rolling_window:
-                aligned = pd.concat([port_returns, bench_returns], axis=1).dropna()
-                aligned.columns = ['Port', 'Bench']
-
-                if len(aligned) > rolling_window:
-                    roll_betas = []
-                    roll_dates = []
-                    for i in range(rolling_window, len(aligned)):
-                        w = aligned.iloc[i-rolling_window:i]
-                        cov = np.cov(w['Port'], w['Bench'])[0, 1]
-                        var = w['Bench'].var()
-                        roll_betas.append(cov / var if var > 0 else 1)
-                        roll_dates.append(aligned.index[i])
-
-                    if len(roll_betas) > 0:
-                        fig_rb = go.Figure()
-                        fig_rb.add_trace(go.Scatter(
-                            x=roll_dates,
-                            y=roll_betas,
-                            mode='lines',
-                            line=dict(color=CHART_CYAN, width=1.5),
-                            hovertemplate='%{x|%b %d, %Y}<br>Beta: %{y:.2f}<extra></extra>',
-                        ))
-                        fig_rb.add_hline(y=1, line_dash="dash", line_color=CHART_INK_SUBTLE,
-                                         annotation_text="Market", annotation_position="right")
-                        _apply_obsidian(
-                            fig_rb, height=CHART_HEIGHT_SM, show_legend=False,
-                            margin=CHART_MARGIN,
-                            title=f"Rolling Beta vs {BENCHMARK_NAME}",
-                        )
-                        fig_rb.update_xaxes(tickformat='%b %Y')
-                        st.plotly_chart(fig_rb, width="stretch")
+                # One O(N) pass yields beta, correlation, alpha and TE for
+                # every window; the chart plots beta and surfaces the rest
+                # on hover.
+                roll = rolling_stats(port_returns, bench_returns, rolling_window)
+
+                if len(roll) > 0:
+                    render_figure('rolling_beta', _rolling_beta_figure, roll)
 
     # ── Monthly Returns Heatmap ─────────────────────────────────────────────
     render_section_header("Monthly Returns Heatmap", icon="grid", accent="emerald")
     
-    # Calculate monthly returns
-    monthly = port_value.resample('ME').last().pct_change(fill_method=None).dropna() * 100
-    
-    if len(monthly) > 1:
-        # Create a proper month-year structure
-        monthly_df = pd.DataFrame({
-            'Year': monthly.index.year,
-            'Month': monthly.index.month,
-            'Return': monthly.values
-        })
-        
-        # Get unique years
-        years = sorted(monthly_df['Year'].unique())
-        
-        # Create pivot with all 12 months as columns
-        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        # Build heatmap data manually to ensure proper structure
-        heatmap_data = []
-        year_labels = []
-        
-        for year in years:
-            year_data = monthly_df[monthly_df['Year'] == year]
-            row = []
-            for month in range(1, 13):
-                month_return = year_data[year_data['Month'] == month]['Return'].values
-                if len(month_return) > 0:
-                    row.append(month_return[0])
-                else:
-                    row.append(np.nan)
-            
-            # Calculate YTD for this year
-            year_start_val = port_value[port_value.index.year == year].iloc[0] if len(port_value[port_value.index.year == year]) > 0 else np.nan
-            year_end_val = port_value[port_value.index.year == year].iloc[-1] if len(port_value[port_value.index.year == year]) > 0 else np.nan
-            if pd.notna(year_start_val) and pd.notna(year_end_val) and year_start_val > 0:
-                ytd = ((year_end_val / year_start_val) - 1) * 100
-            else:
-                ytd = np.nan
-            row.append(ytd)
-            
-            heatmap_data.append(row)
-            year_labels.append(str(year))
-        
-        # Column labels
-        col_labels = month_names + ['YTD']
-        
-        fig_heat = go.Figure(data=go.Heatmap(
-            z=heatmap_data,
-            x=col_labels,
-            y=year_labels,
-            colorscale=[[0, CHART_ROSE], [0.5, "#0A0E17"], [1, CHART_EMERALD]],
-            zmid=0,
-            text=[[f"{v:.1f}%" if pd.notna(v) else "" for v in row] for row in heatmap_data],
-            texttemplate="%{text}",
-            textfont=dict(size=10, color=CHART_INK, family="JetBrains Mono, monospace"),
-            hovertemplate="Year: %{y}<br>%{x}: %{z:.2f}%<extra></extra>",
-            showscale=False,
-        ))
-
-        fig_heat.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=PLOTLY_FONT,
-            margin=CHART_MARGIN_HEATMAP,
-            title=dict(
-                text="Month-over-Month Returns (%)",
-                font=dict(size=12, color=CHART_INK_SUBTLE, family="JetBrains Mono, monospace"),
-                x=0, xanchor='left',
-            ),
-            xaxis=dict(side='top', tickangle=0, type='category', dtick=1,
-                       tickfont=dict(size=9, family="JetBrains Mono, monospace",
-                                     color=CHART_INK_SUBTLE)),
-            yaxis=dict(autorange='reversed', type='category', dtick=1,
-                       tickfont=dict(size=9, family="JetBrains Mono, monospace",
-                                     color=CHART_INK_SUBTLE)),
-            height=max(CHART_HEIGHT_SM, len(years) * 38 + 80),
-            hoverlabel=PLOTLY_HOVERLABEL,
-        )
-
-        st.plotly_chart(fig_heat, width="stretch")
+    heat_grid = monthly_returns_grid(port_value)
+    if not heat_grid.empty:
+        render_figure('monthly_heatmap', _monthly_heatmap_figure,
+                      heat_grid, "Month-over-Month Returns (%)")
 
     # ── Holding Attribution ─────────────────────────────────────────────────
     render_section_header("Holding Attribution", icon="link", accent="cyan")
 
-    attribution = []
-    for sym in symbols:
-        if sym in portfolio_prices.columns:
-            prices = portfolio_prices[sym].dropna()
-            if len(prices) > 1:
-                ret = (prices.iloc[-1] / prices.iloc[0] - 1) * 100
-                wt = df[df['SYMBOL'] == sym]['WT'].values[0] if 'WT' in df.columns else 0
-                contrib = ret * wt / 100
-                attribution.append({
-                    'Symbol': sym,
-                    'Return': ret,
-                    'Weight': wt,
-                    'Contribution': contrib,
-                })
-
-    if attribution:
-        attr_df = pd.DataFrame(attribution).sort_values('Contribution', ascending=True)
-        fig_attr = go.Figure()
-        colors = [CHART_EMERALD if x >= 0 else CHART_ROSE for x in attr_df['Contribution']]
-        fig_attr.add_trace(go.Bar(
-            y=attr_df['Symbol'],
-            x=attr_df['Contribution'],
-            orientation='h',
-            marker_color=colors,
-            text=[f"{x:+.2f}%" for x in attr_df['Contribution']],
-            textposition='auto',
-            textfont=dict(size=10, color=CHART_INK),
-            hovertemplate="<b>%{y}</b><br>Return: %{customdata[0]:.1f}%<br>Weight: %{customdata[1]:.1f}%<br>Contribution: %{x:.2f}%<extra></extra>",
-            customdata=attr_df[['Return', 'Weight']].values,
-        ))
-        _apply_obsidian(
-            fig_attr, height=max(CHART_HEIGHT_MD, len(attr_df) * 25 + 70), show_legend=False,
-            margin=CHART_MARGIN_BAR,
-            title="Contribution to Portfolio Return (%)",
-        )
-        st.plotly_chart(fig_attr, width="stretch")
+    weights = (
+        df.drop_duplicates('SYMBOL').set_index('SYMBOL')['WT']
+        if 'WT' in df.columns else pd.Series(dtype=float)
+    )
+    held_cols = [s for s in symbols if s in portfolio_prices.columns]
+    held_prices = portfolio_prices[held_cols]
+    held_values = value_matrix(held_prices, quantities)
+    attr_df = holding_attribution(held_prices, held_values, weights)
+
+    if not attr_df.empty:
+        render_figure('holding_attribution', _holding_attribution_figure, attr_df)
     
     # =========================================================================
     # STATISTICS TABLE
@@ -2375,7 +2046,8 @@ def render_analysis_mode(
             - Treynor: **{m.get('treynor', 0):.3f}**
             """)
     
-    st.toast(f"Analytics loaded for {selected_tf}")
+    _toast_on_change('_swing_toast_loaded', (selected_tf, anchor_date),
+                     f"Analytics loaded for {selected_tf}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Swing — Shape-preserving downsampling for long chart traces.
+
+A 10-year daily series is ~2,500 points per trace, several times more than a
+chart is pixels wide. ``downsample`` thins a series (or a frame, by one of its
+columns) to a point budget with Largest-Triangle-Three-Buckets (Steinarsson,
+2013): the points between the first and last are split into equal buckets,
+and each bucket keeps the point that spans the largest triangle with the
+previously kept point and the next bucket's average. Spikes and turns survive
+where a stride or a mean would flatten them. The global minimum and maximum
+are always kept, so a drawdown trough or an all-time high lands exactly where
+a reference line or annotation marks it.
+
+``wire_x`` / ``wire_y`` make what is left cheaper to send: midnight-only
+datetime indexes become 'YYYY-MM-DD' strings instead of full ISO timestamps,
+and floats go out as float32 (Plotly ships NumPy arrays as base64 typed
+arrays, so this halves their size; seven significant digits is far beyond
+what an axis or a hover label shows).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _positions(index: pd.Index) -> np.ndarray:
+    """Index → float x coordinates (datetimes in ns, else the values, else 0..n-1)."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float)
+    if pd.api.types.is_numeric_dtype(index):
+        return index.to_numpy(dtype=float)
+    return np.arange(len(index), dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Positions of the ``budget`` points LTTB keeps (all of them if n ≤ budget).
+
+    NaNs in ``y`` are never preferred over a finite point in the same bucket.
+    """
+    n = len(y)
+    if budget < 3 or n <= budget:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(y)
+
+    # budget - 2 buckets over the interior points 1 .. n-2.
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.add.reduceat(finite.astype(float), starts)
+    sum_x = np.add.reduceat(np.where(finite, x, 0.0), starts)
+    sum_y = np.add.reduceat(np.where(finite, y, 0.0), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_x = np.append(sum_x / counts, x[-1])
+        avg_y = np.append(sum_y / counts, y[-1])
+
+    keep = np.empty(budget, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nx, ny = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(data: Any, budget: int | None, column: str | None = None) -> Any:
+    """Rows of a Series (or of a DataFrame, shaped by ``column``) that LTTB keeps.
+
+    ``budget=None`` returns ``data`` unchanged. The global min and max of the
+    shaping values are always included, so the result can run a point or two
+    over budget.
+    """
+    if budget is None or len(data) <= budget:
+        return data
+    values = (data[column] if column is not None else data).to_numpy(dtype=float)
+    keep = lttb_indices(_positions(data.index), values, budget)
+    if np.isfinite(values).any():
+        keep = np.union1d(keep, [np.nanargmin(values), np.nanargmax(values)])
+    return data.iloc[keep]
+
+
+def wire_x(index: pd.Index) -> Any:
+    """Trace x values: dates as 'YYYY-MM-DD' when every stamp is at midnight."""
+    if isinstance(index, pd.DatetimeIndex) and index.tz is None and (index == index.normalize()).all():
+        return index.strftime("%Y-%m-%d").to_numpy()
+    return index
+
+
+def wire_y(values: Any) -> np.ndarray:
+    """Trace y (or customdata) values as float32."""
+    return np.asarray(values, dtype=np.float32)
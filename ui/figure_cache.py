@@ -0,0 +1,143 @@
+"""
+Swing — Content-addressed cache for built Plotly figures.
+
+Every rerun of the dashboard (a sidebar toggle, a page turn in the holdings
+grid) re-executes every chart block, and building a figure — trace
+validation, ``_apply_obsidian`` styling, ``px.treemap`` path expansion — costs
+more than drawing it. ``FigureCache.get(name, build, *args)`` fingerprints the
+builder's inputs (frame/series contents, arrays, scalars) and returns the
+figure built the last time those exact inputs were seen, so cosmetic reruns
+skip construction entirely and only a real change in the data rebuilds.
+
+Entries are the built ``go.Figure`` objects, not their JSON: Streamlit
+serializes a Figure through ``to_dict()`` without re-validating it, whereas a
+dict or JSON payload is re-validated into a new Figure on every call, which
+costs more than building most of these charts from scratch. Cached figures
+are shared, so callers must treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+# Sixteen charts across the dashboard and analysis tabs, a few live input
+# variants each (timeframes, anchors, benchmark on/off).
+DEFAULT_MAX_ENTRIES = 96
+
+
+def _feed(h: Any, value: Any) -> None:
+    """Fold ``value`` into hash ``h``; type tags keep 1, '1' and [1] apart."""
+    if isinstance(value, pd.DataFrame):
+        h.update(b"F")
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b"S")
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Index):
+        h.update(b"I")
+        h.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(b"A")
+        h.update(repr((value.shape, value.dtype.str)).encode())
+        if value.dtype == object:
+            h.update(repr(value.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b"D%d" % len(value))
+        for key in sorted(value, key=repr):
+            _feed(h, key)
+            _feed(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(b"L%d" % len(value))
+        for item in value:
+            _feed(h, item)
+    elif value is None or isinstance(value, (str, bytes, bool, int, float, np.generic,
+                                             date, datetime, pd.Timestamp)):
+        h.update(b"V")
+        h.update(repr(value).encode())
+    else:
+        raise TypeError(f"cannot fingerprint {type(value).__name__} for the figure cache")
+
+
+def fingerprint(*args: Any) -> str:
+    """Stable content hash of a builder's arguments."""
+    h = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        _feed(h, arg)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures keyed by chart name + input fingerprint."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._figures: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._counts: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, build: Callable[..., Any], *args: Any) -> tuple[Any, bool]:
+        """``(build(*args), hit)``, reusing what was built for identical inputs.
+
+        ``build`` may return the figure alone or with metadata (swing's
+        render_figure caches ``(figure, serialized_bytes)``).
+        """
+        key = (name, fingerprint(*args))
+        with self._lock:
+            fig = self._figures.get(key)
+            counts = self._counts.setdefault(name, [0, 0])
+            if fig is not None:
+                self._figures.move_to_end(key)
+                counts[0] += 1
+                return fig, True
+            counts[1] += 1
+        # Built outside the lock: two sessions missing the same key at once
+        # both build, and the second store wins — same figure either way.
+        fig = build(*args)
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig, False
+
+    def clear(self) -> None:
+        """Drop every figure (counters are kept)."""
+        with self._lock:
+            self._figures.clear()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    @property
+    def hits(self) -> int:
+        return sum(c[0] for c in self._counts.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(c[1] for c in self._counts.values())
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (NaN before the first one)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else float("nan")
+
+    def stats(self) -> pd.DataFrame:
+        """Hits, misses and hit rate per chart name."""
+        with self._lock:
+            rows = {name: tuple(c) for name, c in self._counts.items()}
+        out = pd.DataFrame.from_dict(rows, orient="index", columns=["hits", "misses"])
+        out.index.name = "chart"
+        out["hit_rate"] = out["hits"] / (out["hits"] + out["misses"])
+        return out.sort_index()